@@ -0,0 +1,30 @@
+"""Shared fixtures for all tests."""
+
+from unittest import mock
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", help="Run the benchmarks, which are skipped by default")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: compares the speed of implementations, run with --benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Timings depend on the load of the machine, so they are not part of the regular test run
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark, run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture(autouse=True)
+def app_settings_dir(tmp_path):
+    """Keep the files the CLI writes by default, e.g. the run report, out of the home directory."""
+    with mock.patch("tonie_podcast_sync.cli.APP_SETTINGS_DIR", tmp_path / ".toniepodcastsync"):
+        yield tmp_path / ".toniepodcastsync"
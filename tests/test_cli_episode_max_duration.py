@@ -42,8 +42,8 @@ def test_episode_max_duration_defaults_to_5399_not_maximum_length():
     # Mock the dependencies
     with (
         mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
-        mock.patch("tonie_podcast_sync.cli.ToniePodcastSync") as mock_tps_class,
-        mock.patch("tonie_podcast_sync.cli.Podcast") as mock_podcast_class,
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync") as mock_tps_class,
+        mock.patch("tonie_podcast_sync.podcast.Podcast") as mock_podcast_class,
     ):
         # Mock ToniePodcastSync instance
         mock_tps_instance = mock.MagicMock()
@@ -59,7 +59,8 @@ def test_episode_max_duration_defaults_to_5399_not_maximum_length():
         update_tonies()
 
         # Verify ToniePodcastSync was instantiated
-        mock_tps_class.assert_called_once_with("test_user", "test_pass")
+        mock_tps_class.assert_called_once()
+        assert mock_tps_class.call_args.args == ("test_user", "test_pass")
 
         # Verify Podcast was created with correct arguments
         mock_podcast_class.assert_called_once()
@@ -109,8 +110,8 @@ def test_episode_max_duration_respects_explicit_value():
     # Mock the dependencies
     with (
         mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
-        mock.patch("tonie_podcast_sync.cli.ToniePodcastSync") as mock_tps_class,
-        mock.patch("tonie_podcast_sync.cli.Podcast") as mock_podcast_class,
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync") as mock_tps_class,
+        mock.patch("tonie_podcast_sync.podcast.Podcast") as mock_podcast_class,
     ):
         # Mock ToniePodcastSync instance
         mock_tps_instance = mock.MagicMock()
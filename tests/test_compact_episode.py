@@ -0,0 +1,69 @@
+"""Tests for the compact episode representation."""
+
+import gc
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from tonie_podcast_sync.podcast import Episode, Podcast
+
+FEED_PATH = str(Path(__file__).parent / "res" / "kakadu.xml")
+
+TEST_FEED_DATA = {
+    "title": "Test Episode",
+    "published": "Mon, 01 Jan 2024 10:00:00 +0000",
+    "published_parsed": (2024, 1, 1, 10, 0, 0, 0, 1, 0),
+    "id": "test-guid-123",
+    "itunes_duration": "10:30",
+    "summary": "<p>Long show notes</p>",
+}
+
+
+def test_episode_is_slotted():
+    episode = Episode(podcast="Test Podcast", raw=TEST_FEED_DATA, url="http://example.com/test.mp3")
+    assert not hasattr(episode, "__dict__")
+    with pytest.raises(AttributeError):
+        episode.fpath  # noqa: B018
+
+
+def test_raw_is_rebuilt_unless_kept():
+    episode = Episode(podcast="Test Podcast", raw=TEST_FEED_DATA, url="http://example.com/test.mp3")
+    assert "summary" not in episode.raw
+    assert episode.raw["id"] == "test-guid-123"
+    assert episode.raw["itunes_duration"] == "10:30"
+    assert episode.raw["links"] == [{"rel": "enclosure", "href": "http://example.com/test.mp3"}]
+
+    kept = Episode(podcast="Test Podcast", raw=TEST_FEED_DATA, url="http://example.com/test.mp3", keep_raw=True)
+    assert kept.raw is TEST_FEED_DATA
+    assert kept == episode
+
+
+def test_podcast_drops_feed_items_by_default():
+    podcast = Podcast(FEED_PATH)
+    assert podcast.feed is None
+    assert "summary" not in podcast.epList[0].raw
+
+
+def test_podcast_keeps_feed_items_on_request():
+    podcast = Podcast(FEED_PATH, keep_raw=True)
+    assert podcast.feed.entries
+    assert "summary" in podcast.epList[0].raw
+    assert [ep.guid for ep in podcast.epList] == [ep.guid for ep in Podcast(FEED_PATH).epList]
+
+
+def _retained_memory(**kwargs):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        podcast = Podcast(FEED_PATH, **kwargs)
+        gc.collect()
+        retained, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert podcast.epList
+    return retained
+
+
+def test_compact_episodes_retain_less_memory():
+    assert _retained_memory() < _retained_memory(keep_raw=True) / 2
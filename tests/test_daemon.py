@@ -0,0 +1,213 @@
+"""Tests for the daemon that syncs tonies whenever their feeds change."""
+
+import time
+from unittest import mock
+
+import pytest
+
+from tonie_podcast_sync.cli import _run_daemon_cycle
+from tonie_podcast_sync.podcast import FeedEntry
+from tonie_podcast_sync.scheduler import FeedScheduler, poll_interval
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def _entry(day):
+    return FeedEntry(
+        guid=f"guid-{day}",
+        title=f"Episode {day}",
+        normalized_title=f"episode {day}",
+        published=f"2024-01-{day:02d}",
+        published_parsed=time.gmtime(1704067200 + (day - 1) * DAY),
+        duration_str="10:00",
+        duration_sec=600,
+        url=f"http://example.com/ep{day}.mp3",
+        length=None,
+    )
+
+
+def _tonie_config(url):
+    tonie_config = mock.MagicMock()
+    tonie_config.podcast = url
+    tonie_config.maximum_length = 90
+    tonie_config.get = mock.MagicMock(side_effect=lambda _key, default=None: default)
+    return tonie_config
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize(
+    ("days", "expected"),
+    [
+        # A daily feed is polled four times a day
+        ((5, 4, 3, 2, 1), 6 * HOUR),
+        # A feed publishing every 20 days is polled at the maximum interval
+        ((21, 1), 12 * HOUR),
+        # Without distinct publication dates the feed is polled at the maximum interval
+        ((1, 1, 1), 12 * HOUR),
+    ],
+)
+def test_poll_interval_follows_the_publication_rate(days, expected):
+    assert poll_interval([_entry(day) for day in days], minimum=HOUR, maximum=12 * HOUR) == expected
+
+
+def test_poll_interval_is_clamped_to_the_minimum():
+    entries = [_entry(1), _entry(2)]
+
+    assert poll_interval(entries, minimum=8 * HOUR, maximum=DAY) == 8 * HOUR
+
+
+def test_scheduler_detects_changed_feeds():
+    clock = FakeClock()
+    scheduler = FeedScheduler(
+        {"tonie-1": "https://example.com/a.xml", "tonie-2": "https://example.com/a.xml"},
+        minimum=HOUR,
+        maximum=DAY,
+        clock=clock,
+    )
+    entries = [_entry(2), _entry(1)]
+
+    assert scheduler.due_feeds() == ["https://example.com/a.xml"]
+    assert scheduler.tonies_of("https://example.com/a.xml") == ["tonie-1", "tonie-2"]
+    assert scheduler.update("https://example.com/a.xml", entries)
+    assert scheduler.due_feeds() == []
+    assert scheduler.seconds_until_next_poll() == 6 * HOUR
+
+    clock.now = 6 * HOUR
+    assert scheduler.due_feeds() == ["https://example.com/a.xml"]
+    assert not scheduler.update("https://example.com/a.xml", list(entries))
+    assert scheduler.update("https://example.com/a.xml", [_entry(3), *entries])
+
+    scheduler.retry("https://example.com/a.xml")
+    assert scheduler.seconds_until_next_poll() == HOUR
+    assert scheduler.update("https://example.com/a.xml", [_entry(3), *entries])
+
+
+def test_daemon_only_syncs_tonies_of_changed_feeds():
+    clock = FakeClock()
+    tonie_configs = {
+        "tonie-1": _tonie_config("https://example.com/a.xml"),
+        "tonie-2": _tonie_config("https://example.com/b.xml"),
+    }
+    feeds = {"https://example.com/a.xml": [_entry(1)], "https://example.com/b.xml": [_entry(1)]}
+    scheduler = FeedScheduler(
+        {tonie_id: tonie_config.podcast for tonie_id, tonie_config in tonie_configs.items()},
+        minimum=HOUR,
+        maximum=HOUR,
+        clock=clock,
+    )
+    mock_settings = mock.MagicMock()
+    mock_settings.get = mock.MagicMock(side_effect=lambda _key, default=None: default)
+    mock_settings.CREATIVE_TONIES = tonie_configs
+    tps = mock.MagicMock()
+
+    def synced_tonies():
+        return sorted(call.args[1] for call in tps.sync_podcast_to_tonie.call_args_list)
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
+        mock.patch(
+            "tonie_podcast_sync.podcast.Podcast",
+            side_effect=lambda url, **_kwargs: mock.MagicMock(entries=list(feeds[url])),
+        ),
+    ):
+        _run_daemon_cycle(tps, tonie_configs, None, scheduler)
+        assert synced_tonies() == ["tonie-1", "tonie-2"]
+
+        # Nothing is due before the poll interval has passed
+        _run_daemon_cycle(tps, tonie_configs, None, scheduler)
+        assert tps.refresh.call_count == 1
+
+        clock.now = HOUR
+        feeds["https://example.com/b.xml"] = [_entry(2), _entry(1)]
+        tps.reset_mock()
+        _run_daemon_cycle(tps, tonie_configs, None, scheduler)
+        assert synced_tonies() == ["tonie-2"]
+        tps.refresh.assert_called_once()
+
+        clock.now = 2 * HOUR
+        tps.reset_mock()
+        _run_daemon_cycle(tps, tonie_configs, None, scheduler)
+        tps.refresh.assert_not_called()
+        tps.sync_podcast_to_tonie.assert_not_called()
+
+
+def test_daemon_retries_tonies_if_the_login_fails():
+    clock = FakeClock()
+    tonie_configs = {"tonie-1": _tonie_config("https://example.com/a.xml")}
+    scheduler = FeedScheduler({"tonie-1": "https://example.com/a.xml"}, minimum=HOUR, maximum=DAY, clock=clock)
+    mock_settings = mock.MagicMock()
+    mock_settings.get = mock.MagicMock(side_effect=lambda _key, default=None: default)
+    mock_settings.CREATIVE_TONIES = tonie_configs
+    tps = mock.MagicMock()
+    tps.refresh.side_effect = [ValueError("Failed to acquire session token."), None]
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
+        mock.patch(
+            "tonie_podcast_sync.podcast.Podcast", side_effect=lambda *_args, **_kwargs: mock.MagicMock(entries=[])
+        ),
+    ):
+        _run_daemon_cycle(tps, tonie_configs, None, scheduler)
+        tps.sync_podcast_to_tonie.assert_not_called()
+        assert scheduler.seconds_until_next_poll() == HOUR
+
+        clock.now = HOUR
+        _run_daemon_cycle(tps, tonie_configs, None, scheduler)
+        tps.sync_podcast_to_tonie.assert_called_once()
+
+
+def test_daemon_keeps_running_after_an_unexpected_error():
+    clock = FakeClock()
+    tonie_configs = {"tonie-1": _tonie_config("https://example.com/a.xml")}
+    scheduler = FeedScheduler({"tonie-1": "https://example.com/a.xml"}, minimum=HOUR, maximum=DAY, clock=clock)
+    mock_settings = mock.MagicMock()
+    mock_settings.get = mock.MagicMock(side_effect=lambda _key, default=None: default)
+    mock_settings.CREATIVE_TONIES = tonie_configs
+    tps = mock.MagicMock()
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
+        mock.patch(
+            "tonie_podcast_sync.podcast.Podcast", side_effect=lambda *_args, **_kwargs: mock.MagicMock(entries=[])
+        ),
+        mock.patch(
+            "tonie_podcast_sync.cli._sync_changed_tonies", side_effect=[RuntimeError("unexpected"), None]
+        ) as sync,
+    ):
+        _run_daemon_cycle(tps, tonie_configs, None, scheduler)
+        assert scheduler.seconds_until_next_poll() == HOUR
+
+        # The feed counts as changed again, although its entries are the same
+        clock.now = HOUR
+        _run_daemon_cycle(tps, tonie_configs, None, scheduler)
+        assert sync.call_count == 2
+
+
+def test_refresh_logs_in_again_and_reloads_the_tonies():
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = []
+        api_mock.get_all_creative_tonies.return_value = []
+        _mock.return_value = api_mock
+        tps = ToniePodcastSync("user", "pass")
+        tonie = mock.MagicMock()
+        tonie.id = "tonie-123"
+        api_mock.get_all_creative_tonies.return_value = [tonie]
+
+        tps.refresh()
+
+        api_mock.session.acquire_token.assert_called_once_with("user", "pass")
+        assert tps.get_tonies() == [tonie]
+
+        api_mock.session.token = None
+        with pytest.raises(ValueError, match="session token"):
+            tps.refresh()
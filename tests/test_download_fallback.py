@@ -5,7 +5,7 @@ from unittest import mock
 import pytest
 from requests.exceptions import RequestException
 
-from tonie_podcast_sync.podcast import Episode, EpisodeSorting
+from tonie_podcast_sync.podcast import Episode, EpisodeSelection, EpisodeSorting
 from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
 
 
@@ -28,6 +28,16 @@ def temp_cache_dir(tmp_path):
     return cache_dir
 
 
+def _transfer_episodes(tps, podcast, max_minutes):
+    """Select and transfer the episodes of the podcast the way a sync does, with the upload mocked."""
+    episodes_to_cache = tps._select_episodes_within_time_limit(podcast, max_minutes, EpisodeSelection.GREEDY)
+    available_episodes = [ep for ep in podcast.epList if ep not in episodes_to_cache]
+    with mock.patch.object(
+        tps, "_upload_episodes_to_tonie", side_effect=lambda _podcast, episodes, _tonie_id, **_kwargs: list(episodes)
+    ):
+        return tps._transfer_episodes(podcast, "tonie-123", episodes_to_cache, available_episodes, max_minutes * 60)
+
+
 @pytest.mark.usefixtures("mock_tonie_api")
 def test_fallback_to_next_episode_on_download_failure(temp_cache_dir):
     """Test that when an episode fails to download, the next available one is used as fallback."""
@@ -70,7 +80,7 @@ def test_fallback_to_next_episode_on_download_failure(temp_cache_dir):
 
     tps._session.get = mock_get
     # Request 30 minutes total, which would fit 3 episodes normally
-    cached_episodes = tps._ToniePodcastSync__cache_podcast_episodes(podcast, max_minutes=30)
+    cached_episodes = _transfer_episodes(tps, podcast, max_minutes=30)
 
     # Should have 3 episodes: Episode 1, Episode 4 (fallback for failed Episode 2), Episode 3
     assert len(cached_episodes) == 3
@@ -122,7 +132,7 @@ def test_fallback_in_random_mode(temp_cache_dir):
 
     tps._session.get = mock_get
     # Request 30 minutes total
-    cached_episodes = tps._ToniePodcastSync__cache_podcast_episodes(podcast, max_minutes=30)
+    cached_episodes = _transfer_episodes(tps, podcast, max_minutes=30)
 
     # Should have 3 episodes, with Episode 4 as fallback for failed Episode 1
     assert len(cached_episodes) == 3
@@ -171,7 +181,7 @@ def test_no_fallback_when_all_remaining_episodes_too_long(temp_cache_dir):
     tps._session.get = mock_get
     # Request 30 minutes total - can fit episodes 1, 2, 3
     # Episode 3 fails, but Episode 4 (50 min) is too long as replacement
-    cached_episodes = tps._ToniePodcastSync__cache_podcast_episodes(podcast, max_minutes=30)
+    cached_episodes = _transfer_episodes(tps, podcast, max_minutes=30)
 
     # Should have only 2 episodes (1 and 2), no fallback for 3
     assert len(cached_episodes) == 2
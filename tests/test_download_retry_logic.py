@@ -5,7 +5,7 @@ from unittest import mock
 import pytest
 from requests.exceptions import RequestException
 
-from tonie_podcast_sync.constants import DOWNLOAD_RETRY_COUNT
+from tonie_podcast_sync.constants import RETRY_MAX_ATTEMPTS
 from tonie_podcast_sync.podcast import Episode
 from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
 
@@ -30,11 +30,11 @@ def temp_cache_dir(tmp_path):
 @pytest.mark.usefixtures("mock_tonie_api")
 def test_download_respects_retry_count(temp_cache_dir):
     """
-    Test that downloads respect DOWNLOAD_RETRY_COUNT and don't make extra requests.
+    Test that downloads respect RETRY_MAX_ATTEMPTS and don't make extra requests.
 
     Bug: The current code has duplicate download logic after the retry loop,
     which causes an additional download attempt after all retries are exhausted.
-    This means if DOWNLOAD_RETRY_COUNT=3, it actually makes 4 attempts total.
+    This means if RETRY_MAX_ATTEMPTS=3, it actually makes 4 attempts total.
     """
     tps = ToniePodcastSync("user", "pass")
     tps.podcast_cache_directory = temp_cache_dir
@@ -62,10 +62,10 @@ def test_download_respects_retry_count(temp_cache_dir):
     tps._session.get = mock_get
     result = tps._ToniePodcastSync__cache_episode(ep)
 
-    # Should fail after DOWNLOAD_RETRY_COUNT attempts, not more
+    # Should fail after RETRY_MAX_ATTEMPTS attempts, not more
     assert result is False
-    assert call_count == DOWNLOAD_RETRY_COUNT, (
-        f"Expected exactly {DOWNLOAD_RETRY_COUNT} download attempts, "
+    assert call_count == RETRY_MAX_ATTEMPTS, (
+        f"Expected exactly {RETRY_MAX_ATTEMPTS} download attempts, "
         f"but got {call_count}. The bug causes an extra attempt after retry loop."
     )
 
@@ -0,0 +1,129 @@
+"""Tests for the persistent episode cache."""
+
+import os
+import shutil
+from unittest import mock
+
+import pytest
+
+from tonie_podcast_sync.episode_cache import EpisodeCache
+from tonie_podcast_sync.podcast import Episode
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+
+@pytest.fixture
+def mock_tonie_api():
+    """Mock TonieAPI."""
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = []
+        api_mock.get_all_creative_tonies.return_value = []
+        _mock.return_value = api_mock
+        yield _mock
+
+
+def _create_episode(i=1, volume_adjustment=0):
+    test_feed_data = {
+        "title": f"Episode {i}",
+        "published": f"Mon, 0{i} Jan 2024 10:00:00 +0000",
+        "published_parsed": (2024, 1, i, 10, 0, 0, 0, 1, 0),
+        "id": f"test-guid-{i}",
+        "itunes_duration": "10:00",
+    }
+    return Episode(
+        podcast="Test Podcast",
+        raw=test_feed_data,
+        url=f"http://example.com/ep{i}.mp3",
+        volume_adjustment=volume_adjustment,
+    )
+
+
+def test_store_and_restore(tmp_path):
+    cache = EpisodeCache(tmp_path / "cache", max_bytes=1024)
+    episode = _create_episode()
+    source = tmp_path / "download.mp3"
+    source.write_bytes(b"audio")
+
+    assert not cache.restore(episode, tmp_path / "missing.mp3")
+
+    cache.store(episode, source)
+    destination = tmp_path / "restored.mp3"
+    assert cache.restore(episode, destination)
+    assert destination.read_bytes() == b"audio"
+
+
+def test_volume_adjustment_is_part_of_the_key():
+    assert EpisodeCache.key_for(_create_episode()) != EpisodeCache.key_for(_create_episode(volume_adjustment=3))
+
+
+def test_least_recently_used_episode_is_evicted(tmp_path):
+    cache = EpisodeCache(tmp_path / "cache", max_bytes=20)
+    episodes = [_create_episode(i) for i in range(1, 4)]
+    for i, episode in enumerate(episodes[:2]):
+        source = tmp_path / f"ep{i}.mp3"
+        source.write_bytes(b"x" * 10)
+        cache.store(episode, source)
+        # Make the first episode the oldest one
+        cached_file = cache.directory / f"{cache.key_for(episode)}.mp3"
+        os.utime(cached_file, (1_000 + i, 1_000 + i))
+
+    # Using the first episode makes the second one the least recently used
+    assert cache.restore(episodes[0], tmp_path / "used.mp3")
+
+    source = tmp_path / "ep3.mp3"
+    source.write_bytes(b"x" * 10)
+    cache.store(episodes[2], source)
+
+    assert cache.restore(episodes[0], tmp_path / "first.mp3")
+    assert not cache.restore(episodes[1], tmp_path / "second.mp3")
+    assert cache.restore(episodes[2], tmp_path / "third.mp3")
+
+
+@pytest.mark.usefixtures("mock_tonie_api")
+def test_cached_episode_is_not_downloaded_again(tmp_path):
+    """Test that a second sync of the same episode is served from the cache without network access."""
+    cache = EpisodeCache(tmp_path / "episode-cache", max_bytes=1024 * 1024)
+    tps = ToniePodcastSync("user", "pass", episode_cache=cache)
+
+    response = mock.MagicMock()
+    response.ok = True
+    response.raise_for_status = mock.MagicMock()
+    response.iter_content = mock.MagicMock(return_value=[b"fake audio data"])
+    tps._session.get = mock.MagicMock(return_value=response)
+
+    tps.podcast_cache_directory = tmp_path / "first-run"
+    assert tps._ToniePodcastSync__cache_episode(_create_episode())
+
+    tps.podcast_cache_directory = tmp_path / "second-run"
+    episode = _create_episode()
+    assert tps._ToniePodcastSync__cache_episode(episode)
+
+    assert tps._session.get.call_count == 1
+    assert episode.fpath.read_bytes() == b"fake audio data"
+
+
+@pytest.mark.usefixtures("mock_tonie_api")
+def test_episode_cache_errors_do_not_fail_the_download(tmp_path):
+    cache = EpisodeCache(tmp_path / "episode-cache", max_bytes=1024 * 1024)
+    tps = ToniePodcastSync("user", "pass", episode_cache=cache)
+
+    response = mock.MagicMock()
+    response.ok = True
+    response.raise_for_status = mock.MagicMock()
+    response.iter_content = mock.MagicMock(return_value=[b"fake audio data"])
+    tps._session.get = mock.MagicMock(return_value=response)
+
+    with mock.patch.object(cache, "store", side_effect=OSError(28, "No space left on device")):
+        tps.podcast_cache_directory = tmp_path / "first-run"
+        episode = _create_episode()
+        assert tps._ToniePodcastSync__cache_episode(episode)
+    assert episode.fpath.read_bytes() == b"fake audio data"
+    # The file of the first run can not be shared once the run is done
+    shutil.rmtree(tmp_path / "first-run")
+
+    with mock.patch.object(cache, "restore", side_effect=OSError(13, "Permission denied")):
+        tps.podcast_cache_directory = tmp_path / "second-run"
+        episode = _create_episode()
+        assert tps._ToniePodcastSync__cache_episode(episode)
+    assert episode.fpath.read_bytes() == b"fake audio data"
+    assert tps._session.get.call_count == 2
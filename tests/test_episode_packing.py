@@ -0,0 +1,93 @@
+"""Tests and benchmark for the episode packing strategies."""
+
+import random
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from tonie_podcast_sync.podcast import Episode, EpisodeSelection
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+
+def _create_mock_episode(duration_sec: int, title: str = "Test Episode") -> Episode:
+    episode = Mock(spec=Episode)
+    episode.duration_sec = duration_sec
+    episode.title = title
+    return episode
+
+
+def _create_podcast(durations_min):
+    podcast = Mock()
+    podcast.title = "Test Podcast"
+    podcast.epList = [_create_mock_episode(d * 60, f"Episode {i}") for i, d in enumerate(durations_min)]
+    return podcast
+
+
+def _minutes(episodes):
+    return sum(ep.duration_sec for ep in episodes) // 60
+
+
+@pytest.fixture
+def tps():
+    return ToniePodcastSync.__new__(ToniePodcastSync)
+
+
+def test_greedy_stops_at_first_overflow(tps):
+    podcast = _create_podcast([40, 40, 30, 10])
+    selected = tps._select_episodes_within_time_limit(podcast, 90)
+    assert [ep.title for ep in selected] == ["Episode 0", "Episode 1"]
+
+
+def test_fill_skips_and_continues(tps):
+    podcast = _create_podcast([40, 40, 30, 10])
+    selected = tps._select_episodes_within_time_limit(podcast, 90, EpisodeSelection.FILL)
+    assert [ep.title for ep in selected] == ["Episode 0", "Episode 1", "Episode 3"]
+    assert _minutes(selected) == 90
+
+
+def test_best_fit_finds_better_combination_than_fill(tps):
+    # After the first 60 minutes, fill takes 20 (80 min total) while 15 + 15 uses all 30 minutes
+    podcast = _create_podcast([60, 35, 20, 15, 15])
+    fill = tps._select_episodes_within_time_limit(podcast, 90, EpisodeSelection.FILL)
+    best_fit = tps._select_episodes_within_time_limit(podcast, 90, EpisodeSelection.BEST_FIT)
+
+    assert _minutes(fill) == 80
+    assert _minutes(best_fit) == 90
+    assert [ep.title for ep in best_fit] == ["Episode 0", "Episode 3", "Episode 4"]
+
+
+def test_best_fit_keeps_priority_order(tps):
+    podcast = _create_podcast([30, 45, 20, 10, 40, 15])
+    selected = tps._select_episodes_within_time_limit(podcast, 60, EpisodeSelection.BEST_FIT)
+    indices = [podcast.epList.index(ep) for ep in selected]
+    assert indices == sorted(indices)
+    assert indices[0] == 0
+    assert _minutes(selected) == 60
+
+
+def test_packing_ignores_episodes_without_duration(tps):
+    podcast = _create_podcast([60, 40, 0, 0, 20])
+    for selection in (EpisodeSelection.FILL, EpisodeSelection.BEST_FIT):
+        selected = tps._select_episodes_within_time_limit(podcast, 90, selection)
+        assert [ep.title for ep in selected] == ["Episode 0", "Episode 4"]
+
+
+def test_packing_fills_large_feeds_at_least_as_well_as_greedy(tps):
+    """Compare the fill ratio of all strategies on large random feeds."""
+    rng = random.Random(42)
+    # Lightweight stand-ins, creating 60,000 spec'd mocks would dominate the test runtime
+    feeds = [
+        SimpleNamespace(epList=[SimpleNamespace(duration_sec=rng.randint(3, 60) * 60) for _ in range(3000)])
+        for _ in range(20)
+    ]
+    max_minutes = 90
+
+    fill_ratios = {
+        selection: sum(_minutes(tps._select_episodes_within_time_limit(feed, max_minutes, selection)) for feed in feeds)
+        / (len(feeds) * max_minutes)
+        for selection in EpisodeSelection
+    }
+
+    assert fill_ratios[EpisodeSelection.BEST_FIT] >= fill_ratios[EpisodeSelection.FILL]
+    assert fill_ratios[EpisodeSelection.FILL] >= fill_ratios[EpisodeSelection.GREEDY]
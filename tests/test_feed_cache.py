@@ -0,0 +1,80 @@
+"""Tests for conditional feed requests with ETag/Last-Modified."""
+
+from pathlib import Path
+from unittest import mock
+
+import feedparser
+
+from tonie_podcast_sync.feed_cache import FeedCache
+from tonie_podcast_sync.podcast import Podcast
+
+FEED_PATH = str(Path(__file__).parent / "res" / "kakadu.xml")
+FEED_URL = "https://example.com/kakadu.xml"
+_parse = feedparser.parse
+
+
+def _parse_with_validators(*_args, **_kwargs):
+    feed = _parse(FEED_PATH)
+    feed["etag"] = '"abc123"'
+    feed["modified"] = "Mon, 14 Aug 2023 10:35:24 GMT"
+    feed["status"] = 200
+    return feed
+
+
+def test_validators_are_sent_and_entries_reused_on_not_modified(tmp_path):
+    feed_cache = FeedCache(tmp_path)
+
+    with mock.patch("tonie_podcast_sync.podcast.feedparser.parse", side_effect=_parse_with_validators) as parse:
+        first = Podcast(FEED_URL, feed_cache=feed_cache)
+    parse.assert_called_once_with(FEED_URL)
+
+    not_modified = feedparser.FeedParserDict(status=304, entries=[], feed=feedparser.FeedParserDict(), bozo=False)
+    with mock.patch("tonie_podcast_sync.podcast.feedparser.parse", return_value=not_modified) as parse:
+        second = Podcast(FEED_URL, feed_cache=feed_cache)
+    parse.assert_called_once_with(FEED_URL, etag='"abc123"', modified="Mon, 14 Aug 2023 10:35:24 GMT")
+
+    assert second.title == first.title
+    assert [ep.guid for ep in second.epList] == [ep.guid for ep in first.epList]
+    assert [ep.url for ep in second.epList] == [ep.url for ep in first.epList]
+    assert [ep.duration_sec for ep in second.epList] == [ep.duration_sec for ep in first.epList]
+    assert second.epList[0].published_parsed == first.epList[0].published_parsed
+
+
+def test_changed_feed_is_parsed_and_cached_again(tmp_path):
+    feed_cache = FeedCache(tmp_path)
+    with mock.patch("tonie_podcast_sync.podcast.feedparser.parse", side_effect=_parse_with_validators):
+        Podcast(FEED_URL, feed_cache=feed_cache)
+
+    def parse_changed_feed(*args, **kwargs):
+        feed = _parse_with_validators(*args, **kwargs)
+        feed["etag"] = '"def456"'
+        return feed
+
+    with mock.patch("tonie_podcast_sync.podcast.feedparser.parse", side_effect=parse_changed_feed):
+        podcast = Podcast(FEED_URL, feed_cache=feed_cache)
+
+    assert len(podcast.epList) == 51
+    assert feed_cache.load(FEED_URL).etag == '"def456"'
+
+
+def test_feeds_without_validators_are_not_cached(tmp_path):
+    feed_cache = FeedCache(tmp_path)
+    Podcast(FEED_PATH, feed_cache=feed_cache)
+    assert feed_cache.load(FEED_PATH) is None
+
+
+def test_cached_entries_are_unchanged(tmp_path):
+    feed_cache = FeedCache(tmp_path)
+    with mock.patch("tonie_podcast_sync.podcast.feedparser.parse", side_effect=_parse_with_validators):
+        podcast = Podcast(FEED_URL, feed_cache=feed_cache)
+
+    cached_feed = feed_cache.load(FEED_URL)
+
+    assert cached_feed.title == podcast.title
+    assert cached_feed.entries == podcast.entries
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    feed_cache = FeedCache(tmp_path)
+    feed_cache.path.write_text("this is not a database")
+    assert feed_cache.load(FEED_URL) is None
@@ -0,0 +1,127 @@
+"""Tests for fetching the feeds of all tonies before the sync."""
+
+import threading
+from unittest import mock
+
+import pytest
+import typer
+
+from tonie_podcast_sync.cli import _prefetch_podcasts
+
+
+def _tonie_config(url, **options):
+    tonie_config = mock.MagicMock()
+    tonie_config.podcast = url
+    tonie_config.maximum_length = 90
+    tonie_config.get = mock.MagicMock(side_effect=lambda key, default=None: options.get(key, default))
+    return tonie_config
+
+
+def _mock_settings(tonie_configs, sync_workers=1):
+    mock_settings = mock.MagicMock()
+    mock_settings.TONIE_CLOUD_ACCESS.USERNAME = "test_user"
+    mock_settings.TONIE_CLOUD_ACCESS.PASSWORD = "test_pass"
+    mock_settings.get = mock.MagicMock(
+        side_effect=lambda key, default=None: {"sync_workers": sync_workers}.get(key, default)
+    )
+    mock_settings.CREATIVE_TONIES = tonie_configs
+    return mock_settings
+
+
+def test_distinct_feeds_are_fetched_concurrently():
+    tonie_configs = {
+        "tonie-1": _tonie_config("https://example.com/a.xml"),
+        "tonie-2": _tonie_config("https://example.com/b.xml"),
+    }
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fetch_feed(url, **_kwargs):
+        # Both fetches only pass the barrier if they run at the same time
+        barrier.wait()
+        return mock.MagicMock(url=url)
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", _mock_settings(tonie_configs)),
+        mock.patch("tonie_podcast_sync.podcast.Podcast", side_effect=fetch_feed),
+    ):
+        podcasts = _prefetch_podcasts(tonie_configs, feed_cache=None)
+
+    assert podcasts["tonie-1"].result().url == "https://example.com/a.xml"
+    assert podcasts["tonie-2"].result().url == "https://example.com/b.xml"
+
+
+def test_shared_feed_is_fetched_once():
+    tonie_configs = {
+        "tonie-1": _tonie_config("https://example.com/a.xml"),
+        "tonie-2": _tonie_config("https://example.com/a.xml", excluded_title_strings=["trailer"]),
+        "tonie-3": _tonie_config("https://example.com/b.xml"),
+    }
+    podcast_class = mock.MagicMock(side_effect=lambda url, **kwargs: mock.MagicMock(url=url, kwargs=kwargs))
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", _mock_settings(tonie_configs)),
+        mock.patch("tonie_podcast_sync.podcast.Podcast", podcast_class),
+    ):
+        podcasts = {tonie_id: future.result() for tonie_id, future in _prefetch_podcasts(tonie_configs, None).items()}
+
+    assert podcast_class.call_count == 3
+    assert podcasts["tonie-1"].kwargs["parsed_feed"] is None
+    assert podcasts["tonie-3"].kwargs["parsed_feed"] is None
+    assert podcasts["tonie-2"].kwargs["parsed_feed"] is podcasts["tonie-1"].parsed_feed
+    assert podcasts["tonie-2"].kwargs["excluded_title_strings"] == ["trailer"]
+
+
+def test_all_feeds_are_fetched_before_the_first_sync():
+    tonie_configs = {
+        "tonie-1": _tonie_config("https://example.com/a.xml"),
+        "tonie-2": _tonie_config("https://example.com/b.xml"),
+    }
+    events = []
+
+    def fetch_feed(url, **_kwargs):
+        events.append(f"fetch {url}")
+        return mock.MagicMock()
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", _mock_settings(tonie_configs)),
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync") as mock_tps_class,
+        mock.patch("tonie_podcast_sync.podcast.Podcast", side_effect=fetch_feed),
+    ):
+        mock_tps_class.return_value.sync_podcast_to_tonie.side_effect = lambda _podcast, tonie_id, *_args, **_kw: (
+            events.append(f"sync {tonie_id}")
+        )
+        from tonie_podcast_sync.cli import update_tonies  # noqa: PLC0415
+
+        update_tonies()
+
+    assert sorted(events[:2]) == ["fetch https://example.com/a.xml", "fetch https://example.com/b.xml"]
+    assert events[2:] == ["sync tonie-1", "sync tonie-2"]
+
+
+def test_failing_feed_is_reported_for_its_tonies(capsys):
+    tonie_configs = {
+        "tonie-1": _tonie_config("https://example.com/broken.xml"),
+        "tonie-2": _tonie_config("https://example.com/broken.xml"),
+        "tonie-3": _tonie_config("https://example.com/b.xml"),
+    }
+
+    def fetch_feed(url, **_kwargs):
+        if "broken" in url:
+            msg = "feed unavailable"
+            raise RuntimeError(msg)
+        return mock.MagicMock()
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", _mock_settings(tonie_configs, sync_workers=2)),
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync") as mock_tps_class,
+        mock.patch("tonie_podcast_sync.podcast.Podcast", side_effect=fetch_feed),
+    ):
+        from tonie_podcast_sync.cli import update_tonies  # noqa: PLC0415
+
+        with pytest.raises(typer.Exit):
+            update_tonies()
+
+    assert mock_tps_class.return_value.sync_podcast_to_tonie.call_count == 1
+    captured = capsys.readouterr()
+    assert captured.out.count("feed unavailable") == 2
+    assert captured.out.count("done") == 1
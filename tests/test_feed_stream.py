@@ -0,0 +1,188 @@
+"""Tests for the incremental reader of RSS feeds."""
+
+import gc
+import io
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+import feedparser
+import pytest
+
+from tonie_podcast_sync.constants import MAXIMUM_TONIE_MINUTES, STREAM_REPLACEMENT_MINUTES
+from tonie_podcast_sync.feed_cache import FeedCache
+from tonie_podcast_sync.feed_stream import UnsupportedFeedError, open_feed_stream
+from tonie_podcast_sync.podcast import EpisodeSelection, EpisodeSorting, FeedEntry, Podcast
+
+RES_DIR = Path(__file__).parent / "res"
+FEED_URL = "https://example.com/feed.xml"
+
+
+def _write_feed(path, days, duration="30:00"):
+    items = "".join(
+        f"""
+        <item>
+            <title>Episode {day}</title>
+            <guid>guid-{day}</guid>
+            <pubDate>Mon, {day:02d} Jan 2024 10:00:00 +0000</pubDate>
+            <enclosure url="https://example.com/{day}.mp3" length="1000" type="audio/mpeg"/>
+            <itunes:duration>{duration}</itunes:duration>
+        </item>"""
+        for day in days
+    )
+    path.write_text(
+        f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+    <channel>
+        <title>Synthetic Feed</title>
+        <image><title>Not the feed title</title></image>{items}
+    </channel>
+</rss>""",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def _response(status_code=200, body=b"", headers=None):
+    response = mock.MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.raw = io.BytesIO(body)
+    return response
+
+
+@pytest.mark.parametrize("feed", sorted(RES_DIR.glob("*.xml")), ids=lambda path: path.name)
+def test_stream_matches_feedparser(feed):
+    parsed = feedparser.parse(str(feed))
+
+    stream = open_feed_stream(str(feed))
+    items = list(stream)
+    stream.close()
+
+    assert stream.title == parsed.feed.title
+    assert [FeedEntry.from_item(item) for item in items] == [FeedEntry.from_item(item) for item in parsed.entries]
+
+
+def test_atom_feeds_are_not_streamed(tmp_path):
+    feed = tmp_path / "atom.xml"
+    feed.write_text('<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom</title></feed>', encoding="utf-8")
+
+    with pytest.raises(UnsupportedFeedError):
+        open_feed_stream(str(feed))
+
+
+def test_reading_stops_once_a_tonie_and_its_replacements_are_read(tmp_path):
+    feed = _write_feed(tmp_path / "feed.xml", range(28, 0, -1))
+
+    podcast = Podcast(feed, streaming=True)
+
+    # Three episodes of 30 minutes fill a tonie, three more replace failed downloads
+    assert len(podcast.entries) == (MAXIMUM_TONIE_MINUTES + STREAM_REPLACEMENT_MINUTES) // 30
+    assert [ep.title for ep in podcast.epList] == [f"Episode {day}" for day in range(28, 22, -1)]
+
+
+def test_filtered_episodes_do_not_count_towards_a_full_tonie(tmp_path):
+    feed = _write_feed(tmp_path / "feed.xml", range(28, 0, -1))
+
+    podcast = Podcast(feed, streaming=True, excluded_title_strings=["episode 27"])
+
+    assert [ep.title for ep in podcast.epList] == [f"Episode {day}" for day in (28, 26, 25, 24, 23, 22)]
+
+
+@pytest.mark.parametrize(
+    ("days", "kwargs"),
+    [
+        (range(28, 0, -1), {"episode_sorting": EpisodeSorting.BY_DATE_OLDEST_FIRST}),
+        (range(28, 0, -1), {"pinned_episode_names": ["episode 1"]}),
+        ([27, 28, *range(26, 0, -1)], {}),
+        (range(28, 0, -1), {"episode_selection": EpisodeSelection.FILL}),
+        (range(28, 0, -1), {"episode_selection": EpisodeSelection.BEST_FIT}),
+    ],
+    ids=["oldest_first", "pinned", "unsorted_feed", "fill", "best_fit"],
+)
+def test_all_items_are_read_if_older_episodes_may_be_synced(tmp_path, days, kwargs):
+    feed = _write_feed(tmp_path / "feed.xml", days)
+
+    podcast = Podcast(feed, streaming=True, **kwargs)
+
+    assert len(podcast.entries) == len(days)
+
+
+def test_streamed_podcast_matches_parsed_podcast():
+    feed = str(RES_DIR / "kakadu.xml")
+
+    streamed = Podcast(feed, streaming=True, episode_sorting=EpisodeSorting.BY_DATE_OLDEST_FIRST)
+    parsed = Podcast(feed, episode_sorting=EpisodeSorting.BY_DATE_OLDEST_FIRST)
+
+    assert streamed.title == parsed.title
+    assert streamed.epList == parsed.epList
+
+
+def test_conditional_request_reuses_index(tmp_path):
+    feed = Path(_write_feed(tmp_path / "feed.xml", [3, 2, 1]))
+    feed_cache = FeedCache(tmp_path / "cache")
+    response = _response(body=feed.read_bytes(), headers={"ETag": '"abc123"'})
+
+    with mock.patch("tonie_podcast_sync.feed_stream.requests.get", return_value=response) as get:
+        first = Podcast(FEED_URL, feed_cache=feed_cache, streaming=True)
+    assert get.call_args.kwargs["headers"] == {}
+
+    with mock.patch("tonie_podcast_sync.feed_stream.requests.get", return_value=_response(304)) as get:
+        second = Podcast(FEED_URL, feed_cache=feed_cache, streaming=True)
+    assert get.call_args.kwargs["headers"] == {"If-None-Match": '"abc123"'}
+
+    assert second.title == "Synthetic Feed"
+    assert second.epList == first.epList
+
+
+def test_partially_read_feeds_are_requested_conditionally(tmp_path):
+    feed = Path(_write_feed(tmp_path / "feed.xml", range(28, 0, -1)))
+    feed_cache = FeedCache(tmp_path / "cache")
+    response = _response(body=feed.read_bytes(), headers={"ETag": '"abc123"'})
+
+    with mock.patch("tonie_podcast_sync.feed_stream.requests.get", return_value=response):
+        first = Podcast(FEED_URL, feed_cache=feed_cache, streaming=True)
+    cached_feed = feed_cache.load(FEED_URL)
+    assert not cached_feed.complete
+    assert cached_feed.entries == first.entries
+
+    with mock.patch("tonie_podcast_sync.feed_stream.requests.get", return_value=_response(304)) as get:
+        second = Podcast(FEED_URL, feed_cache=feed_cache, streaming=True)
+    assert get.call_args.kwargs["headers"] == {"If-None-Match": '"abc123"'}
+    assert second.epList == first.epList
+    assert not second.parsed_feed.complete
+
+
+def test_partially_read_feeds_are_read_again_if_more_entries_are_needed(tmp_path):
+    feed = Path(_write_feed(tmp_path / "feed.xml", range(28, 0, -1)))
+    feed_cache = FeedCache(tmp_path / "cache")
+
+    with mock.patch(
+        "tonie_podcast_sync.feed_stream.requests.get",
+        return_value=_response(body=feed.read_bytes(), headers={"ETag": '"abc123"'}),
+    ):
+        Podcast(FEED_URL, feed_cache=feed_cache, streaming=True)
+
+    with mock.patch(
+        "tonie_podcast_sync.feed_stream.requests.get",
+        return_value=_response(body=feed.read_bytes(), headers={"ETag": '"abc123"'}),
+    ) as get:
+        podcast = Podcast(FEED_URL, feed_cache=feed_cache, streaming=True, episode_selection=EpisodeSelection.FILL)
+    assert get.call_args.kwargs["headers"] == {}
+    assert len(podcast.entries) == 28
+    assert feed_cache.load(FEED_URL).complete
+
+
+def test_streaming_needs_less_memory():
+    feed = str(RES_DIR / "kakadu.xml")
+
+    def peak_memory(**kwargs):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            Podcast(feed, episode_sorting=EpisodeSorting.BY_DATE_OLDEST_FIRST, **kwargs)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak_memory(streaming=True) < peak_memory() / 2
@@ -0,0 +1,56 @@
+"""Tests for the memoized ffmpeg capability probe."""
+
+import subprocess
+from unittest import mock
+
+import pytest
+
+from tonie_podcast_sync.ffmpeg import probe_ffmpeg
+
+VERSION_OUTPUT = "ffmpeg version 6.1.1-3ubuntu5 Copyright (c) 2000-2023 the FFmpeg developers\nbuilt with gcc 13\n"
+ENCODERS_OUTPUT = """Encoders:
+ V..... = Video
+ A..... = Audio
+ ------
+ V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC / MPEG-4 part 10 (codec h264)
+ A....D aac                  AAC (Advanced Audio Coding)
+ A....D libmp3lame           libmp3lame MP3 (MPEG audio layer 3) (codec mp3)
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_probe_cache():
+    probe_ffmpeg.cache_clear()
+    yield
+    probe_ffmpeg.cache_clear()
+
+
+def _fake_run(args, **_kwargs):
+    output = VERSION_OUTPUT if args[-1] == "-version" else ENCODERS_OUTPUT
+    return subprocess.CompletedProcess(args, 0, stdout=output, stderr="")
+
+
+def test_probe_reports_version_and_encoders():
+    with mock.patch("tonie_podcast_sync.ffmpeg.subprocess.run", side_effect=_fake_run):
+        capabilities = probe_ffmpeg()
+
+    assert capabilities.version == "6.1.1-3ubuntu5"
+    assert capabilities.encoders == {"libx264", "aac", "libmp3lame"}
+    assert capabilities.supports_encoder("libmp3lame")
+    assert not capabilities.supports_encoder("libopus")
+
+
+def test_probe_runs_only_once_per_process():
+    with mock.patch("tonie_podcast_sync.ffmpeg.subprocess.run", side_effect=_fake_run) as run:
+        for _ in range(10):
+            probe_ffmpeg()
+
+    assert run.call_count == 2  # -version and -encoders
+
+
+def test_missing_ffmpeg_is_remembered():
+    with mock.patch("tonie_podcast_sync.ffmpeg.subprocess.run", side_effect=FileNotFoundError) as run:
+        assert probe_ffmpeg() is None
+        assert probe_ffmpeg() is None
+
+    assert run.call_count == 1
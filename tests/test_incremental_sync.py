@@ -0,0 +1,119 @@
+"""Tests for the incremental sync that only transfers the delta."""
+
+from unittest import mock
+
+import pytest
+from tonie_api.models import Chapter, CreativeTonie, Household
+
+from tonie_podcast_sync.podcast import Episode, EpisodeSorting
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+HOUSEHOLD = Household(id="household-1", name="Test House", ownerName="Test Owner", access="owner", canLeave=True)
+
+
+def _create_episode(i):
+    test_feed_data = {
+        "title": f"Episode {i}",
+        "published": f"Mon, 0{i} Jan 2024 10:00:00 +0000",
+        "published_parsed": (2024, 1, i, 10, 0, 0, 0, 1, 0),
+        "id": f"test-guid-{i}",
+        "itunes_duration": "10:00",
+    }
+    return Episode(podcast="Test Podcast", raw=test_feed_data, url=f"http://example.com/ep{i}.mp3")
+
+
+def _chapter(episode_number, chapter_id):
+    return Chapter(
+        id=chapter_id,
+        title=f"episode {episode_number} (Mon, 0{episode_number} Jan 2024 10:00:00 +0000)",
+        file=f"file-{chapter_id}",
+        seconds=600,
+        transcoding=False,
+    )
+
+
+def _tonie(chapters):
+    return CreativeTonie(
+        id="tonie-123",
+        householdId="household-1",
+        name="Test Tonie",
+        imageUrl="http://example.com/img.png",
+        secondsRemaining=5400 - 600 * len(chapters),
+        secondsPresent=600 * len(chapters),
+        chaptersPresent=len(chapters),
+        chaptersRemaining=99 - len(chapters),
+        transcoding=False,
+        lastUpdate=None,
+        chapters=chapters,
+    )
+
+
+@pytest.fixture
+def api_mock():
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = [HOUSEHOLD]
+        # The tonie holds episodes 3, 1 (outdated) and 2, the feed now offers 4, 3, 2
+        api_mock.get_all_creative_tonies.return_value = [
+            _tonie([_chapter(3, "chap-3"), _chapter(1, "chap-1"), _chapter(2, "chap-2")])
+        ]
+        _mock.return_value = api_mock
+        yield api_mock
+
+
+def test_incremental_sync_only_transfers_delta(api_mock, tmp_path):
+    tps = ToniePodcastSync("user", "pass")
+    tps.podcast_cache_directory = tmp_path
+
+    podcast = mock.MagicMock()
+    podcast.epList = [_create_episode(i) for i in (4, 3, 2, 1)]
+    podcast.title = "Test Podcast"
+    podcast.epSorting = EpisodeSorting.BY_DATE_NEWEST_FIRST
+
+    response = mock.MagicMock()
+    response.ok = True
+    response.raise_for_status = mock.MagicMock()
+    response.iter_content = mock.MagicMock(return_value=[b"fake audio"])
+    tps._session.get = mock.MagicMock(return_value=response)
+
+    new_chapter = _chapter(4, "chap-4")
+    api_mock.get_all_creative_tonies_by_household.return_value = [
+        _tonie([_chapter(3, "chap-3"), _chapter(2, "chap-2"), new_chapter])
+    ]
+
+    tps.sync_podcast_to_tonie(podcast, "tonie-123", max_minutes=30, wipe=True, incremental=True)
+
+    # Nothing is wiped, only the outdated chapter of episode 1 is removed
+    api_mock.clear_all_chapter_of_tonie.assert_not_called()
+    first_sort = api_mock.sort_chapter_of_tonie.call_args_list[0]
+    assert [chapter.id for chapter in first_sort.args[1]] == ["chap-3", "chap-2"]
+
+    # Only the missing episode is downloaded and uploaded
+    tps._session.get.assert_called_once()
+    assert tps._session.get.call_args.args[0] == "http://example.com/ep4.mp3"
+    api_mock.upload_file_to_tonie.assert_called_once()
+    assert api_mock.upload_file_to_tonie.call_args.args[2].startswith("Episode 4")
+
+    # Only the household of the tonie is refreshed, and the chapters are sorted in selection order
+    api_mock.get_all_creative_tonies_by_household.assert_called_once_with(HOUSEHOLD)
+    assert api_mock.get_all_creative_tonies.call_count == 1
+    last_sort = api_mock.sort_chapter_of_tonie.call_args_list[-1]
+    assert [chapter.id for chapter in last_sort.args[1]] == ["chap-4", "chap-3", "chap-2"]
+
+
+def test_incremental_sync_without_changes_transfers_nothing(api_mock, tmp_path):
+    tps = ToniePodcastSync("user", "pass")
+    tps.podcast_cache_directory = tmp_path
+
+    podcast = mock.MagicMock()
+    podcast.epList = [_create_episode(i) for i in (3, 1, 2)]
+    podcast.title = "Test Podcast"
+    podcast.epSorting = EpisodeSorting.BY_DATE_OLDEST_FIRST
+    tps._session.get = mock.MagicMock()
+
+    api_mock.get_all_creative_tonies_by_household.return_value = api_mock.get_all_creative_tonies.return_value
+    tps._sync_incremental(podcast, "tonie-123", 30, episode_selection=mock.MagicMock())
+
+    tps._session.get.assert_not_called()
+    api_mock.upload_file_to_tonie.assert_not_called()
+    api_mock.sort_chapter_of_tonie.assert_not_called()
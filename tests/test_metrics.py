@@ -0,0 +1,177 @@
+"""Tests for the metrics of a sync run."""
+
+from unittest import mock
+
+import pytest
+from requests.exceptions import HTTPError
+
+from tonie_podcast_sync.metrics import render_metrics
+from tonie_podcast_sync.podcast import Episode
+from tonie_podcast_sync.retry import RetryPolicy
+from tonie_podcast_sync.run_report import RunReport, StageTimings
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+
+def _episode():
+    test_feed_data = {
+        "title": "Test Episode",
+        "published": "Mon, 01 Jan 2024 10:00:00 +0000",
+        "published_parsed": (2024, 1, 1, 10, 0, 0, 0, 1, 0),
+        "id": "test-guid-123",
+        "itunes_duration": "10:30",
+    }
+    return Episode(podcast="Test Podcast", raw=test_feed_data, url="http://example.com/test.mp3")
+
+
+def _http_error(status_code):
+    response = mock.MagicMock()
+    response.status_code = status_code
+    response.headers = {}
+    return HTTPError(f"{status_code} error", response=response)
+
+
+@pytest.fixture
+def mock_tonie_api():
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = []
+        api_mock.get_all_creative_tonies.return_value = []
+        _mock.return_value = api_mock
+        yield api_mock
+
+
+def _samples(metrics):
+    return dict(line.rsplit(" ", 1) for line in metrics.splitlines() if not line.startswith("#"))
+
+
+def test_metrics_of_a_run():
+    run_report = RunReport()
+    timings = run_report.tonie("tonie-1")
+    timings.record("feed_fetch", 0.3, url="https://example.com/feed.xml", not_modified=True)
+    timings.record("download", 2.0, episode="Episode 1", source="download", bytes=1000)
+    timings.record("download", 0.1, episode="Episode 2", source="cache", bytes=500)
+    timings.record("retry", 3.0, operation="upload", episode="Episode 1", error="502 error")
+    timings.record("upload", 4.0, episode="Episode 1", uploaded=True, bytes=1000)
+    timings.record("upload", 0.2, episode="Episode 2", uploaded=False)
+    timings.record("sync", 7.0, podcast="Test Podcast")
+    run_report.tonie("tonie-2").record("feed_fetch", 0.0, url="https://example.com/broken.xml", error="timeout")
+    run_report.count_api_call("GET", "https://api.tonie.cloud/v2/households")
+
+    samples = _samples(render_metrics(run_report))
+
+    assert samples['tonie_podcast_sync_sync_success{tonie="tonie-1"}'] == "1"
+    assert samples['tonie_podcast_sync_sync_success{tonie="tonie-2"}'] == "0"
+    assert samples['tonie_podcast_sync_feed_up{tonie="tonie-1",feed="https://example.com/feed.xml"}'] == "1"
+    assert samples['tonie_podcast_sync_feed_up{tonie="tonie-2",feed="https://example.com/broken.xml"}'] == "0"
+    assert samples['tonie_podcast_sync_feed_not_modified{tonie="tonie-1",feed="https://example.com/feed.xml"}'] == "1"
+    # Episodes restored from the episode cache are not downloaded
+    assert samples['tonie_podcast_sync_downloaded_bytes{tonie="tonie-1"}'] == "1000"
+    assert samples['tonie_podcast_sync_uploaded_bytes{tonie="tonie-1"}'] == "1000"
+    assert samples['tonie_podcast_sync_episodes{tonie="tonie-1",operation="download",result="cache"}'] == "1"
+    assert samples['tonie_podcast_sync_episodes{tonie="tonie-1",operation="upload",result="failed"}'] == "1"
+    assert samples['tonie_podcast_sync_retries{tonie="tonie-1",operation="upload"}'] == "1"
+    assert samples['tonie_podcast_sync_retries{tonie="tonie-1",operation="download"}'] == "0"
+    assert samples['tonie_podcast_sync_api_calls{endpoint="GET /v2/households"}'] == "1"
+    assert samples['tonie_podcast_sync_stage_duration_seconds_bucket{stage="download",le="0.1"}'] == "1"
+    assert samples['tonie_podcast_sync_stage_duration_seconds_bucket{stage="download",le="+Inf"}'] == "2"
+    assert samples['tonie_podcast_sync_stage_duration_seconds_count{stage="upload"}'] == "2"
+    assert not any('stage="retry"' in sample for sample in samples)
+
+
+def test_failed_transfers_are_counted_as_failed():
+    timings = StageTimings()
+    with pytest.raises(RuntimeError), timings.measure("download", episode="Episode 1"):
+        raise RuntimeError
+    with pytest.raises(RuntimeError), timings.measure("upload", episode="Episode 1"):
+        raise RuntimeError
+    run_report = RunReport()
+    run_report.tonie("tonie-1").extend(timings)
+
+    samples = _samples(render_metrics(run_report))
+
+    assert samples['tonie_podcast_sync_episodes{tonie="tonie-1",operation="download",result="failed"}'] == "1"
+    assert samples['tonie_podcast_sync_episodes{tonie="tonie-1",operation="upload",result="failed"}'] == "1"
+    assert samples['tonie_podcast_sync_uploaded_bytes{tonie="tonie-1"}'] == "0"
+
+
+def test_report_errors_do_not_hide_the_sync_error(app_settings_dir):  # noqa: ARG001
+    tonie_config = mock.MagicMock()
+    tonie_config.podcast = "https://example.com/broken.xml"
+    tonie_config.get = mock.MagicMock(side_effect=lambda _key, default=None: default)
+    mock_settings = mock.MagicMock()
+    mock_settings.get = mock.MagicMock(side_effect=lambda _key, default=None: default)
+    mock_settings.CREATIVE_TONIES = {"tonie-1": tonie_config}
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync"),
+        mock.patch("tonie_podcast_sync.podcast.Podcast", side_effect=RuntimeError("feed unavailable")),
+        mock.patch("tonie_podcast_sync.run_report.RunReport.write", side_effect=ValueError("not serializable")),
+    ):
+        from tonie_podcast_sync.cli import update_tonies  # noqa: PLC0415
+
+        with pytest.raises(RuntimeError, match="feed unavailable"):
+            update_tonies()
+
+
+def test_label_values_are_escaped():
+    run_report = RunReport()
+    run_report.tonie("tonie-1").record("feed_fetch", 0.1, url='C:\\feeds\\"new"\nfeed.xml')
+
+    metrics = render_metrics(run_report)
+
+    assert 'feed="C:\\\\feeds\\\\\\"new\\"\\nfeed.xml"' in metrics
+
+
+@mock.patch("tonie_podcast_sync.toniepodcastsync.time.sleep")
+def test_retries_are_recorded(mock_sleep, mock_tonie_api, tmp_path):
+    mock_tonie_api.upload_file_to_tonie.side_effect = [_http_error(502), None]
+    tonie = mock.MagicMock()
+    tonie.id = "tonie-123"
+    mock_tonie_api.get_all_creative_tonies.return_value = [tonie]
+    tps = ToniePodcastSync("user", "pass", retry_policy=RetryPolicy(jitter=0))
+    tps.podcast_cache_directory = tmp_path
+    success = mock.MagicMock()
+    success.headers = {}
+    success.iter_content.return_value = [b"fake audio data"]
+    tps._session.get = mock.MagicMock(side_effect=[_http_error(503), success])
+    timings = StageTimings()
+    episode = _episode()
+
+    assert tps._ToniePodcastSync__cache_episode(episode, timings=timings)
+    assert tps._upload_episode(episode, "tonie-123", timings)
+
+    retries = [timing for timing in timings if timing.stage == "retry"]
+    assert [retry.details["operation"] for retry in retries] == ["download", "upload"]
+    assert [retry.seconds for retry in retries] == [call.args[0] for call in mock_sleep.call_args_list]
+    assert retries[0].details["error"] == "503 error"
+
+
+def test_update_tonies_writes_metrics_of_failed_feeds(app_settings_dir):
+    tonie_config = mock.MagicMock()
+    tonie_config.podcast = "https://example.com/broken.xml"
+    tonie_config.get = mock.MagicMock(side_effect=lambda _key, default=None: default)
+    metrics_file = app_settings_dir / "metrics" / "tonie_podcast_sync.prom"
+    mock_settings = mock.MagicMock()
+    mock_settings.get = mock.MagicMock(
+        side_effect=lambda key, default=None: {"metrics_file": str(metrics_file)}.get(key, default)
+    )
+    mock_settings.CREATIVE_TONIES = {"tonie-1": tonie_config}
+
+    def fetch_feed(*_args, **_kwargs):
+        msg = "feed unavailable"
+        raise RuntimeError(msg)
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync"),
+        mock.patch("tonie_podcast_sync.podcast.Podcast", side_effect=fetch_feed),
+    ):
+        from tonie_podcast_sync.cli import update_tonies  # noqa: PLC0415
+
+        with pytest.raises(RuntimeError):
+            update_tonies()
+
+    samples = _samples(metrics_file.read_text(encoding="utf-8"))
+    assert samples['tonie_podcast_sync_feed_up{tonie="tonie-1",feed="https://example.com/broken.xml"}'] == "0"
+    assert samples['tonie_podcast_sync_sync_success{tonie="tonie-1"}'] == "0"
@@ -0,0 +1,132 @@
+"""Tests for the concurrent episode downloads."""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+from requests.exceptions import RequestException
+
+from tonie_podcast_sync.podcast import Episode, EpisodeSelection, EpisodeSorting
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+
+@pytest.fixture
+def mock_tonie_api():
+    """Mock TonieAPI."""
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = []
+        api_mock.get_all_creative_tonies.return_value = []
+        _mock.return_value = api_mock
+        yield _mock
+
+
+def _create_podcast(count, duration="10:00"):
+    episodes = []
+    for i in range(1, count + 1):
+        test_feed_data = {
+            "title": f"Episode {i}",
+            "published": f"Mon, 0{i} Jan 2024 10:00:00 +0000",
+            "published_parsed": (2024, 1, i, 10, 0, 0, 0, 1, 0),
+            "id": f"test-guid-{i}",
+            "itunes_duration": duration,
+        }
+        episodes.append(Episode(podcast="Test Podcast", raw=test_feed_data, url=f"http://example.com/ep{i}.mp3"))
+
+    podcast = mock.MagicMock()
+    podcast.epList = episodes
+    podcast.title = "Test Podcast"
+    podcast.epSorting = EpisodeSorting.BY_DATE_NEWEST_FIRST
+    return podcast
+
+
+def _transfer_episodes(tps, podcast, max_minutes):
+    """Select and transfer the episodes of the podcast the way a sync does, with the upload mocked."""
+    episodes_to_cache = tps._select_episodes_within_time_limit(podcast, max_minutes, EpisodeSelection.GREEDY)
+    available_episodes = [ep for ep in podcast.epList if ep not in episodes_to_cache]
+    with mock.patch.object(
+        tps, "_upload_episodes_to_tonie", side_effect=lambda _podcast, episodes, _tonie_id, **_kwargs: list(episodes)
+    ):
+        return tps._transfer_episodes(podcast, "tonie-123", episodes_to_cache, available_episodes, max_minutes * 60)
+
+
+def _successful_response():
+    response = mock.MagicMock()
+    response.ok = True
+    response.raise_for_status = mock.MagicMock()
+    response.iter_content = mock.MagicMock(return_value=[b"fake audio data"])
+    return response
+
+
+@pytest.mark.usefixtures("mock_tonie_api")
+def test_episodes_are_downloaded_concurrently(tmp_path):
+    """Test that the selected episodes are downloaded at the same time."""
+    tps = ToniePodcastSync("user", "pass", download_workers=3)
+    tps.podcast_cache_directory = tmp_path
+    podcast = _create_podcast(3)
+    barrier = threading.Barrier(3, timeout=5)
+
+    def mock_get(*_args, **_kwargs):
+        # All three downloads only pass the barrier if they run at the same time
+        barrier.wait()
+        return _successful_response()
+
+    tps._session.get = mock_get
+    cached_episodes = _transfer_episodes(tps, podcast, max_minutes=30)
+
+    assert [ep.title for ep in cached_episodes] == ["Episode 1", "Episode 2", "Episode 3"]
+
+
+@pytest.mark.usefixtures("mock_tonie_api")
+def test_episode_order_is_kept_when_later_downloads_finish_first(tmp_path):
+    """Test that the cached episodes follow the selection order, not the download completion order."""
+    tps = ToniePodcastSync("user", "pass", download_workers=3)
+    tps.podcast_cache_directory = tmp_path
+    podcast = _create_podcast(3)
+
+    def mock_get(url, *_args, **_kwargs):
+        if "ep1.mp3" in url:
+            time.sleep(0.2)
+        return _successful_response()
+
+    tps._session.get = mock_get
+    cached_episodes = _transfer_episodes(tps, podcast, max_minutes=30)
+
+    assert [ep.title for ep in cached_episodes] == ["Episode 1", "Episode 2", "Episode 3"]
+    assert all(ep.fpath.parent.parent == tmp_path for ep in cached_episodes)
+
+
+@pytest.mark.usefixtures("mock_tonie_api")
+def test_replacement_respects_pending_downloads(tmp_path):
+    """Test that a replacement only fills the time left by the other selected episodes."""
+    tps = ToniePodcastSync("user", "pass", download_workers=3)
+    tps.podcast_cache_directory = tmp_path
+    podcast = _create_podcast(3)
+    # A long episode that only fits if a later selected episode failed as well
+    podcast.epList.append(
+        Episode(
+            podcast="Test Podcast",
+            raw={
+                "title": "Long Episode",
+                "published": "Mon, 08 Jan 2024 10:00:00 +0000",
+                "published_parsed": (2024, 1, 8, 10, 0, 0, 0, 1, 0),
+                "id": "test-guid-long",
+                "itunes_duration": "20:00",
+            },
+            url="http://example.com/long.mp3",
+        )
+    )
+    podcast.epList.append(_create_podcast(5).epList[4])
+
+    def mock_get(url, *_args, **_kwargs):
+        if "ep1.mp3" in url:
+            msg = "Network error for ep1"
+            raise RequestException(msg)
+        return _successful_response()
+
+    tps._session.get = mock_get
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.time.sleep"):
+        cached_episodes = _transfer_episodes(tps, podcast, max_minutes=30)
+
+    assert [ep.title for ep in cached_episodes] == ["Episode 5", "Episode 2", "Episode 3"]
@@ -0,0 +1,113 @@
+"""Tests for the concurrent multi-tonie sync of the CLI."""
+
+import threading
+from unittest import mock
+
+import pytest
+import typer
+
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+
+def _mock_settings(sync_workers, tonie_ids):
+    mock_settings = mock.MagicMock()
+    mock_settings.TONIE_CLOUD_ACCESS.USERNAME = "test_user"
+    mock_settings.TONIE_CLOUD_ACCESS.PASSWORD = "test_pass"
+    mock_settings.get = mock.MagicMock(
+        side_effect=lambda key, default=None: {"sync_workers": sync_workers}.get(key, default)
+    )
+
+    tonie_configs = {}
+    for tonie_id in tonie_ids:
+        tonie_config = mock.MagicMock()
+        tonie_config.podcast = f"https://example.com/{tonie_id}.xml"
+        tonie_config.maximum_length = 90
+        tonie_config.get = mock.MagicMock(
+            side_effect=lambda key, default=None, tonie_id=tonie_id: {"name": f"Tonie {tonie_id}"}.get(key, default)
+        )
+        tonie_configs[tonie_id] = tonie_config
+    mock_settings.CREATIVE_TONIES = tonie_configs
+    return mock_settings
+
+
+def test_tonies_are_synced_concurrently():
+    """Test that with sync_workers > 1 independent tonies are synced at the same time."""
+    mock_settings = _mock_settings(sync_workers=2, tonie_ids=["tonie-1", "tonie-2"])
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_other_sync(*_args, **_kwargs):
+        # Both syncs only pass the barrier if they run at the same time
+        barrier.wait()
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync") as mock_tps_class,
+        mock.patch("tonie_podcast_sync.podcast.Podcast"),
+    ):
+        mock_tps_instance = mock.MagicMock()
+        mock_tps_instance.sync_podcast_to_tonie.side_effect = wait_for_other_sync
+        mock_tps_class.return_value = mock_tps_instance
+
+        from tonie_podcast_sync.cli import update_tonies  # noqa: PLC0415
+
+        update_tonies()
+
+    assert mock_tps_class.call_count == 1, "All syncs should share one ToniePodcastSync instance"
+    synced_tonies = {call.args[1] for call in mock_tps_instance.sync_podcast_to_tonie.call_args_list}
+    assert synced_tonies == {"tonie-1", "tonie-2"}
+
+
+def test_failing_tonie_does_not_abort_other_syncs(capsys):
+    """Test that an error for one tonie is reported while the other tonies are still synced."""
+    mock_settings = _mock_settings(sync_workers=3, tonie_ids=["tonie-1", "tonie-2", "tonie-3"])
+
+    def fail_for_second_tonie(_podcast, tonie_id, *_args, **_kwargs):
+        if tonie_id == "tonie-2":
+            msg = "feed unavailable"
+            raise RuntimeError(msg)
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync") as mock_tps_class,
+        mock.patch("tonie_podcast_sync.podcast.Podcast"),
+    ):
+        mock_tps_instance = mock.MagicMock()
+        mock_tps_instance.sync_podcast_to_tonie.side_effect = fail_for_second_tonie
+        mock_tps_class.return_value = mock_tps_instance
+
+        from tonie_podcast_sync.cli import update_tonies  # noqa: PLC0415
+
+        with pytest.raises(typer.Exit) as exc_info:
+            update_tonies()
+
+    assert exc_info.value.exit_code == 1
+    assert mock_tps_instance.sync_podcast_to_tonie.call_count == 3
+    captured = capsys.readouterr()
+    assert "Sync results" in captured.out
+    assert "feed unavailable" in captured.out
+    assert captured.out.count("done") == 2
+    assert "Sync failed for tonies: tonie-2" in captured.out
+
+
+def test_cache_directory_is_thread_local(tmp_path):
+    """Test that concurrent syncs do not overwrite each other's cache directory."""
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as mock_tonie_api:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = []
+        api_mock.get_all_creative_tonies.return_value = []
+        mock_tonie_api.return_value = api_mock
+        tps = ToniePodcastSync("user", "pass")
+
+    tps.podcast_cache_directory = tmp_path / "main"
+    seen_in_thread = []
+
+    def set_directory_in_thread():
+        tps.podcast_cache_directory = tmp_path / "worker"
+        seen_in_thread.append(tps.podcast_cache_directory)
+
+    worker = threading.Thread(target=set_directory_in_thread)
+    worker.start()
+    worker.join()
+
+    assert seen_in_thread == [tmp_path / "worker"]
+    assert tps.podcast_cache_directory == tmp_path / "main"
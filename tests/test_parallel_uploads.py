@@ -0,0 +1,144 @@
+"""Tests for the concurrent chapter uploads."""
+
+import threading
+from unittest import mock
+
+import pytest
+from requests.exceptions import HTTPError
+from tonie_api.models import Chapter, CreativeTonie, Household
+
+from tonie_podcast_sync.podcast import Episode
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+HOUSEHOLD = Household(id="household-1", name="Test House", ownerName="Test Owner", access="owner", canLeave=True)
+
+
+def _tonie(chapters):
+    return CreativeTonie(
+        id="tonie-123",
+        householdId="household-1",
+        name="Test Tonie",
+        imageUrl="http://example.com/img.png",
+        secondsRemaining=5400,
+        secondsPresent=0,
+        chaptersPresent=len(chapters),
+        chaptersRemaining=99 - len(chapters),
+        transcoding=False,
+        lastUpdate=None,
+        chapters=chapters,
+    )
+
+
+def _chapter(chapter_id, title):
+    return Chapter(id=chapter_id, title=title, file=f"file-{chapter_id}", seconds=600, transcoding=False)
+
+
+def _create_episodes(count):
+    episodes = []
+    for i in range(1, count + 1):
+        test_feed_data = {
+            "title": f"Episode {i}",
+            "published": f"Mon, 0{i} Jan 2024 10:00:00 +0000",
+            "published_parsed": (2024, 1, i, 10, 0, 0, 0, 1, 0),
+            "id": f"test-guid-{i}",
+            "itunes_duration": "10:00",
+        }
+        episode = Episode(podcast="Test Podcast", raw=test_feed_data, url=f"http://example.com/ep{i}.mp3")
+        episode.fpath = f"/tmp/ep{i}.mp3"
+        episodes.append(episode)
+    return episodes
+
+
+class FakeTonieCloud:
+    """Appends uploaded chapters in the order the uploads finish, like the Tonie Cloud."""
+
+    def __init__(self, chapters, finish_order):
+        self.chapters = list(chapters)
+        self.finish_order = list(finish_order)
+        self.condition = threading.Condition()
+
+    def upload_file_to_tonie(self, _tonie, _path, title):
+        with self.condition:
+            assert self.condition.wait_for(lambda: self.finish_order[0] == title, timeout=5)
+            self.chapters.append(_chapter(f"new-{title}", title))
+            self.finish_order.pop(0)
+            self.condition.notify_all()
+
+    def get_all_creative_tonies_by_household(self, _household):
+        return [_tonie(self.chapters)]
+
+
+@pytest.fixture
+def api_mock():
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = [HOUSEHOLD]
+        api_mock.get_all_creative_tonies.return_value = [_tonie([_chapter("old", "Old episode")])]
+        _mock.return_value = api_mock
+        yield api_mock
+
+
+def test_episodes_are_uploaded_concurrently_in_selection_order(api_mock):
+    """Test that concurrent uploads end up in selection order behind the existing chapters."""
+    tps = ToniePodcastSync("user", "pass", upload_workers=3)
+    episodes = _create_episodes(3)
+    # The last upload finishes first, which is only possible if all uploads run at the same time
+    titles = [tps._generate_chapter_title(episode) for episode in episodes]
+    cloud = FakeTonieCloud([_chapter("old", "Old episode")], finish_order=reversed(titles))
+    api_mock.upload_file_to_tonie.side_effect = cloud.upload_file_to_tonie
+    api_mock.get_all_creative_tonies_by_household.side_effect = cloud.get_all_creative_tonies_by_household
+    podcast = mock.MagicMock()
+    podcast.title = "Test Podcast"
+
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.console") as console_mock:
+        tps._upload_episodes_to_tonie(podcast, episodes, "tonie-123")
+
+    api_mock.sort_chapter_of_tonie.assert_called_once()
+    sorted_titles = [chapter.title for chapter in api_mock.sort_chapter_of_tonie.call_args.args[1]]
+    assert sorted_titles == ["Old episode", *titles]
+    assert [chapter.title for chapter in tps.get_tonies()[0].chapters] == sorted_titles
+    assert "Successfully uploaded" in console_mock.print.call_args_list[0].args[0]
+
+
+@pytest.mark.usefixtures("api_mock")
+@mock.patch("tonie_podcast_sync.toniepodcastsync.time.sleep")
+def test_concurrent_upload_retries_and_reports_failures(_mock_sleep, api_mock):  # noqa: PT019
+    """Test that every episode is retried on its own and failures are reported."""
+    episodes = _create_episodes(3)
+    failing_title = ToniePodcastSync._generate_chapter_title(None, episodes[1])
+    attempts = {}
+    lock = threading.Lock()
+
+    def upload(_tonie, _path, title):
+        with lock:
+            attempts[title] = attempts.get(title, 0) + 1
+        if title == failing_title:
+            raise HTTPError
+
+    api_mock.upload_file_to_tonie.side_effect = upload
+    api_mock.get_all_creative_tonies_by_household.return_value = api_mock.get_all_creative_tonies.return_value
+
+    tps = ToniePodcastSync("user", "pass", upload_workers=3)
+    podcast = mock.MagicMock()
+    podcast.title = "Test Podcast"
+
+    with mock.patch.object(tps, "_report_upload_results") as report_mock:
+        tps._upload_episodes_to_tonie(podcast, episodes, "tonie-123")
+
+    assert attempts[failing_title] == 3
+    assert sum(attempts.values()) == 5
+    report_mock.assert_called_once_with("Test Podcast", "tonie-123", [episodes[0], episodes[2]], [episodes[1]])
+
+
+def test_sequential_upload_does_not_sort_chapters(api_mock):
+    """Test that the default of one upload worker keeps the previous API usage."""
+    tps = ToniePodcastSync("user", "pass")
+    podcast = mock.MagicMock()
+    podcast.title = "Test Podcast"
+
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.console"):
+        tps._upload_episodes_to_tonie(podcast, _create_episodes(3), "tonie-123")
+
+    assert api_mock.upload_file_to_tonie.call_count == 3
+    api_mock.get_all_creative_tonies_by_household.assert_not_called()
+    api_mock.sort_chapter_of_tonie.assert_not_called()
@@ -1,5 +1,7 @@
 """Tests for performance optimizations."""
 
+import subprocess
+import sys
 from collections import deque
 from unittest import mock
 
@@ -78,8 +80,8 @@ def test_streaming_download_uses_iter_content(temp_cache_dir):
 
 
 @pytest.mark.usefixtures("mock_tonie_api")
-def test_volume_adjustment_loads_to_memory_when_needed(temp_cache_dir):
-    """Test that volume adjustment loads file to memory (required for pydub processing)."""
+def test_volume_adjustment_streams_through_ffmpeg(temp_cache_dir):
+    """Test that volume adjustment pipes the download through ffmpeg instead of loading it to memory."""
     tps = ToniePodcastSync("user", "pass")
     tps.podcast_cache_directory = temp_cache_dir
 
@@ -101,19 +103,98 @@ def test_volume_adjustment_loads_to_memory_when_needed(temp_cache_dir):
     mock_response = mock.MagicMock()
     mock_response.ok = True
     mock_response.raise_for_status = mock.MagicMock()
-    mock_response.iter_content = mock.MagicMock(return_value=[b"fake audio content"])
+    mock_response.iter_content = mock.MagicMock(return_value=[b"fake ", b"audio ", b"content"])
     tps._session.get = mock.MagicMock(return_value=mock_response)
 
-    # Mock ffmpeg availability
+    # Stand-in for ffmpeg that copies stdin to stdout
+    passthrough = [sys.executable, "-c", "import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)"]
+
     with (
         mock.patch.object(tps, "_is_ffmpeg_available", return_value=True),
-        mock.patch.object(tps, "_adjust_volume", return_value=b"adjusted audio") as mock_adjust,
+        mock.patch.object(tps, "_volume_adjustment_command", return_value=passthrough) as mock_command,
     ):
         result = tps._ToniePodcastSync__cache_episode(ep)
 
-        assert result is True
-        # When volume adjustment is needed, audio is loaded to memory for processing
-        assert mock_adjust.called
+    assert result is True
+    mock_command.assert_called_once_with(5)
+    assert ep.fpath.read_bytes() == b"fake audio content"
+
+
+@pytest.mark.usefixtures("mock_tonie_api")
+def test_volume_adjustment_does_not_block_on_error_output(tmp_path):
+    """Test that ffmpeg does not stall on a full stderr pipe, e.g. while reporting every frame of a corrupt file."""
+    tps = ToniePodcastSync("user", "pass")
+    mock_response = mock.MagicMock()
+    mock_response.iter_content = mock.MagicMock(return_value=[b"x" * 8192] * 128)
+    # Stand-in for ffmpeg that reports an error for every 4 KB it reads and fails at the end
+    noisy = [
+        sys.executable,
+        "-c",
+        (
+            "import sys\n"
+            "while sys.stdin.buffer.read(4096):\n"
+            "    sys.stderr.write('Header missing' + ' ' * 1000 + '\\n')\n"
+            "sys.exit(1)"
+        ),
+    ]
+
+    with (
+        mock.patch.object(tps, "_volume_adjustment_command", return_value=noisy),
+        pytest.raises(subprocess.CalledProcessError) as error,
+    ):
+        tps._download_with_volume_adjustment(mock_response, tmp_path / "episode.mp3", 5)
+
+    assert error.value.stderr.startswith(b"Header missing")
+
+
+@pytest.mark.usefixtures("mock_tonie_api")
+def test_failed_volume_adjustment_is_a_failed_download(temp_cache_dir):
+    """Test that an episode ffmpeg cannot process is not cached, so it can be replaced by another episode."""
+    tps = ToniePodcastSync("user", "pass")
+    tps.podcast_cache_directory = temp_cache_dir
+    test_feed_data = {
+        "title": "Test Episode",
+        "published": "Mon, 01 Jan 2024 10:00:00 +0000",
+        "published_parsed": (2024, 1, 1, 10, 0, 0, 0, 1, 0),
+        "id": "test-guid-123",
+        "itunes_duration": "10:30",
+    }
+    ep = Episode(podcast="Test Podcast", raw=test_feed_data, url="http://example.com/test.mp3", volume_adjustment=5)
+    mock_response = mock.MagicMock()
+    mock_response.iter_content = mock.MagicMock(return_value=[b"corrupt ", b"audio"])
+    tps._session.get = mock.MagicMock(return_value=mock_response)
+    # Stand-in for ffmpeg that writes part of the output and fails
+    failing = [
+        sys.executable,
+        "-c",
+        (
+            "import sys\n"
+            "sys.stdin.buffer.read()\n"
+            "sys.stdout.write('partial')\n"
+            "sys.stderr.write('Invalid data found when processing input')\n"
+            "sys.exit(1)"
+        ),
+    ]
+
+    with (
+        mock.patch.object(tps, "_is_ffmpeg_available", return_value=True),
+        mock.patch.object(tps, "_volume_adjustment_command", return_value=failing),
+    ):
+        result = tps._ToniePodcastSync__cache_episode(ep)
+
+    assert result is False
+    assert tps._session.get.call_count == 1
+    assert not list(temp_cache_dir.rglob("*.mp3"))
+
+
+@pytest.mark.usefixtures("mock_tonie_api")
+def test_volume_adjustment_command_uses_volume_filter():
+    """Test that the ffmpeg command reads from stdin, writes to stdout and applies the gain."""
+    tps = ToniePodcastSync("user", "pass")
+    command = tps._volume_adjustment_command(-3)
+    assert command[command.index("-i") + 1] == "pipe:0"
+    assert command[-1] == "pipe:1"
+    assert "volume=-3dB" in command
 
 
 @pytest.mark.usefixtures("mock_tonie_api")
@@ -0,0 +1,133 @@
+"""Tests for the download-to-upload pipeline."""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+from tonie_api.models import CreativeTonie, Household
+
+from tonie_podcast_sync.pipeline import pipelined
+from tonie_podcast_sync.podcast import Episode, EpisodeSorting
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+HOUSEHOLD = Household(id="household-1", name="Test House", ownerName="Test Owner", access="owner", canLeave=True)
+TONIE = CreativeTonie(
+    id="tonie-123",
+    householdId="household-1",
+    name="Test Tonie",
+    imageUrl="http://example.com/img.png",
+    secondsRemaining=5400,
+    secondsPresent=0,
+    chaptersPresent=0,
+    chaptersRemaining=99,
+    transcoding=False,
+    lastUpdate=None,
+    chapters=[],
+)
+
+
+def test_pipelined_keeps_order():
+    assert list(pipelined(range(10), buffer_size=2)) == list(range(10))
+
+
+def test_pipelined_bounds_the_producer():
+    produced = []
+
+    def produce():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    items = pipelined(produce(), buffer_size=2)
+    assert next(items) == 0
+    time.sleep(0.3)
+    # One item was consumed, two are waiting in the queue and one is waiting to be put into it
+    assert len(produced) <= 4
+    items.close()
+
+
+def test_pipelined_raises_producer_errors_after_previous_items():
+    def produce():
+        yield 1
+        msg = "download broke"
+        raise RuntimeError(msg)
+
+    items = pipelined(produce(), buffer_size=2)
+    assert next(items) == 1
+    with pytest.raises(RuntimeError, match="download broke"):
+        next(items)
+
+
+def test_pipelined_stops_producer_when_consumer_stops():
+    finished = threading.Event()
+
+    def produce():
+        try:
+            yield from range(100)
+        finally:
+            finished.set()
+
+    for item in pipelined(produce(), buffer_size=1):
+        if item == 3:
+            break
+
+    assert finished.wait(5)
+
+
+@pytest.fixture
+def api_mock():
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = [HOUSEHOLD]
+        api_mock.get_all_creative_tonies.return_value = [TONIE]
+        _mock.return_value = api_mock
+        yield api_mock
+
+
+def _create_podcast(count):
+    episodes = []
+    for i in range(1, count + 1):
+        test_feed_data = {
+            "title": f"Episode {i}",
+            "published": f"Mon, 0{i} Jan 2024 10:00:00 +0000",
+            "published_parsed": (2024, 1, i, 10, 0, 0, 0, 1, 0),
+            "id": f"test-guid-{i}",
+            "itunes_duration": "10:00",
+        }
+        episodes.append(Episode(podcast="Test Podcast", raw=test_feed_data, url=f"http://example.com/ep{i}.mp3"))
+
+    podcast = mock.MagicMock()
+    podcast.epList = episodes
+    podcast.title = "Test Podcast"
+    podcast.epSorting = EpisodeSorting.BY_DATE_NEWEST_FIRST
+    return podcast
+
+
+def test_upload_overlaps_with_download(api_mock, tmp_path):
+    """Test that the first episode is uploaded while the last one is still downloading."""
+    tps = ToniePodcastSync("user", "pass", download_workers=1)
+    podcast = _create_podcast(3)
+    first_upload_started = threading.Event()
+    uploaded_titles = []
+
+    def mock_get(url, **_kwargs):
+        if url.endswith("ep3.mp3"):
+            # Only returns if the upload of episode 1 starts before all downloads have finished
+            assert first_upload_started.wait(5)
+        response = mock.MagicMock()
+        response.iter_content.return_value = [b"fake audio data"]
+        return response
+
+    def mock_upload(_tonie, _path, title):
+        first_upload_started.set()
+        uploaded_titles.append(title)
+
+    tps._session.get = mock_get
+    api_mock.upload_file_to_tonie.side_effect = mock_upload
+
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.tempfile.TemporaryDirectory") as mock_tempdir:
+        mock_tempdir.return_value.__enter__.return_value = str(tmp_path)
+        tps.sync_podcast_to_tonie(podcast, "tonie-123", max_minutes=30)
+
+    assert uploaded_titles == [tps._generate_chapter_title(episode) for episode in podcast.epList]
@@ -0,0 +1,134 @@
+"""Tests for resuming interrupted episode downloads with HTTP Range requests."""
+
+from unittest import mock
+
+import pytest
+from requests.exceptions import ChunkedEncodingError
+
+from tonie_podcast_sync.podcast import Episode
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+CONTENT = b"0123456789"
+
+
+class FakeResponse:
+    """A streaming response that may break off after some bytes."""
+
+    def __init__(self, status_code, body, headers, break_after=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers
+        self.break_after = break_after
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        if self.break_after is None:
+            yield self.body
+            return
+        yield self.body[: self.break_after]
+        msg = "Connection broken"
+        raise ChunkedEncodingError(msg)
+
+
+def _full_response(accept_ranges=True, break_after=None, body=CONTENT):  # noqa: FBT002
+    headers = {"Content-Length": str(len(CONTENT))}
+    if accept_ranges:
+        headers["Accept-Ranges"] = "bytes"
+    return FakeResponse(200, body, headers, break_after)
+
+
+def _partial_response(start):
+    headers = {
+        "Content-Length": str(len(CONTENT) - start),
+        "Content-Range": f"bytes {start}-{len(CONTENT) - 1}/{len(CONTENT)}",
+        "Accept-Ranges": "bytes",
+    }
+    return FakeResponse(206, CONTENT[start:], headers)
+
+
+@pytest.fixture
+def tps(tmp_path):
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = []
+        api_mock.get_all_creative_tonies.return_value = []
+        _mock.return_value = api_mock
+        tps = ToniePodcastSync("user", "pass")
+    tps.podcast_cache_directory = tmp_path
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.time.sleep"):
+        yield tps
+
+
+def _episode():
+    test_feed_data = {
+        "title": "Test Episode",
+        "published": "Mon, 01 Jan 2024 10:00:00 +0000",
+        "published_parsed": (2024, 1, 1, 10, 0, 0, 0, 1, 0),
+        "id": "test-guid-123",
+        "itunes_duration": "10:30",
+    }
+    return Episode(podcast="Test Podcast", raw=test_feed_data, url="http://example.com/test.mp3")
+
+
+def test_interrupted_download_is_resumed(tps):
+    tps._session.get = mock.MagicMock(side_effect=[_full_response(break_after=4), _partial_response(4)])
+    episode = _episode()
+
+    assert tps._ToniePodcastSync__cache_episode(episode) is True
+
+    assert episode.fpath.read_bytes() == CONTENT
+    assert "headers" not in tps._session.get.call_args_list[0].kwargs
+    assert tps._session.get.call_args_list[1].kwargs["headers"] == {"Range": "bytes=4-"}
+
+
+def test_short_download_is_detected_and_resumed(tps):
+    short_response = _full_response(body=CONTENT[:6])
+    tps._session.get = mock.MagicMock(side_effect=[short_response, _partial_response(6)])
+    episode = _episode()
+
+    assert tps._ToniePodcastSync__cache_episode(episode) is True
+
+    assert episode.fpath.read_bytes() == CONTENT
+    assert tps._session.get.call_args_list[1].kwargs["headers"] == {"Range": "bytes=6-"}
+
+
+def test_download_restarts_without_accept_ranges(tps):
+    tps._session.get = mock.MagicMock(
+        side_effect=[_full_response(accept_ranges=False, break_after=4), _full_response(accept_ranges=False)]
+    )
+    episode = _episode()
+
+    assert tps._ToniePodcastSync__cache_episode(episode) is True
+
+    assert episode.fpath.read_bytes() == CONTENT
+    assert "headers" not in tps._session.get.call_args_list[1].kwargs
+
+
+def test_download_restarts_if_server_ignores_range(tps):
+    tps._session.get = mock.MagicMock(side_effect=[_full_response(break_after=4), _full_response()])
+    episode = _episode()
+
+    assert tps._ToniePodcastSync__cache_episode(episode) is True
+
+    assert episode.fpath.read_bytes() == CONTENT
+
+
+def test_download_restarts_if_range_is_not_satisfiable(tps):
+    not_satisfiable = FakeResponse(416, b"", {})
+    tps._session.get = mock.MagicMock(side_effect=[_full_response(break_after=4), not_satisfiable, _full_response()])
+    episode = _episode()
+
+    assert tps._ToniePodcastSync__cache_episode(episode) is True
+
+    assert episode.fpath.read_bytes() == CONTENT
+    assert "headers" not in tps._session.get.call_args_list[2].kwargs
+
+
+def test_partial_file_is_removed_after_last_attempt(tps, tmp_path):
+    tps._session.get = mock.MagicMock(return_value=_full_response(break_after=4))
+
+    assert tps._ToniePodcastSync__cache_episode(_episode()) is False
+
+    assert list((tmp_path / "Test Podcast").iterdir()) == []
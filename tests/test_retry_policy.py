@@ -0,0 +1,168 @@
+"""Tests for the retry policy of downloads and uploads."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import mock
+
+import pytest
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError, InvalidURL
+
+from tonie_podcast_sync.podcast import Episode
+from tonie_podcast_sync.retry import RetryPolicy
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+
+def _http_error(status_code, headers=None):
+    response = mock.MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return HTTPError(f"{status_code} error", response=response)
+
+
+def test_backoff_grows_exponentially_up_to_max_delay():
+    policy = RetryPolicy(base_delay=1, max_delay=5, jitter=0)
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+
+
+def test_backoff_jitter_only_shortens_the_delay():
+    policy = RetryPolicy(base_delay=4, jitter=0.5)
+    delays = [policy.backoff(1) for _ in range(100)]
+    assert all(2 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.parametrize(
+    ("error", "retryable"),
+    [
+        (_http_error(500), True),
+        (_http_error(503), True),
+        (_http_error(429), True),
+        (_http_error(408), True),
+        (_http_error(404), False),
+        (_http_error(403), False),
+        (RequestsConnectionError("connection reset"), True),
+        (HTTPError("no response"), True),
+        (InvalidURL("not a url"), False),
+    ],
+)
+def test_retryable_and_fatal_errors(error, retryable):
+    assert RetryPolicy().is_retryable(error) is retryable
+
+
+def test_configured_fatal_status_codes_are_not_retried():
+    assert not RetryPolicy(fatal_status_codes=frozenset({503})).is_retryable(_http_error(503))
+
+
+def test_attempts_stop_at_max_attempts():
+    retry = RetryPolicy(max_attempts=3, jitter=0).start()
+    assert retry.next_delay(_http_error(500)) == 3
+    assert retry.next_delay(_http_error(500)) == 6
+    assert retry.next_delay(_http_error(500)) is None
+    assert retry.attempts == 3
+
+
+def test_retry_after_seconds_is_honored():
+    retry = RetryPolicy(jitter=0).start()
+    assert retry.next_delay(_http_error(429, {"Retry-After": "42"})) == 42
+
+
+def test_retry_after_date_is_honored():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+    retry = RetryPolicy(jitter=0).start()
+    delay = retry.next_delay(_http_error(503, {"Retry-After": format_datetime(retry_at, usegmt=True)}))
+    assert 100 < delay <= 120
+
+
+def test_retry_after_is_ignored_for_other_status_codes():
+    retry = RetryPolicy(jitter=0).start()
+    assert retry.next_delay(_http_error(500, {"Retry-After": "42"})) == 3
+
+
+def test_no_retry_beyond_total_budget():
+    retry = RetryPolicy(total_budget=30, jitter=0).start()
+    assert retry.next_delay(_http_error(429, {"Retry-After": "3600"})) is None
+
+
+@pytest.fixture
+def mock_tonie_api():
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = []
+        api_mock.get_all_creative_tonies.return_value = []
+        _mock.return_value = api_mock
+        yield api_mock
+
+
+def _episode():
+    test_feed_data = {
+        "title": "Test Episode",
+        "published": "Mon, 01 Jan 2024 10:00:00 +0000",
+        "published_parsed": (2024, 1, 1, 10, 0, 0, 0, 1, 0),
+        "id": "test-guid-123",
+        "itunes_duration": "10:30",
+    }
+    return Episode(podcast="Test Podcast", raw=test_feed_data, url="http://example.com/test.mp3")
+
+
+@pytest.mark.usefixtures("mock_tonie_api")
+@mock.patch("tonie_podcast_sync.toniepodcastsync.time.sleep")
+def test_download_is_not_retried_after_fatal_error(mock_sleep, tmp_path):
+    tps = ToniePodcastSync("user", "pass")
+    tps.podcast_cache_directory = tmp_path
+    response = mock.MagicMock()
+    response.raise_for_status.side_effect = _http_error(404)
+    tps._session.get = mock.MagicMock(return_value=response)
+
+    assert tps._ToniePodcastSync__cache_episode(_episode()) is False
+    tps._session.get.assert_called_once()
+    mock_sleep.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_tonie_api")
+@mock.patch("tonie_podcast_sync.toniepodcastsync.time.sleep")
+def test_download_waits_for_retry_after(mock_sleep, tmp_path):
+    tps = ToniePodcastSync("user", "pass", retry_policy=RetryPolicy(jitter=0))
+    tps.podcast_cache_directory = tmp_path
+    rate_limited = mock.MagicMock()
+    rate_limited.raise_for_status.side_effect = _http_error(429, {"Retry-After": "17"})
+    success = mock.MagicMock()
+    success.iter_content.return_value = [b"fake audio data"]
+    tps._session.get = mock.MagicMock(side_effect=[rate_limited, success])
+
+    assert tps._ToniePodcastSync__cache_episode(_episode()) is True
+    mock_sleep.assert_called_once_with(17)
+
+
+@mock.patch("tonie_podcast_sync.toniepodcastsync.time.sleep")
+def test_upload_uses_retry_policy(mock_sleep, mock_tonie_api):
+    tonie = mock.MagicMock()
+    tonie.id = "tonie-123"
+    mock_tonie_api.get_all_creative_tonies.return_value = [tonie]
+    mock_tonie_api.upload_file_to_tonie.side_effect = [_http_error(502), _http_error(502), None]
+    tps = ToniePodcastSync("user", "pass", retry_policy=RetryPolicy(max_attempts=5, base_delay=2, jitter=0))
+    episode = _episode()
+    episode.fpath = "episode.mp3"
+
+    assert tps._upload_episode(episode, "tonie-123") is True
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [2, 4]
+
+
+def test_retry_policy_is_created_from_settings():
+    configured = {
+        "retry.max_attempts": 5,
+        "retry.base_delay_seconds": 1,
+        "retry.total_budget_seconds": 60.0,
+        "retry.fatal_status_codes": [401, 403],
+    }
+    mock_settings = mock.MagicMock()
+    mock_settings.get.side_effect = lambda key, default=None: configured.get(key, default)
+
+    with mock.patch("tonie_podcast_sync.cli.settings", mock_settings):
+        from tonie_podcast_sync.cli import _create_retry_policy  # noqa: PLC0415
+
+        policy = _create_retry_policy()
+
+    assert policy == RetryPolicy(
+        max_attempts=5, base_delay=1.0, total_budget=60.0, fatal_status_codes=frozenset({401, 403})
+    )
@@ -0,0 +1,186 @@
+"""Tests for the stage timings of a sync run."""
+
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import requests
+from tonie_api.models import Chapter, CreativeTonie, Household
+
+from tonie_podcast_sync.podcast import Episode, EpisodeSorting, Podcast
+from tonie_podcast_sync.run_report import RunReport, StageTimings
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+RES_DIR = Path(__file__).parent / "res"
+HOUSEHOLD = Household(id="household-1", name="Test House", ownerName="Test Owner", access="owner", canLeave=True)
+
+
+def _create_episode(i):
+    test_feed_data = {
+        "title": f"Episode {i}",
+        "published": f"Mon, 0{i} Jan 2024 10:00:00 +0000",
+        "published_parsed": (2024, 1, i, 10, 0, 0, 0, 1, 0),
+        "id": f"test-guid-{i}",
+        "itunes_duration": "10:00",
+    }
+    return Episode(podcast="Test Podcast", raw=test_feed_data, url=f"http://example.com/ep{i}.mp3")
+
+
+def _tonie():
+    chapter = Chapter(id="old", title="Old episode", file="file-old", seconds=600, transcoding=False)
+    return CreativeTonie(
+        id="tonie-123",
+        householdId="household-1",
+        name="Test Tonie",
+        imageUrl="http://example.com/img.png",
+        secondsRemaining=4800,
+        secondsPresent=600,
+        chaptersPresent=1,
+        chaptersRemaining=98,
+        transcoding=False,
+        lastUpdate=None,
+        chapters=[chapter],
+    )
+
+
+@pytest.fixture
+def api_mock():
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = [HOUSEHOLD]
+        api_mock.get_all_creative_tonies.return_value = [_tonie()]
+        _mock.return_value = api_mock
+        yield api_mock
+
+
+def test_stage_timings_report_throughput_and_totals():
+    timings = StageTimings()
+    timings.record("download", 2.0, episode="Episode 1", bytes=1000)
+    timings.record("download", 0.5, episode="Episode 2", bytes=None)
+    with timings.measure("upload", episode="Episode 1") as details:
+        details["uploaded"] = True
+
+    report = timings.as_dict()
+
+    assert report["stages"][0] == {
+        "stage": "download",
+        "seconds": 2.0,
+        "episode": "Episode 1",
+        "bytes": 1000,
+        "bytes_per_second": 500,
+    }
+    assert "bytes_per_second" not in report["stages"][1]
+    assert report["stages"][2]["uploaded"] is True
+    assert report["totals"]["download"] == pytest.approx(2.5)
+
+
+def test_failed_stages_are_recorded():
+    timings = StageTimings()
+
+    with pytest.raises(RuntimeError), timings.measure("wipe"):
+        raise RuntimeError
+
+    assert [timing.stage for timing in timings] == ["wipe"]
+
+
+def test_podcast_records_feed_stages():
+    podcast = Podcast(str(RES_DIR / "kakadu.xml"), episode_sorting=EpisodeSorting.BY_DATE_OLDEST_FIRST)
+
+    stages = {timing.stage: timing for timing in podcast.timings}
+
+    assert list(stages) == ["feed_fetch", "feed_parse", "filter_sort"]
+    assert stages["feed_parse"].details["entries"] == len(podcast.entries)
+    assert stages["filter_sort"].details["episodes"] == len(podcast.epList)
+
+
+def test_sync_records_all_stages_of_the_tonie(api_mock, tmp_path):  # noqa: ARG001
+    run_report = RunReport()
+    tps = ToniePodcastSync("user", "pass", run_report=run_report)
+    response = mock.MagicMock()
+    response.ok = True
+    response.headers = {}
+    response.iter_content = mock.MagicMock(return_value=[b"fake audio data"])
+    tps._session.get = mock.MagicMock(return_value=response)
+
+    podcast = mock.MagicMock()
+    podcast.epList = [_create_episode(i) for i in (2, 1)]
+    podcast.title = "Test Podcast"
+    podcast.epSorting = EpisodeSorting.BY_DATE_NEWEST_FIRST
+    podcast.timings = StageTimings()
+    podcast.timings.record("feed_fetch", 0.1, url="https://example.com/feed.xml")
+
+    tps.sync_podcast_to_tonie(podcast, "tonie-123", max_minutes=30)
+    report_file = tmp_path / "reports" / "run-report.json"
+    run_report.write(report_file)
+
+    report = json.loads(report_file.read_text(encoding="utf-8"))
+    stages = report["tonies"]["tonie-123"]["stages"]
+    names = [stage["stage"] for stage in stages]
+    assert names[:3] == ["feed_fetch", "wipe", "selection"]
+    # Uploads start while the remaining episodes are downloaded
+    assert sorted(names[3:-1]) == ["download", "download", "upload", "upload"]
+    assert names[-1] == "sync"
+    downloads = [stage for stage in stages if stage["stage"] == "download"]
+    assert {download["episode"] for download in downloads} == {"Episode 1", "Episode 2"}
+    assert all(download["source"] == "download" for download in downloads)
+    assert all(download["bytes"] == len(b"fake audio data") for download in downloads)
+
+
+def test_update_tonies_writes_the_run_report(app_settings_dir):
+    mock_settings = mock.MagicMock()
+    mock_settings.get = mock.MagicMock(side_effect=lambda _key, default=None: default)
+    mock_settings.CREATIVE_TONIES = {}
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync"),
+    ):
+        from tonie_podcast_sync.cli import update_tonies  # noqa: PLC0415
+
+        update_tonies()
+
+    report = json.loads((app_settings_dir / "run-report.json").read_text(encoding="utf-8"))
+    assert report["tonies"] == {}
+    assert report["seconds"] >= 0
+
+
+def test_wipe_updates_the_tonie_without_reloading_all_tonies(api_mock):
+    tps = ToniePodcastSync("user", "pass")
+
+    tps._wipe_tonie("tonie-123")
+
+    tonie = tps.get_tonies()[0]
+    assert tonie.chapters == []
+    assert (tonie.chaptersPresent, tonie.chaptersRemaining) == (0, 99)
+    assert (tonie.secondsPresent, tonie.secondsRemaining) == (0, 5400)
+    assert api_mock.get_all_creative_tonies.call_count == 1
+
+
+class FakeAdapter(requests.adapters.BaseAdapter):
+    def send(self, request, **_kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def test_api_calls_are_counted_per_endpoint(api_mock):
+    api_mock.session = requests.Session()
+    api_mock.session.mount("https://", FakeAdapter())
+    run_report = RunReport()
+    tps = ToniePodcastSync("user", "pass", run_report=run_report)
+
+    for household_id in ("a1b2-c3d4", "e5f6-a7b8"):
+        tps._api.session.get(f"https://api.tonie.cloud/v2/households/{household_id}/creativetonies")
+    tps._api.session.patch("https://api.tonie.cloud/v2/households/a1b2-c3d4/creativetonies/1A2B3C4D")
+
+    assert run_report.api_calls() == {
+        "GET /v2/households/{id}/creativetonies": 2,
+        "PATCH /v2/households/{id}/creativetonies/{id}": 1,
+    }
+    assert run_report.as_dict()["api_calls"] == run_report.api_calls()
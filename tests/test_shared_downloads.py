@@ -0,0 +1,142 @@
+"""Tests for sharing episode downloads between tonies synced at the same time."""
+
+import shutil
+import threading
+from unittest import mock
+
+import pytest
+
+from tonie_podcast_sync.podcast import Episode
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+
+@pytest.fixture
+def tps():
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = []
+        api_mock.get_all_creative_tonies.return_value = []
+        _mock.return_value = api_mock
+        yield ToniePodcastSync("user", "pass")
+
+
+def _create_episode(volume_adjustment=0):
+    test_feed_data = {
+        "title": "Episode 1",
+        "published": "Mon, 01 Jan 2024 10:00:00 +0000",
+        "published_parsed": (2024, 1, 1, 10, 0, 0, 0, 1, 0),
+        "id": "test-guid-1",
+        "itunes_duration": "10:00",
+    }
+    return Episode(
+        podcast="Test Podcast",
+        raw=test_feed_data,
+        url="http://example.com/ep1.mp3",
+        volume_adjustment=volume_adjustment,
+    )
+
+
+def _response():
+    response = mock.MagicMock()
+    response.ok = True
+    response.headers = {}
+    response.iter_content = mock.MagicMock(return_value=[b"fake audio data"])
+    return response
+
+
+def _cache_episode_in_thread(tps, episode, cache_directory, results):
+    def run():
+        tps.podcast_cache_directory = cache_directory
+        results.append(tps._ToniePodcastSync__cache_episode(episode))
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_concurrent_syncs_download_an_episode_once(tps, tmp_path):
+    waiting = threading.Event()
+    reuse_shared_download = ToniePodcastSync._reuse_shared_download
+
+    def wait_for_second_sync(*_args, **_kwargs):
+        # Keep the first download running until the second sync waits for it
+        assert waiting.wait(timeout=5)
+        return _response()
+
+    def reuse(self, *args):
+        waiting.set()
+        return reuse_shared_download(self, *args)
+
+    tps._session.get = mock.MagicMock(side_effect=wait_for_second_sync)
+    episodes = [_create_episode(), _create_episode()]
+    results = []
+
+    with mock.patch.object(ToniePodcastSync, "_reuse_shared_download", autospec=True, side_effect=reuse):
+        first = _cache_episode_in_thread(tps, episodes[0], tmp_path / "tonie-1", results)
+        second = _cache_episode_in_thread(tps, episodes[1], tmp_path / "tonie-2", results)
+        first.join(timeout=5)
+        second.join(timeout=5)
+
+    assert results == [True, True]
+    assert tps._session.get.call_count == 1
+    assert episodes[0].fpath != episodes[1].fpath
+    assert episodes[1].fpath.read_bytes() == b"fake audio data"
+
+
+def test_failed_download_is_retried_by_waiting_sync(tps, tmp_path):
+    tps._session.get = mock.MagicMock(return_value=_response())
+    shared = tps._shared_downloads
+
+    with mock.patch.object(ToniePodcastSync, "_download_episode", return_value=False):
+        tps.podcast_cache_directory = tmp_path / "tonie-1"
+        assert not tps._ToniePodcastSync__cache_episode(_create_episode())
+    assert len(shared) == 1
+
+    tps.podcast_cache_directory = tmp_path / "tonie-2"
+    episode = _create_episode()
+    assert tps._ToniePodcastSync__cache_episode(episode)
+    assert episode.fpath.read_bytes() == b"fake audio data"
+
+
+def test_finished_download_is_reused_while_its_file_exists(tps, tmp_path):
+    tps._session.get = mock.MagicMock(return_value=_response())
+
+    tps.podcast_cache_directory = tmp_path / "tonie-1"
+    assert tps._ToniePodcastSync__cache_episode(_create_episode())
+    tps.podcast_cache_directory = tmp_path / "tonie-2"
+    assert tps._ToniePodcastSync__cache_episode(_create_episode())
+    assert tps._session.get.call_count == 1
+
+    # The temporary directories of both syncs are removed once they are done
+    shutil.rmtree(tmp_path / "tonie-1")
+    shutil.rmtree(tmp_path / "tonie-2")
+    tps.podcast_cache_directory = tmp_path / "tonie-3"
+    assert tps._ToniePodcastSync__cache_episode(_create_episode())
+    assert tps._session.get.call_count == 2
+
+
+def test_differently_processed_episodes_are_not_shared(tps, tmp_path):
+    tps._session.get = mock.MagicMock(return_value=_response())
+
+    with mock.patch.object(ToniePodcastSync, "_is_ffmpeg_available", return_value=False):
+        tps.podcast_cache_directory = tmp_path / "tonie-1"
+        assert tps._ToniePodcastSync__cache_episode(_create_episode())
+        tps.podcast_cache_directory = tmp_path / "tonie-2"
+        assert tps._ToniePodcastSync__cache_episode(_create_episode(volume_adjustment=3))
+
+    assert tps._session.get.call_count == 2
+
+
+def test_downloads_are_forgotten_once_the_sync_is_done(tps, tmp_path):
+    tps._session.get = mock.MagicMock(return_value=_response())
+
+    with mock.patch.object(ToniePodcastSync, "_is_ffmpeg_available", return_value=False):
+        tps.podcast_cache_directory = tmp_path / "tonie-1"
+        assert tps._ToniePodcastSync__cache_episode(_create_episode())
+        with tps._sync_cache_directory() as cache_directory:
+            tps.podcast_cache_directory = cache_directory
+            assert tps._ToniePodcastSync__cache_episode(_create_episode(volume_adjustment=3))
+            assert len(tps._shared_downloads) == 2
+
+    # Only the download of the sync that is still running can be shared
+    assert [shared.cache_directory for shared in tps._shared_downloads.values()] == [tmp_path / "tonie-1"]
@@ -0,0 +1,41 @@
+"""Tests for the startup time of the command line interface, measured with python -X importtime."""
+
+import subprocess
+import sys
+
+# The import of the CLI took about 600 ms before the sync modules were imported lazily, and about 170 ms after
+STARTUP_BUDGET_MS = 400
+STARTUP_RUNS = 3
+# Modules only the commands that sync or list tonies need
+DEFERRED_MODULES = ("requests", "tonie_api", "feedparser", "tonie_podcast_sync.toniepodcastsync")
+
+
+def _import_times(module):
+    """Import a module in a fresh interpreter and return the cumulative import time in µs of each module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _self_time, cumulative, name = line.removeprefix("import time:").split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_sync_modules_are_imported_when_needed():
+    times = _import_times("tonie_podcast_sync.cli")
+
+    assert "tonie_podcast_sync.cli" in times
+    assert not [name for name in DEFERRED_MODULES if name in times]
+
+
+def test_cli_import_stays_within_budget():
+    # The fastest of several runs is the least disturbed by other processes
+    fastest_us = min(_import_times("tonie_podcast_sync.cli")["tonie_podcast_sync.cli"] for _ in range(STARTUP_RUNS))
+
+    assert fastest_us / 1000 < STARTUP_BUDGET_MS
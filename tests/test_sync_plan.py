@@ -0,0 +1,218 @@
+"""Tests for planning a sync without downloading or uploading anything."""
+
+from unittest import mock
+
+import pytest
+import requests
+from rich.console import Console
+from tonie_api.models import Chapter, CreativeTonie, Household
+
+from tonie_podcast_sync.episode_cache import EpisodeCache
+from tonie_podcast_sync.plan import PlannedUpload, SyncPlan
+from tonie_podcast_sync.podcast import Episode, EpisodeSorting
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+HOUSEHOLD = Household(id="household-1", name="Test House", ownerName="Test Owner", access="owner", canLeave=True)
+
+
+def _create_episode(i, length=None):
+    link = {"rel": "enclosure", "href": f"http://example.com/ep{i}.mp3"}
+    if length is not None:
+        link["length"] = str(length)
+    test_feed_data = {
+        "title": f"Episode {i}",
+        "published": f"Mon, 0{i} Jan 2024 10:00:00 +0000",
+        "published_parsed": (2024, 1, i, 10, 0, 0, 0, 1, 0),
+        "id": f"test-guid-{i}",
+        "itunes_duration": "10:00",
+        "links": [link],
+    }
+    return Episode(podcast="Test Podcast", raw=test_feed_data, url=f"http://example.com/ep{i}.mp3")
+
+
+def _chapter(episode_number, chapter_id):
+    return Chapter(
+        id=chapter_id,
+        title=f"episode {episode_number} (Mon, 0{episode_number} Jan 2024 10:00:00 +0000)",
+        file=f"file-{chapter_id}",
+        seconds=600,
+        transcoding=False,
+    )
+
+
+def _tonie(chapters):
+    return CreativeTonie(
+        id="tonie-123",
+        householdId="household-1",
+        name="Test Tonie",
+        imageUrl="http://example.com/img.png",
+        secondsRemaining=5400 - 600 * len(chapters),
+        secondsPresent=600 * len(chapters),
+        chaptersPresent=len(chapters),
+        chaptersRemaining=99 - len(chapters),
+        transcoding=False,
+        lastUpdate=None,
+        chapters=chapters,
+    )
+
+
+def _podcast(episodes):
+    podcast = mock.MagicMock()
+    podcast.epList = episodes
+    podcast.title = "Test Podcast"
+    podcast.epSorting = EpisodeSorting.BY_DATE_NEWEST_FIRST
+    return podcast
+
+
+@pytest.fixture
+def api_mock():
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = [HOUSEHOLD]
+        # The tonie holds episodes 3, 1 (outdated) and 2
+        api_mock.get_all_creative_tonies.return_value = [
+            _tonie([_chapter(3, "chap-3"), _chapter(1, "chap-1"), _chapter(2, "chap-2")])
+        ]
+        _mock.return_value = api_mock
+        yield api_mock
+
+
+@pytest.fixture
+def tps(api_mock):  # noqa: ARG001
+    tps = ToniePodcastSync("user", "pass")
+    tps._session = mock.MagicMock()
+    return tps
+
+
+def _assert_nothing_transferred(api_mock, tps):
+    tps._session.get.assert_not_called()
+    api_mock.upload_file_to_tonie.assert_not_called()
+    api_mock.clear_all_chapter_of_tonie.assert_not_called()
+    api_mock.sort_chapter_of_tonie.assert_not_called()
+
+
+def test_plan_with_wipe_lists_all_selected_episodes(api_mock, tps):
+    podcast = _podcast([_create_episode(i, length=1_000_000 * i) for i in (4, 3, 2, 1)])
+
+    plan = tps.plan_podcast_sync(podcast, "tonie-123", max_minutes=30)
+
+    assert plan.skip_reason is None
+    assert plan.wipe
+    assert [upload.episode.title for upload in plan.uploads] == ["Episode 4", "Episode 3", "Episode 2"]
+    assert plan.upload_bytes == 9_000_000
+    tps._session.head.assert_not_called()
+    _assert_nothing_transferred(api_mock, tps)
+
+
+def test_incremental_plan_only_lists_missing_episodes(api_mock, tps):
+    podcast = _podcast([_create_episode(i, length=1000) for i in (4, 3, 2, 1)])
+
+    plan = tps.plan_podcast_sync(podcast, "tonie-123", max_minutes=30, incremental=True)
+
+    assert not plan.wipe
+    assert plan.deleted_chapters == 1
+    assert [upload.episode.title for upload in plan.uploads] == ["Episode 4"]
+    _assert_nothing_transferred(api_mock, tps)
+
+
+def test_size_is_requested_if_the_feed_does_not_announce_it(tps):
+    head_responses = {
+        "http://example.com/ep4.mp3": mock.MagicMock(headers={"Content-Length": "2048"}),
+        "http://example.com/ep3.mp3": mock.MagicMock(headers={}),
+    }
+
+    def head(url, **_kwargs):
+        if url not in head_responses:
+            raise requests.ConnectionError
+        return head_responses[url]
+
+    tps._session.head.side_effect = head
+    podcast = _podcast([_create_episode(i) for i in (4, 3, 2, 1)])
+
+    plan = tps.plan_podcast_sync(podcast, "tonie-123", max_minutes=30)
+
+    assert [upload.size_bytes for upload in plan.uploads] == [2048, None, None]
+    assert plan.unknown_sizes == 2
+
+
+def test_cached_episodes_are_not_downloaded(api_mock, tmp_path):  # noqa: ARG001
+    cache = EpisodeCache(tmp_path / "episode-cache", max_bytes=1024 * 1024)
+    source = tmp_path / "episode.mp3"
+    source.write_bytes(b"fake audio data")
+    cache.store(_create_episode(4), source)
+    tps = ToniePodcastSync("user", "pass", episode_cache=cache)
+    podcast = _podcast([_create_episode(i, length=1000) for i in (4, 3, 2, 1)])
+
+    plan = tps.plan_podcast_sync(podcast, "tonie-123", max_minutes=30)
+
+    assert [upload.cached for upload in plan.uploads] == [True, False, False]
+    assert plan.upload_bytes == 3000
+    assert plan.download_bytes == 2000
+
+
+@pytest.mark.parametrize(
+    ("tonie_id", "episodes", "max_minutes", "skip_reason"),
+    [
+        ("unknown-tonie", (4, 3), 30, "tonie not found"),
+        ("tonie-123", (3, 1, 2), 30, "no new episodes"),
+        ("tonie-123", (4, 3), 5, "no episodes fit"),
+    ],
+)
+def test_skipped_syncs_have_a_reason(tps, tonie_id, episodes, max_minutes, skip_reason):
+    podcast = _podcast([_create_episode(i) for i in episodes])
+
+    plan = tps.plan_podcast_sync(podcast, tonie_id, max_minutes=max_minutes)
+
+    assert plan.skip_reason == skip_reason
+    assert not plan.uploads
+
+
+def test_estimate_is_limited_by_the_slower_transfer():
+    plan = SyncPlan(
+        tonie_id="tonie-123",
+        podcast_title="Test Podcast",
+        uploads=[
+            PlannedUpload(_create_episode(1), 10_000_000),
+            PlannedUpload(_create_episode(2), 10_000_000, cached=True),
+            PlannedUpload(_create_episode(3), None),
+        ],
+    )
+
+    # 20 MB at 8 Mbit/s upload take 20 seconds, 10 MB at 80 Mbit/s download take 1 second
+    assert plan.estimated_seconds(download_mbit=80, upload_mbit=8) == pytest.approx(20)
+    assert plan.estimated_seconds(download_mbit=1, upload_mbit=80) == pytest.approx(80)
+
+
+def test_plan_command_prints_plans_without_syncing(capsys):
+    tonie_config = mock.MagicMock()
+    tonie_config.maximum_length = 30
+    tonie_config.get = mock.MagicMock(side_effect=lambda key, default=None: {"name": "Green Tonie"}.get(key, default))
+    mock_settings = mock.MagicMock()
+    mock_settings.get = mock.MagicMock(side_effect=lambda _key, default=None: default)
+    mock_settings.CREATIVE_TONIES = {"tonie-123": tonie_config}
+    sync_plan = SyncPlan(
+        tonie_id="tonie-123",
+        podcast_title="Test Podcast",
+        wipe=True,
+        uploads=[PlannedUpload(_create_episode(4), 12_500_000), PlannedUpload(_create_episode(3), None)],
+    )
+
+    with (
+        mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync") as mock_tps_class,
+        mock.patch("tonie_podcast_sync.podcast.Podcast"),
+        mock.patch("tonie_podcast_sync.cli._console", Console(width=200)),
+    ):
+        mock_tps_class.return_value.plan_podcast_sync.return_value = sync_plan
+        from tonie_podcast_sync.cli import plan  # noqa: PLC0415
+
+        plan()
+
+    mock_tps_class.return_value.sync_podcast_to_tonie.assert_not_called()
+    kwargs = mock_tps_class.return_value.plan_podcast_sync.call_args.kwargs
+    assert kwargs == {"wipe": True, "episode_selection": "greedy", "incremental": False}
+    output = capsys.readouterr().out
+    assert "wipe, upload 2 episode(s)" in output
+    assert "unknown" in output
+    # 12.5 MB at the default upload bandwidth of 10 Mbit/s take 10 seconds
+    assert "0:00:10" in output
@@ -0,0 +1,100 @@
+"""Tests for the matcher of excluded titles and pinned episodes."""
+
+import random
+import string
+import time
+from pathlib import Path
+
+import pytest
+
+from tonie_podcast_sync.podcast import Podcast, TitleMatcher, normalize_unicode_caseless
+
+
+def _naive_matches(strings, title):
+    return any(s in title for s in strings)
+
+
+@pytest.mark.parametrize(
+    ("strings", "title", "expected"),
+    [
+        (["trailer"], "der trailer zur folge", True),
+        (["trailer"], "die folge", False),
+        (["ab", "abc"], "xxabxx", True),
+        (["abc", "abd"], "xxabxx", False),
+        (["abc", "abd"], "xxabdx", True),
+        (["a.c"], "abc", False),
+        (["a.c", "(x)"], "a.c und (x)", True),
+        ([""], "any title", True),
+        ([], "any title", False),
+    ],
+)
+def test_matches_like_substring_search(strings, title, expected):
+    assert TitleMatcher(strings).matches(title) is expected
+    assert _naive_matches(strings, title) is expected
+
+
+def test_empty_matcher_is_falsy():
+    assert not TitleMatcher([])
+    assert TitleMatcher(["x"])
+
+
+def test_matches_normalized_umlauts():
+    matcher = TitleMatcher([normalize_unicode_caseless("Vögel")])
+
+    assert matcher.matches(normalize_unicode_caseless("Warum singen VÖGEL?"))
+    assert not matcher.matches(normalize_unicode_caseless("Warum singen Vogel?"))
+
+
+def test_podcast_pins_with_matcher():
+    feed = str(Path(__file__).parent / "res" / "kakadu.xml")
+    podcast = Podcast(feed, pinned_episode_names=["VÖGEL", "update:"])
+
+    pinned = [episode for episode in podcast.epList if episode.pinned]
+    assert pinned
+    for episode in podcast.epList:
+        title = episode.title.lower()
+        assert episode.pinned is ("vögel" in title or "update:" in title)
+
+
+def _random_texts(rng, count, min_length, max_length):
+    # Mixed case, precomposed and decomposed umlauts and ß, which casefolds to ss
+    alphabet = [*string.ascii_letters, " ", "ä", "Ö", "ü", "a\u0308", "U\u0308", "ß", "SS"]
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(min_length, max_length))) for _ in range(count)]
+
+
+def test_matches_like_substring_search_on_generated_titles():
+    rng = random.Random(42)
+    strings = [normalize_unicode_caseless(text) for text in _random_texts(rng, 300, 2, 5)]
+    raw_titles = _random_texts(rng, 500, 10, 60)
+    # Make sure some titles match, with another case or umlaut representation than the string
+    raw_titles[::10] = [f"{title[:5]}{title.swapcase()[-4:]}{title[5:]}" for title in raw_titles[::10]]
+    titles = [normalize_unicode_caseless(title) for title in raw_titles]
+
+    matcher = TitleMatcher(strings)
+
+    actual = [matcher.matches(title) for title in titles]
+    assert actual == [_naive_matches(strings, title) for title in titles]
+    assert any(actual)
+    assert not all(actual)
+
+
+@pytest.mark.benchmark
+def test_large_pattern_lists_are_faster_than_scanning_each_string():
+    rng = random.Random(42)
+    strings = [normalize_unicode_caseless(text) for text in _random_texts(rng, 2000, 4, 12)]
+    titles = [normalize_unicode_caseless(text) for text in _random_texts(rng, 500, 60, 60)]
+    # Make sure some titles match
+    titles[::50] = [f"{title[:20]}{strings[i]}{title[20:]}" for i, title in enumerate(titles[::50])]
+
+    start = time.perf_counter()
+    expected = [_naive_matches(strings, title) for title in titles]
+    naive_seconds = time.perf_counter() - start
+
+    # The matcher is compiled once per podcast, only matching is repeated for every episode
+    matcher = TitleMatcher(strings)
+    start = time.perf_counter()
+    actual = [matcher.matches(title) for title in titles]
+    matcher_seconds = time.perf_counter() - start
+
+    assert actual == expected
+    assert matcher_seconds < naive_seconds
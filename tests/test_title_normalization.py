@@ -0,0 +1,119 @@
+"""Tests for the memoized normalization of episode and chapter titles."""
+
+from unittest import mock
+
+import pytest
+from tonie_api.models import Chapter, CreativeTonie, Household
+
+from tonie_podcast_sync.podcast import Episode, EpisodeSorting, normalize_unicode_caseless
+from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
+
+HOUSEHOLD = Household(id="household-1", name="Test House", ownerName="Test Owner", access="owner", canLeave=True)
+
+
+def _create_episode(i, title=None):
+    test_feed_data = {
+        "title": title or f"Episode {i}",
+        "published": f"Mon, 0{i} Jan 2024 10:00:00 +0000",
+        "published_parsed": (2024, 1, i, 10, 0, 0, 0, 1, 0),
+        "id": f"test-guid-{i}",
+        "itunes_duration": "10:00",
+    }
+    return Episode(podcast="Test Podcast", raw=test_feed_data, url=f"http://example.com/ep{i}.mp3")
+
+
+def _tonie(titles):
+    return CreativeTonie(
+        id="tonie-123",
+        householdId="household-1",
+        name="Test Tonie",
+        imageUrl="http://example.com/img.png",
+        secondsRemaining=5400 - 600 * len(titles),
+        secondsPresent=600 * len(titles),
+        chaptersPresent=len(titles),
+        chaptersRemaining=99 - len(titles),
+        transcoding=False,
+        lastUpdate=None,
+        chapters=[
+            Chapter(id=f"chap-{i}", title=title, file=f"file-{i}", seconds=600, transcoding=False)
+            for i, title in enumerate(titles)
+        ],
+    )
+
+
+@pytest.fixture
+def tps():
+    with mock.patch("tonie_podcast_sync.toniepodcastsync.TonieAPI") as _mock:
+        api_mock = mock.MagicMock()
+        api_mock.get_households.return_value = [HOUSEHOLD]
+        api_mock.get_all_creative_tonies.return_value = [
+            _tonie(["ÜBER Episode (Mon, 02 Jan 2024 10:00:00 +0000)", "Episode 1 (Mon, 01 Jan 2024 10:00:00 +0000)"])
+        ]
+        _mock.return_value = api_mock
+        yield ToniePodcastSync("user", "pass")
+
+
+def _podcast(episodes):
+    podcast = mock.MagicMock()
+    podcast.title = "Test Podcast"
+    podcast.epSorting = EpisodeSorting.BY_DATE_NEWEST_FIRST
+    podcast.epList = episodes
+    return podcast
+
+
+def test_normalization_is_memoized():
+    normalize_unicode_caseless.cache_clear()
+    assert normalize_unicode_caseless("Straße") == normalize_unicode_caseless("STRASSE")
+    normalize_unicode_caseless("Straße")
+
+    info = normalize_unicode_caseless.cache_info()
+    assert info.misses == 2
+    assert info.hits == 1
+    assert info.maxsize is not None
+
+
+def test_episode_title_is_normalized_once():
+    episode = _create_episode(1, title="Café Crème")
+
+    assert episode.normalized_title == normalize_unicode_caseless("Café Crème")
+
+
+def test_episode_equality_ignores_normalized_title():
+    episode = _create_episode(1)
+    other = _create_episode(1)
+    other.normalized_title = "something else"
+
+    assert episode == other
+
+
+def test_unchanged_tonie_is_detected_caseless(tps):
+    podcast = _podcast([_create_episode(2, title="über episode"), _create_episode(1)])
+
+    assert not tps._should_update_tonie(podcast, "tonie-123")
+
+
+def test_new_episode_triggers_update(tps):
+    podcast = _podcast([_create_episode(3), _create_episode(2, title="über episode")])
+
+    assert tps._should_update_tonie(podcast, "tonie-123")
+
+
+def test_feed_shorter_than_tonie_triggers_update(tps):
+    podcast = _podcast([_create_episode(2, title="über episode")])
+
+    assert tps._should_update_tonie(podcast, "tonie-123")
+
+
+def test_chapter_titles_are_normalized_once_per_tonie_state(tps):
+    first = tps._normalized_chapter_titles("tonie-123")
+    assert first == [
+        normalize_unicode_caseless("ÜBER Episode (Mon, 02 Jan 2024 10:00:00 +0000)"),
+        normalize_unicode_caseless("Episode 1 (Mon, 01 Jan 2024 10:00:00 +0000)"),
+    ]
+    assert tps._normalized_chapter_titles("tonie-123") is first
+
+    tps._tonies["tonie-123"] = _tonie(["Episode 3 (Mon, 03 Jan 2024 10:00:00 +0000)"])
+
+    assert tps._normalized_chapter_titles("tonie-123") == [
+        normalize_unicode_caseless("Episode 3 (Mon, 03 Jan 2024 10:00:00 +0000)")
+    ]
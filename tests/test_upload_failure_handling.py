@@ -6,7 +6,7 @@ import pytest
 from requests.exceptions import HTTPError
 from tonie_api.models import CreativeTonie, Household
 
-from tonie_podcast_sync.constants import UPLOAD_RETRY_COUNT
+from tonie_podcast_sync.constants import RETRY_MAX_ATTEMPTS
 from tonie_podcast_sync.podcast import Episode, EpisodeSorting
 from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
 
@@ -209,7 +209,7 @@ def test_all_uploads_succeed(mock_tonie_api_with_tonie, temp_podcast_with_episod
 
 def test_upload_respects_retry_count(mock_tonie_api_with_tonie, temp_podcast_with_episodes):
     """
-    Test that upload retries are limited to UPLOAD_RETRY_COUNT.
+    Test that upload retries are limited to RETRY_MAX_ATTEMPTS.
     """
     cache_dir, episodes = temp_podcast_with_episodes
 
@@ -243,5 +243,5 @@ def test_upload_respects_retry_count(mock_tonie_api_with_tonie, temp_podcast_wit
     with mock.patch("tonie_podcast_sync.toniepodcastsync.time.sleep"):
         tps.sync_podcast_to_tonie(podcast, "tonie-123", max_minutes=90)
 
-    # Should have attempted UPLOAD_RETRY_COUNT times
-    assert attempt_count == UPLOAD_RETRY_COUNT, f"Expected {UPLOAD_RETRY_COUNT} upload attempts, got {attempt_count}"
+    # Should have attempted RETRY_MAX_ATTEMPTS times
+    assert attempt_count == RETRY_MAX_ATTEMPTS, f"Expected {RETRY_MAX_ATTEMPTS} upload attempts, got {attempt_count}"
@@ -40,8 +40,8 @@ def test_wipe_parameter_defaults_to_true_when_omitted():
     # Mock the dependencies
     with (
         mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
-        mock.patch("tonie_podcast_sync.cli.ToniePodcastSync") as mock_tps_class,
-        mock.patch("tonie_podcast_sync.cli.Podcast") as mock_podcast_class,
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync") as mock_tps_class,
+        mock.patch("tonie_podcast_sync.podcast.Podcast") as mock_podcast_class,
     ):
         # Mock ToniePodcastSync instance
         mock_tps_instance = mock.MagicMock()
@@ -102,8 +102,8 @@ def test_wipe_parameter_respects_false_value():
     # Mock the dependencies
     with (
         mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
-        mock.patch("tonie_podcast_sync.cli.ToniePodcastSync") as mock_tps_class,
-        mock.patch("tonie_podcast_sync.cli.Podcast") as mock_podcast_class,
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync") as mock_tps_class,
+        mock.patch("tonie_podcast_sync.podcast.Podcast") as mock_podcast_class,
     ):
         # Mock ToniePodcastSync instance
         mock_tps_instance = mock.MagicMock()
@@ -164,8 +164,8 @@ def test_wipe_parameter_respects_true_value():
     # Mock the dependencies
     with (
         mock.patch("tonie_podcast_sync.cli.settings", mock_settings),
-        mock.patch("tonie_podcast_sync.cli.ToniePodcastSync") as mock_tps_class,
-        mock.patch("tonie_podcast_sync.cli.Podcast") as mock_podcast_class,
+        mock.patch("tonie_podcast_sync.toniepodcastsync.ToniePodcastSync") as mock_tps_class,
+        mock.patch("tonie_podcast_sync.podcast.Podcast") as mock_podcast_class,
     ):
         # Mock ToniePodcastSync instance
         mock_tps_instance = mock.MagicMock()
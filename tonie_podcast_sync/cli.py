@@ -1,46 +1,499 @@
 """The command line interface module for the tonie-podcast-sync."""
 
-import warnings
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
 
 import tomli_w
 from dynaconf.vendor.box.exceptions import BoxError
 from rich.console import Console
 from rich.prompt import Confirm, IntPrompt, Prompt
-from tonie_api.models import CreativeTonie
-from typer import Typer
+from typer import Exit, Typer
 
 from tonie_podcast_sync.config import APP_SETTINGS_DIR, settings
-from tonie_podcast_sync.constants import MAXIMUM_TONIE_MINUTES
-from tonie_podcast_sync.podcast import EpisodeSorting, Podcast
-from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
-
-warnings.filterwarnings("ignore", category=SyntaxWarning, module="pydub")
+from tonie_podcast_sync.constants import (
+    DEFAULT_DAEMON_MAX_POLL_MINUTES,
+    DEFAULT_DAEMON_MIN_POLL_MINUTES,
+    DEFAULT_DOWNLOAD_MBIT,
+    DEFAULT_DOWNLOAD_WORKERS,
+    DEFAULT_EPISODE_CACHE_MAX_MB,
+    DEFAULT_FEED_WORKERS,
+    DEFAULT_SYNC_WORKERS,
+    DEFAULT_UPLOAD_MBIT,
+    DEFAULT_UPLOAD_WORKERS,
+    MAXIMUM_TONIE_MINUTES,
+)
+
+# The sync modules pull in requests, tonie_api and feedparser, so the commands import them when they
+# run instead of slowing down every start, e.g. of --help. See tests/test_startup_time.py.
+if TYPE_CHECKING:
+    from tonie_api.models import CreativeTonie
+
+    from tonie_podcast_sync.episode_cache import EpisodeCache
+    from tonie_podcast_sync.feed_cache import FeedCache
+    from tonie_podcast_sync.plan import SyncPlan
+    from tonie_podcast_sync.podcast import ParsedFeed, Podcast
+    from tonie_podcast_sync.retry import RetryPolicy
+    from tonie_podcast_sync.run_report import RunReport
+    from tonie_podcast_sync.scheduler import FeedScheduler
+    from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync
 
 app = Typer(pretty_exceptions_show_locals=False)
 _console = Console()
 
+T = TypeVar("T")
+
 
 @app.command()
 def update_tonies() -> None:
-    """Update the tonies by using the settings file."""
+    """Update the tonies by using the settings file.
+
+    Raises:
+        Exit: With exit code 1 if the sync of a tonie failed while syncing several tonies at a time
+    """
+    from tonie_podcast_sync.run_report import RunReport  # noqa: PLC0415
+
+    run_report = RunReport()
+    tps = _create_tonie_podcast_sync(run_report)
+    if not tps:
+        return
+
+    tonie_configs = dict(settings.CREATIVE_TONIES.items())
+    podcasts = _prefetch_podcasts(tonie_configs, _create_feed_cache())
+    sync_workers = _get_setting("sync_workers", DEFAULT_SYNC_WORKERS)
+    failed_tonies = []
+    try:
+        if sync_workers > 1:
+            failed_tonies = _sync_tonies_concurrently(tps, sync_workers, podcasts)
+        else:
+            for tonie_id, tonie_config in settings.CREATIVE_TONIES.items():
+                _sync_tonie(tps, tonie_id, tonie_config, podcasts[tonie_id])
+    finally:
+        _report_failed_feeds(run_report, tonie_configs, podcasts)
+        _write_run_report(run_report)
+    if failed_tonies:
+        _console.print(f"Sync failed for tonies: {', '.join(failed_tonies)}", style="red")
+        raise Exit(1)
+
+
+def _report_failed_feeds(run_report: RunReport, tonie_configs: dict, podcasts: dict[str, Future[Podcast]]) -> None:
+    """Add the feeds that could not be fetched to the run report.
+
+    The stage timings of a podcast are lost if it fails, so the duration of the failed fetch is unknown.
+
+    Args:
+        run_report: The report of the run
+        tonie_configs: The configuration dictionary of each tonie by tonie ID
+        podcasts: The prefetched podcast of each tonie by tonie ID
+    """
+    for tonie_id, podcast in podcasts.items():
+        if podcast.done() and podcast.exception() is not None:
+            run_report.tonie(tonie_id).record(
+                "feed_fetch", 0.0, url=tonie_configs[tonie_id].podcast, error=str(podcast.exception())
+            )
+
+
+def _write_run_report(run_report: RunReport) -> None:
+    """Write the stage timings of the run to the configured report and metrics files.
+
+    This runs after failed syncs as well, so it reports its own errors instead of raising them and
+    hiding the error of the sync.
+
+    Args:
+        run_report: The report of the finished run
+    """
+    from tonie_podcast_sync.metrics import write_metrics_file  # noqa: PLC0415
+
+    report_file = _get_setting("run_report_file", str(APP_SETTINGS_DIR / "run-report.json"))
+    metrics_file = _get_setting("metrics_file", "")
+    try:
+        if report_file:
+            run_report.write(Path(report_file).expanduser())
+        if metrics_file:
+            write_metrics_file(run_report, Path(metrics_file).expanduser())
+    except Exception as e:  # noqa: BLE001
+        _console.print(f"Unable to write the run report: {e}", style="red")
+
+
+def _prefetch_podcasts(tonie_configs: dict, feed_cache: FeedCache | None) -> dict[str, Future[Podcast]]:
+    """Fetch the feeds of all tonies concurrently before any sync starts.
+
+    Each distinct feed URL is fetched and parsed once. Tonies sharing a feed URL get their own
+    podcast with their own settings, built from the feed fetched for the first of them.
+    A failing fetch is raised again when the podcast of a tonie is requested.
+
+    Args:
+        tonie_configs: The configuration dictionaries of the tonies by tonie ID
+        feed_cache: The cache for conditional feed requests
+
+    Returns:
+        The podcast of each tonie by tonie ID, once all feeds have been fetched
+    """
+    podcasts: dict[str, Future[Podcast]] = {}
+    first_podcasts: dict[str, Future[Podcast]] = {}
+    feed_workers = _get_setting("feed_workers", DEFAULT_FEED_WORKERS)
+    with ThreadPoolExecutor(max_workers=max(1, feed_workers), thread_name_prefix="feed-fetch") as executor:
+        for tonie_id, tonie_config in tonie_configs.items():
+            first_podcast = first_podcasts.get(tonie_config.podcast)
+            if first_podcast is None:
+                podcasts[tonie_id] = first_podcasts[tonie_config.podcast] = executor.submit(
+                    _create_podcast_from_config, tonie_config, feed_cache
+                )
+            else:
+                # The first podcast of the URL was submitted earlier, so waiting for it cannot deadlock
+                podcasts[tonie_id] = executor.submit(_create_podcast_sharing_feed, tonie_config, first_podcast)
+    return podcasts
+
+
+def _create_podcast_sharing_feed(config: dict, first_podcast: Future[Podcast]) -> Podcast:
+    """Create the podcast of a tonie from the feed already fetched for another tonie.
+
+    Args:
+        config: The configuration dictionary for a Tonie
+        first_podcast: The podcast of the same feed URL that fetched the feed
+
+    Returns:
+        Configured Podcast instance
+    """
+    return _create_podcast_from_config(config, parsed_feed=first_podcast.result().parsed_feed)
+
+
+def _sync_tonie(tps: ToniePodcastSync, tonie_id: str, tonie_config: dict, podcast: Future[Podcast]) -> None:
+    """Sync the configured podcast to a single tonie.
+
+    Args:
+        tps: The ToniePodcastSync instance to use
+        tonie_id: The ID of the tonie to sync
+        tonie_config: The configuration dictionary for the tonie
+        podcast: The prefetched podcast of the tonie
+    """
+    tps.sync_podcast_to_tonie(
+        podcast.result(), tonie_id, tonie_config.maximum_length, **_get_sync_options(tonie_config)
+    )
+
+
+def _get_sync_options(tonie_config: dict) -> dict:
+    """Read the options of a sync from the configuration of a tonie.
+
+    Args:
+        tonie_config: The configuration dictionary for the tonie
+
+    Returns:
+        The keyword arguments for sync_podcast_to_tonie
+    """
+    from tonie_podcast_sync.podcast import EpisodeSelection  # noqa: PLC0415
+
+    episode_selection = tonie_config.get("episode_selection", default=EpisodeSelection.GREEDY)
+    return {
+        "wipe": tonie_config.get("wipe", default=True),
+        "episode_selection": EpisodeSelection(episode_selection),
+        "incremental": tonie_config.get("incremental", default=False),
+    }
+
+
+@app.command()
+def plan() -> None:
+    """Show what update-tonies would do, without downloading or uploading anything."""
+    from rich.table import Table  # noqa: PLC0415
+
     tps = _create_tonie_podcast_sync()
     if not tps:
         return
 
-    for tonie_id, tonie_config in settings.CREATIVE_TONIES.items():
-        podcast = _create_podcast_from_config(tonie_config)
-        wipe = tonie_config.get("wipe", default=True)
-        tps.sync_podcast_to_tonie(podcast, tonie_id, tonie_config.maximum_length, wipe=wipe)
+    tonie_configs = dict(settings.CREATIVE_TONIES.items())
+    podcasts = _prefetch_podcasts(tonie_configs, _create_feed_cache())
+    download_mbit = _get_setting("estimated_download_mbit", float(DEFAULT_DOWNLOAD_MBIT))
+    upload_mbit = _get_setting("estimated_upload_mbit", float(DEFAULT_UPLOAD_MBIT))
+
+    table = Table(title="Sync plan")
+    table.add_column("ID", no_wrap=True)
+    table.add_column("Name of Tonie")
+    table.add_column("Podcast")
+    table.add_column("Plan")
+    table.add_column("Size", justify="right")
+    table.add_column("Estimated time", justify="right")
+    plans = []
+    for tonie_id, tonie_config in tonie_configs.items():
+        name = tonie_config.get("name", default="")
+        error = podcasts[tonie_id].exception()
+        if error is not None:
+            table.add_row(tonie_id, name, "", f"[red]failed: {error}[/red]", "", "")
+            continue
+        sync_plan = tps.plan_podcast_sync(
+            podcasts[tonie_id].result(), tonie_id, tonie_config.maximum_length, **_get_sync_options(tonie_config)
+        )
+        plans.append(sync_plan)
+        table.add_row(
+            tonie_id,
+            name,
+            sync_plan.podcast_title,
+            _describe_plan(sync_plan),
+            _format_size(sync_plan),
+            _format_duration(sync_plan.estimated_seconds(download_mbit, upload_mbit)),
+        )
+    _console.print(table)
+
+    for sync_plan in plans:
+        if sync_plan.uploads:
+            _print_planned_uploads(sync_plan)
+
+    download_bytes = sum(sync_plan.download_bytes for sync_plan in plans)
+    upload_bytes = sum(sync_plan.upload_bytes for sync_plan in plans)
+    # Tonies are synced one after another unless sync_workers is set, so the estimate is an upper bound
+    total_seconds = sum(sync_plan.estimated_seconds(download_mbit, upload_mbit) for sync_plan in plans)
+    _console.print(
+        f"Total: {_format_bytes(download_bytes)} to download, {_format_bytes(upload_bytes)} to upload, "
+        f"about {_format_duration(total_seconds)} at {download_mbit:g} Mbit/s down and {upload_mbit:g} Mbit/s up"
+    )
+
+
+def _describe_plan(sync_plan: SyncPlan) -> str:
+    """Summarize the changes a plan makes to a tonie."""
+    if sync_plan.skip_reason:
+        return f"skip: {sync_plan.skip_reason}"
+    actions = []
+    if sync_plan.wipe:
+        actions.append("wipe")
+    if sync_plan.deleted_chapters:
+        actions.append(f"delete {sync_plan.deleted_chapters} chapter(s)")
+    actions.append(f"upload {len(sync_plan.uploads)} episode(s)")
+    return ", ".join(actions)
+
+
+def _print_planned_uploads(sync_plan: SyncPlan) -> None:
+    """Print the episodes a plan uploads to a tonie."""
+    from rich.table import Table  # noqa: PLC0415
+
+    table = Table(title=f"Planned uploads to {sync_plan.tonie_id}")
+    table.add_column("Episode")
+    table.add_column("Published")
+    table.add_column("Duration", justify="right")
+    table.add_column("Size", justify="right")
+    for upload in sync_plan.uploads:
+        size = "unknown" if upload.size_bytes is None else _format_bytes(upload.size_bytes)
+        table.add_row(
+            upload.episode.title,
+            upload.episode.published,
+            _format_duration(upload.episode.duration_sec),
+            f"{size} (cached)" if upload.cached else size,
+        )
+    _console.print(table)
+
+
+def _format_size(sync_plan: SyncPlan) -> str:
+    """Format the upload size of a plan, noting uploads of unknown size."""
+    size = _format_bytes(sync_plan.upload_bytes)
+    if sync_plan.unknown_sizes:
+        size += f" + {sync_plan.unknown_sizes} unknown"
+    return size
+
+
+def _format_bytes(size: int) -> str:
+    """Format a size in bytes as megabytes."""
+    return f"{size / 1_000_000:.1f} MB"
+
 
+def _format_duration(seconds: float) -> str:
+    """Format a duration in seconds as hours, minutes and seconds."""
+    return str(timedelta(seconds=round(seconds)))
 
-def _create_tonie_podcast_sync() -> ToniePodcastSync | None:
+
+def _sync_tonies_concurrently(
+    tps: ToniePodcastSync, sync_workers: int, podcasts: dict[str, Future[Podcast]]
+) -> list[str]:
+    """Sync the tonies concurrently and report the results once all have finished.
+
+    A failing tonie does not abort the other syncs, its error is shown in the final report instead.
+
+    Args:
+        tps: The ToniePodcastSync instance shared by all syncs
+        sync_workers: Maximum number of tonies to sync at the same time
+        podcasts: The prefetched podcast of each tonie to sync by tonie ID
+
+    Returns:
+        The IDs of the tonies whose sync failed
+    """
+    from rich.table import Table  # noqa: PLC0415
+
+    tonie_configs = dict(settings.CREATIVE_TONIES.items())
+    with ThreadPoolExecutor(max_workers=sync_workers, thread_name_prefix="tonie-sync") as executor:
+        futures = {
+            tonie_id: executor.submit(_sync_tonie, tps, tonie_id, tonie_configs[tonie_id], podcast)
+            for tonie_id, podcast in podcasts.items()
+        }
+
+    table = Table(title="Sync results")
+    table.add_column("ID", no_wrap=True)
+    table.add_column("Name of Tonie")
+    table.add_column("Result")
+    for tonie_id, future in futures.items():
+        error = future.exception()
+        result = "[green]done[/green]" if error is None else f"[red]failed: {error}[/red]"
+        table.add_row(tonie_id, tonie_configs[tonie_id].get("name", default=""), result)
+    _console.print(table)
+    return [tonie_id for tonie_id, future in futures.items() if future.exception() is not None]
+
+
+@app.command()
+def daemon() -> None:
+    """Keep running and sync each tonie whenever the feed of its podcast changes."""
+    from tonie_podcast_sync.scheduler import FeedScheduler  # noqa: PLC0415
+
+    tps = _create_tonie_podcast_sync()
+    if not tps:
+        return
+
+    tonie_configs = dict(settings.CREATIVE_TONIES.items())
+    minimum = _get_setting("daemon.min_poll_minutes", DEFAULT_DAEMON_MIN_POLL_MINUTES)
+    maximum = _get_setting("daemon.max_poll_minutes", DEFAULT_DAEMON_MAX_POLL_MINUTES)
+    scheduler = FeedScheduler(
+        {tonie_id: tonie_config.podcast for tonie_id, tonie_config in tonie_configs.items()},
+        minimum=max(1, minimum) * 60,
+        maximum=maximum * 60,
+    )
+    feed_cache = _create_feed_cache()
+    try:
+        while True:
+            _run_daemon_cycle(tps, tonie_configs, feed_cache, scheduler)
+            time.sleep(scheduler.seconds_until_next_poll())
+    except KeyboardInterrupt:
+        _console.print("Daemon stopped.")
+
+
+def _run_daemon_cycle(
+    tps: ToniePodcastSync, tonie_configs: dict, feed_cache: FeedCache, scheduler: FeedScheduler
+) -> None:
+    """Poll the feeds that are due and sync the tonies of the feeds that changed.
+
+    Failed feeds and syncs are retried after the minimum poll interval instead of stopping the daemon.
+    This includes unexpected errors, which retry all feeds that were due in this cycle.
+
+    Args:
+        tps: The ToniePodcastSync instance kept for the lifetime of the daemon
+        tonie_configs: The configuration dictionary of each tonie by tonie ID
+        feed_cache: The cache for conditional feed requests
+        scheduler: The poll schedule of the feeds
+    """
+    due_feeds = scheduler.due_feeds()
+    if not due_feeds:
+        return
+    try:
+        _sync_due_feeds(tps, tonie_configs, feed_cache, scheduler, due_feeds)
+    except Exception as e:  # noqa: BLE001
+        _console.print(f"Unable to sync the tonies of {len(due_feeds)} feeds: {e!r}", style="red")
+        for url in due_feeds:
+            scheduler.retry(url)
+
+
+def _sync_due_feeds(
+    tps: ToniePodcastSync, tonie_configs: dict, feed_cache: FeedCache, scheduler: FeedScheduler, due_feeds: list[str]
+) -> None:
+    """Poll the given feeds and sync the tonies of the feeds that changed.
+
+    Args:
+        tps: The ToniePodcastSync instance kept for the lifetime of the daemon
+        tonie_configs: The configuration dictionary of each tonie by tonie ID
+        feed_cache: The cache for conditional feed requests
+        scheduler: The poll schedule of the feeds
+        due_feeds: The URLs of the feeds to poll
+    """
+    due_configs = {tonie_id: tonie_configs[tonie_id] for url in due_feeds for tonie_id in scheduler.tonies_of(url)}
+    podcasts = _prefetch_podcasts(due_configs, feed_cache)
+
+    changed: dict[str, Future[Podcast]] = {}
+    failed_feeds = False
+    for url in due_feeds:
+        tonie_ids = scheduler.tonies_of(url)
+        first_podcast = podcasts[tonie_ids[0]]
+        if first_podcast.exception() is not None:
+            _console.print(f"Unable to fetch {url}: {first_podcast.exception()}", style="red")
+            scheduler.retry(url)
+            failed_feeds = True
+        elif scheduler.update(url, first_podcast.result().entries):
+            changed.update((tonie_id, podcasts[tonie_id]) for tonie_id in tonie_ids)
+    if not changed and not failed_feeds:
+        return
+
+    from tonie_podcast_sync.run_report import RunReport  # noqa: PLC0415
+
+    run_report = RunReport()
+    tps.run_report = run_report
+    try:
+        if changed:
+            _sync_changed_tonies(tps, tonie_configs, changed, scheduler)
+    finally:
+        _report_failed_feeds(run_report, due_configs, podcasts)
+        _write_run_report(run_report)
+
+
+def _sync_changed_tonies(
+    tps: ToniePodcastSync, tonie_configs: dict, podcasts: dict[str, Future[Podcast]], scheduler: FeedScheduler
+) -> None:
+    """Sync the tonies whose feeds changed, with a fresh login to the Tonie Cloud.
+
+    Args:
+        tps: The ToniePodcastSync instance kept for the lifetime of the daemon
+        tonie_configs: The configuration dictionary of each tonie by tonie ID
+        podcasts: The podcast of each tonie to sync by tonie ID
+        scheduler: The poll schedule of the feeds, failed syncs are scheduled for a retry
+    """
+    from requests.exceptions import RequestException  # noqa: PLC0415
+
+    try:
+        tps.refresh()
+    except (ValueError, RequestException) as e:
+        _console.print(f"Unable to connect to the Tonie Cloud: {e}", style="red")
+        failed_tonies = list(podcasts)
+    else:
+        sync_workers = _get_setting("sync_workers", DEFAULT_SYNC_WORKERS)
+        failed_tonies = _sync_tonies_concurrently(tps, max(1, sync_workers), podcasts)
+    for url in {tonie_configs[tonie_id].podcast for tonie_id in failed_tonies}:
+        scheduler.retry(url)
+
+
+def _get_setting(name: str, default: T) -> T:
+    """Read a global setting, falling back to the default if it is missing or of the wrong type.
+
+    Args:
+        name: The name of the setting
+        default: The value to use if the setting is not set or invalid
+
+    Returns:
+        The configured value or the default
+    """
+    value = settings.get(name, default)
+    if isinstance(default, float) and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, type(default)):
+        return default
+    return value
+
+
+def _create_tonie_podcast_sync(run_report: RunReport | None = None) -> ToniePodcastSync | None:
     """Create ToniePodcastSync instance from settings.
 
+    Args:
+        run_report: The report to record the stage timings of all syncs in
+
     Returns:
         ToniePodcastSync instance if successful, None otherwise
     """
+    from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync  # noqa: PLC0415
+
     try:
-        return ToniePodcastSync(settings.TONIE_CLOUD_ACCESS.USERNAME, settings.TONIE_CLOUD_ACCESS.PASSWORD)
+        return ToniePodcastSync(
+            settings.TONIE_CLOUD_ACCESS.USERNAME,
+            settings.TONIE_CLOUD_ACCESS.PASSWORD,
+            download_workers=_get_setting("download_workers", DEFAULT_DOWNLOAD_WORKERS),
+            upload_workers=_get_setting("upload_workers", DEFAULT_UPLOAD_WORKERS),
+            episode_cache=_create_episode_cache(),
+            retry_policy=_create_retry_policy(),
+            run_report=run_report,
+        )
     except BoxError:
         _console.print(
             "There was an error getting the username or password. Please create the settings file or set the "
@@ -49,15 +502,68 @@ def _create_tonie_podcast_sync() -> ToniePodcastSync | None:
         return None
 
 
-def _create_podcast_from_config(config: dict) -> Podcast:
+def _create_retry_policy() -> RetryPolicy:
+    """Create the retry policy for downloads and uploads from settings.
+
+    Returns:
+        RetryPolicy instance
+    """
+    from tonie_podcast_sync.retry import RetryPolicy  # noqa: PLC0415
+
+    defaults = RetryPolicy()
+    fatal_status_codes = _get_setting("retry.fatal_status_codes", [])
+    return RetryPolicy(
+        max_attempts=_get_setting("retry.max_attempts", defaults.max_attempts),
+        base_delay=_get_setting("retry.base_delay_seconds", float(defaults.base_delay)),
+        max_delay=_get_setting("retry.max_delay_seconds", float(defaults.max_delay)),
+        total_budget=_get_setting("retry.total_budget_seconds", float(defaults.total_budget)),
+        jitter=_get_setting("retry.jitter", float(defaults.jitter)),
+        fatal_status_codes=frozenset(code for code in fatal_status_codes if isinstance(code, int)),
+    )
+
+
+def _create_episode_cache() -> EpisodeCache | None:
+    """Create the persistent episode cache from settings.
+
+    Returns:
+        EpisodeCache instance, or None if the cache is disabled
+    """
+    max_mb = _get_setting("episode_cache_max_mb", DEFAULT_EPISODE_CACHE_MAX_MB)
+    if max_mb <= 0:
+        return None
+    from tonie_podcast_sync.episode_cache import EpisodeCache  # noqa: PLC0415
+
+    directory = _get_setting("episode_cache_dir", str(APP_SETTINGS_DIR / "cache"))
+    return EpisodeCache(Path(directory).expanduser(), max_mb * 1024 * 1024)
+
+
+def _create_feed_cache() -> FeedCache:
+    """Create the cache for conditional feed requests from settings.
+
+    Returns:
+        FeedCache instance
+    """
+    from tonie_podcast_sync.feed_cache import FeedCache  # noqa: PLC0415
+
+    directory = _get_setting("feed_cache_dir", str(APP_SETTINGS_DIR / "feeds"))
+    return FeedCache(Path(directory).expanduser())
+
+
+def _create_podcast_from_config(
+    config: dict, feed_cache: FeedCache | None = None, parsed_feed: ParsedFeed | None = None
+) -> Podcast:
     """Create a Podcast instance from configuration.
 
     Args:
         config: The configuration dictionary for a Tonie
+        feed_cache: The cache for conditional feed requests
+        parsed_feed: The feed already fetched for another tonie with the same feed URL
 
     Returns:
         Configured Podcast instance
     """
+    from tonie_podcast_sync.podcast import EpisodeSelection, Podcast  # noqa: PLC0415
+
     excluded_title_strings = config.get("excluded_title_strings", [])
     pinned_episode_names = config.get("pinned_episode_names", [])
     episode_max_duration_sec = config.get("episode_max_duration_sec", MAXIMUM_TONIE_MINUTES * 60)
@@ -70,6 +576,10 @@ def _create_podcast_from_config(config: dict) -> Podcast:
         episode_max_duration_sec=episode_max_duration_sec,
         excluded_title_strings=excluded_title_strings,
         pinned_episode_names=pinned_episode_names,
+        feed_cache=feed_cache,
+        streaming=config.get("stream_feed", False),
+        parsed_feed=parsed_feed,
+        episode_selection=EpisodeSelection(config.get("episode_selection", EpisodeSelection.GREEDY)),
     )
 
 
@@ -142,6 +652,8 @@ def _validate_and_create_tps(username: str, password: str) -> ToniePodcastSync |
     Returns:
         ToniePodcastSync instance if successful, None otherwise
     """
+    from tonie_podcast_sync.toniepodcastsync import ToniePodcastSync  # noqa: PLC0415
+
     try:
         return ToniePodcastSync(user=username, pwd=password)
     except KeyError:
@@ -208,6 +720,8 @@ def _ask_episode_order(configs: dict, tonie: CreativeTonie) -> None:
         configs: The configuration dictionary to update
         tonie: The tonie being configured
     """
+    from tonie_podcast_sync.podcast import EpisodeSorting  # noqa: PLC0415
+
     episode_order = Prompt.ask(
         "How would you like your podcast episodes sorted?",
         choices=list(EpisodeSorting),
@@ -1,7 +1,23 @@
 """Shared constants for tonie-podcast-sync."""
 
 MAXIMUM_TONIE_MINUTES = 90
-DOWNLOAD_RETRY_COUNT = 3
-UPLOAD_RETRY_COUNT = 3
+STREAM_REPLACEMENT_MINUTES = 90
+RETRY_MAX_ATTEMPTS = 3
 RETRY_DELAY_SECONDS = 3
+RETRY_MAX_DELAY_SECONDS = 60
+RETRY_BUDGET_SECONDS = 300
+RETRY_JITTER = 0.5
 MAX_SHUFFLE_ATTEMPTS = 5
+DEFAULT_SYNC_WORKERS = 1
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_UPLOAD_WORKERS = 1
+DEFAULT_FEED_WORKERS = 4
+DEFAULT_EPISODE_CACHE_MAX_MB = 2048
+PACKING_CANDIDATES = 64
+PACKING_RESOLUTION_SECONDS = 10
+PIPELINE_BUFFER_SIZE = 2
+NORMALIZATION_CACHE_SIZE = 4096
+DEFAULT_DOWNLOAD_MBIT = 50
+DEFAULT_UPLOAD_MBIT = 10
+DEFAULT_DAEMON_MIN_POLL_MINUTES = 15
+DEFAULT_DAEMON_MAX_POLL_MINUTES = 720
@@ -0,0 +1,136 @@
+"""Persistent on-disk cache for downloaded podcast episodes."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tonie_podcast_sync.podcast import Episode
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+CACHE_FILE_SUFFIX = ".mp3"
+
+
+class EpisodeCache:
+    """A size limited cache of episode files that is kept across runs.
+
+    Files are addressed by a hash of the episode GUID, the enclosure URL and the volume adjustment,
+    so an episode is only downloaded once no matter on how many tonies or in how many runs it is used.
+    When the cache grows beyond its size limit, the least recently used files are evicted.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        """Initialize the episode cache.
+
+        The cache directory is created on the first write.
+
+        Args:
+            directory: The directory to store the cached episodes in
+            max_bytes: Maximum total size of all cached episodes in bytes
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(episode: Episode) -> str:
+        """Return the cache key of an episode.
+
+        Args:
+            episode: The episode to compute the key for
+
+        Returns:
+            A hex digest identifying the processed episode file
+        """
+        identity = f"{episode.guid}\n{episode.url}\n{episode.volume_adjustment}"
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def contains(self, episode: Episode) -> bool:
+        """Check if an episode is cached, without marking it as recently used.
+
+        Args:
+            episode: The episode to look up
+
+        Returns:
+            True if the episode is cached, False otherwise
+        """
+        return self._path_for(episode).exists()
+
+    def restore(self, episode: Episode, destination: Path) -> bool:
+        """Provide a cached episode at the given destination.
+
+        The file is hard linked if possible and copied otherwise. A hit marks the
+        cached file as recently used.
+
+        Args:
+            episode: The episode to look up
+            destination: The path the episode file should be available at
+
+        Returns:
+            True if the episode was cached and is now available at the destination, False otherwise
+        """
+        cached_file = self._path_for(episode)
+        with self._lock:
+            if not cached_file.exists():
+                return False
+            cached_file.touch()
+            link_or_copy(cached_file, destination)
+        log.debug("Episode cache hit for '%s'", episode.title)
+        return True
+
+    def store(self, episode: Episode, source: Path) -> None:
+        """Add a downloaded episode file to the cache.
+
+        Args:
+            episode: The episode the file belongs to
+            source: The downloaded episode file
+        """
+        if source.stat().st_size > self.max_bytes:
+            log.debug("Episode '%s' is larger than the episode cache, not caching it", episode.title)
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so other threads or processes never see partial files
+        tmp_file = self.directory / f".{self.key_for(episode)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            link_or_copy(source, tmp_file)
+            with self._lock:
+                tmp_file.replace(self._path_for(episode))
+                self._evict()
+        finally:
+            tmp_file.unlink(missing_ok=True)
+
+    def _path_for(self, episode: Episode) -> Path:
+        return self.directory / f"{self.key_for(episode)}{CACHE_FILE_SUFFIX}"
+
+    def _evict(self) -> None:
+        """Remove the least recently used files until the cache fits into its size limit."""
+        entries = []
+        total_bytes = 0
+        for path in self.directory.glob(f"*{CACHE_FILE_SUFFIX}"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        for _mtime, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            log.debug("Evicting %s from episode cache", path.name)
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """Hard link source to destination, falling back to a copy across file systems."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
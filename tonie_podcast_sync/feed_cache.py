@@ -0,0 +1,143 @@
+"""Persistent cache of podcast feeds for conditional HTTP requests."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from tonie_podcast_sync.podcast import FeedEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+DATABASE_NAME = "feeds.sqlite3"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    modified TEXT,
+    title TEXT NOT NULL,
+    entries TEXT NOT NULL,
+    complete INTEGER NOT NULL
+);
+"""
+# The fields of a parsed entry in the order they are stored in
+ENTRY_FIELDS = tuple(field.name for field in fields(FeedEntry))
+
+
+@dataclass
+class CachedFeed:
+    """The HTTP validators and parsed entries of a previously fetched feed.
+
+    The entries are not complete if reading the feed stopped early, see the streaming option of Podcast.
+    """
+
+    etag: str | None
+    modified: str | None
+    title: str
+    entries: list[FeedEntry]
+    complete: bool = True
+
+
+class FeedCache:
+    """Stores the ETag/Last-Modified validators and the parsed entries of podcast feeds across runs.
+
+    The stored validators are sent with the next request of the same feed URL. If the server
+    answers with 304 Not Modified, the stored entries are used instead of parsing the feed again.
+    The cache is a SQLite database with one row per feed.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Initialize the feed cache.
+
+        The cache directory and database are created on the first write.
+
+        Args:
+            directory: The directory to store the feed cache in
+        """
+        self.directory = Path(directory)
+        self.path = self.directory / DATABASE_NAME
+
+    def load(self, url: str) -> CachedFeed | None:
+        """Load the cached feed of a URL.
+
+        Args:
+            url: The URL of the podcast feed
+
+        Returns:
+            The cached feed, or None if the feed was not cached yet or the database is unreadable
+        """
+        if not self.path.exists():
+            return None
+        try:
+            with self._connect() as connection:
+                row = connection.execute(
+                    "SELECT etag, modified, title, entries, complete FROM feeds WHERE url = ?", (url,)
+                ).fetchone()
+            if row is None:
+                return None
+            entries = [_decode_entry(values) for values in json.loads(row[3])]
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            log.warning("Ignoring unreadable feed cache %s: %s", self.path, e)
+            return None
+        return CachedFeed(etag=row[0], modified=row[1], title=row[2], entries=entries, complete=bool(row[4]))
+
+    def store(  # noqa: PLR0913
+        self,
+        url: str,
+        etag: str | None,
+        modified: str | None,
+        title: str,
+        entries: list[FeedEntry],
+        *,
+        complete: bool = True,
+    ) -> None:
+        """Store the validators and parsed entries of a freshly fetched feed.
+
+        Feeds without validators are not stored, as they cannot be requested conditionally.
+
+        Args:
+            url: The URL of the podcast feed
+            etag: The ETag header of the response
+            modified: The Last-Modified header of the response
+            title: The title of the podcast
+            entries: The entries of the feed in feed order
+            complete: Whether entries holds all entries of the feed or only the first ones
+        """
+        if not (etag or modified):
+            return
+        data = json.dumps([[getattr(entry, name) for name in ENTRY_FIELDS] for entry in entries])
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self._connect() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO feeds (url, etag, modified, title, entries, complete) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, etag, modified, title, data, complete),
+                )
+        except sqlite3.Error as e:
+            log.warning("Unable to update feed cache %s: %s", self.path, e)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success, each thread uses its own connection."""
+        with closing(sqlite3.connect(self.path, timeout=30)) as connection, connection:
+            connection.executescript(SCHEMA)
+            yield connection
+
+
+def _decode_entry(values: list) -> FeedEntry:
+    """Rebuild a parsed entry from its stored field values."""
+    entry = dict(zip(ENTRY_FIELDS, values, strict=True))
+    if entry["published_parsed"]:
+        entry["published_parsed"] = time.struct_time(entry["published_parsed"])
+    return FeedEntry(**entry)
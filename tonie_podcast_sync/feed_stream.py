@@ -0,0 +1,182 @@
+"""Incremental reader for large RSS podcast feeds."""
+
+from __future__ import annotations
+
+import logging
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+import requests
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from time import struct_time
+    from xml.etree.ElementTree import Element
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+ITUNES_NAMESPACE = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+# Nesting depth of <channel> below <rss>
+CHANNEL_DEPTH = 2
+FEED_REQUEST_TIMEOUT_SECONDS = 60
+HTTP_NOT_MODIFIED = 304
+
+
+class UnsupportedFeedError(ValueError):
+    """The feed cannot be read incrementally, e.g. because it is an Atom feed."""
+
+
+class FeedStream:
+    """An RSS feed whose items are parsed while the document is read.
+
+    Only the item that is currently parsed is kept in memory, and reading stops as soon as
+    the caller stops iterating. Items are plain dictionaries holding the same keys as the
+    entries of feedparser that are needed to sync an episode.
+    """
+
+    def __init__(self, source: IO[bytes], etag: str | None = None, modified: str | None = None) -> None:
+        """Start reading a feed up to its first item.
+
+        Args:
+            source: The feed document, it is closed together with the stream
+            etag: The ETag header of the feed response
+            modified: The Last-Modified header of the feed response
+
+        Raises:
+            UnsupportedFeedError: If the document is not an RSS feed with a title before its first item
+        """
+        self.etag = etag
+        self.modified = modified
+        self._source = source
+        # Expat refuses documents with excessive entity expansion, external entities are never resolved
+        self._events = ET.iterparse(source, events=("start", "end"))  # noqa: S314
+        self._channel: Element | None = None
+        self._depth = 0
+        try:
+            self.title = self._read_title()
+        except BaseException:
+            self.close()
+            raise
+
+    def __iter__(self) -> Iterator[dict]:
+        """Parse the remaining items of the feed.
+
+        Yields:
+            The items in document order
+        """
+        for event, element in self._events:
+            if not self._is_channel_child_end(event) or element.tag != "item":
+                continue
+            yield _item(element)
+            # Drop the parsed item from the document tree to keep the memory constant
+            self._channel.remove(element)
+
+    def close(self) -> None:
+        """Stop reading and close the feed document."""
+        self._source.close()
+
+    def _read_title(self) -> str:
+        """Read the feed up to the end of the channel title."""
+        for event, element in self._events:
+            ends_channel_child = self._is_channel_child_end(event)
+            if event == "start" and self._depth == 1 and element.tag != "rss":
+                msg = f"Expected an RSS feed, found <{element.tag}>"
+                raise UnsupportedFeedError(msg)
+            if event == "start" and self._depth == CHANNEL_DEPTH and element.tag == "channel":
+                self._channel = element
+            if self._channel is None or not ends_channel_child:
+                continue
+            if element.tag == "item":
+                msg = "The feed has no title before its first item"
+                raise UnsupportedFeedError(msg)
+            if element.tag == "title":
+                return (element.text or "").strip()
+        msg = "The feed has no title"
+        raise UnsupportedFeedError(msg)
+
+    def _is_channel_child_end(self, event: str) -> bool:
+        """Track the nesting depth and check if the event ends a direct child of <channel>."""
+        if event == "start":
+            self._depth += 1
+            return False
+        self._depth -= 1
+        return self._depth == CHANNEL_DEPTH
+
+
+def open_feed_stream(url: str, etag: str | None = None, modified: str | None = None) -> FeedStream | None:
+    """Open a feed for incremental reading.
+
+    Args:
+        url: The URL or local path of the feed
+        etag: The ETag of an earlier response, sent as If-None-Match
+        modified: The Last-Modified date of an earlier response, sent as If-Modified-Since
+
+    Returns:
+        The feed stream, or None if the server reports that the feed has not been modified
+
+    Raises:
+        UnsupportedFeedError: If the feed is not an RSS feed
+        requests.HTTPError: If the server answers with an error
+    """
+    if not url.startswith(("http://", "https://")):
+        return FeedStream(Path(url).open("rb"))
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    response = requests.get(url, headers=headers, stream=True, timeout=FEED_REQUEST_TIMEOUT_SECONDS)
+    if response.status_code == HTTP_NOT_MODIFIED:
+        response.close()
+        return None
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        response.close()
+        raise
+    response.raw.decode_content = True
+    return FeedStream(response.raw, etag=response.headers.get("ETag"), modified=response.headers.get("Last-Modified"))
+
+
+def _item(element: Element) -> dict:
+    """Convert a parsed <item> element into a feed item."""
+    links = []
+    enclosure = element.find("enclosure")
+    if enclosure is not None and enclosure.get("url"):
+        link = {"rel": "enclosure", "href": enclosure.get("url")}
+        if enclosure.get("length"):
+            link["length"] = enclosure.get("length")
+        links.append(link)
+
+    published = _text(element, "pubDate")
+    item = {
+        "id": _text(element, "guid") or (links[0]["href"] if links else _text(element, "link")),
+        "title": _text(element, "title"),
+        "published": published,
+        "published_parsed": _parse_date(published),
+        "links": links,
+    }
+    duration = element.find(f"{{{ITUNES_NAMESPACE}}}duration")
+    if duration is not None:
+        item["itunes_duration"] = (duration.text or "").strip()
+    return item
+
+
+def _text(element: Element, tag: str) -> str:
+    """Return the stripped text of a child element, or an empty string if it is missing."""
+    return (element.findtext(tag) or "").strip()
+
+
+def _parse_date(value: str) -> struct_time | None:
+    """Parse an RFC 822 date into a UTC struct_time, like feedparser does."""
+    try:
+        published = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        log.debug("Ignoring invalid publication date: %s", value)
+        return None
+    # Dates without a time zone are taken as UTC
+    return published.utctimetuple()
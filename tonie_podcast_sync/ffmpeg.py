@@ -0,0 +1,84 @@
+"""Detection of the ffmpeg installation and its capabilities."""
+
+from __future__ import annotations
+
+import functools
+import logging
+import platform
+import subprocess
+from dataclasses import dataclass
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+@dataclass(frozen=True)
+class FfmpegCapabilities:
+    """The ffmpeg installation found on the system."""
+
+    executable: str
+    version: str
+    encoders: frozenset[str]
+
+    def supports_encoder(self, encoder: str) -> bool:
+        """Check if ffmpeg was built with the given encoder.
+
+        Args:
+            encoder: The name of the encoder, e.g. "libmp3lame"
+
+        Returns:
+            True if the encoder is available, False otherwise
+        """
+        return encoder in self.encoders
+
+
+def ffmpeg_executable() -> str:
+    """Return the name of the ffmpeg executable for the current platform."""
+    return "ffmpeg" if platform.system().lower() != "windows" else "ffmpeg.exe"
+
+
+@functools.cache
+def probe_ffmpeg() -> FfmpegCapabilities | None:
+    """Probe the ffmpeg installation once per process.
+
+    Returns:
+        The capabilities of ffmpeg, or None if ffmpeg is not available
+    """
+    executable = ffmpeg_executable()
+    try:
+        version_output = subprocess.run(  # noqa: S603
+            [executable, "-version"], check=True, capture_output=True, text=True
+        ).stdout
+        encoders_output = subprocess.run(  # noqa: S603
+            [executable, "-hide_banner", "-encoders"], check=True, capture_output=True, text=True
+        ).stdout
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        log.debug("ffmpeg is not available")
+        return None
+
+    capabilities = FfmpegCapabilities(
+        executable=executable,
+        version=_parse_version(version_output),
+        encoders=_parse_encoders(encoders_output),
+    )
+    log.debug("Found ffmpeg %s with %d encoders", capabilities.version, len(capabilities.encoders))
+    return capabilities
+
+
+def _parse_version(output: str) -> str:
+    """Extract the version from the output of `ffmpeg -version`."""
+    # The first line looks like "ffmpeg version 6.1.1 Copyright (c) 2000-2023 the FFmpeg developers"
+    parts = output.split(maxsplit=3)
+    if len(parts) >= 3 and parts[1] == "version":  # noqa: PLR2004
+        return parts[2]
+    return "unknown"
+
+
+def _parse_encoders(output: str) -> frozenset[str]:
+    """Extract the encoder names from the output of `ffmpeg -encoders`."""
+    # The encoder list follows a legend that is terminated by a line of dashes,
+    # each encoder line looks like " A....D libmp3lame  libmp3lame MP3 (MPEG audio layer 3)"
+    _legend, separator, encoder_list = output.partition("------")
+    if not separator:
+        return frozenset()
+    return frozenset(parts[1] for line in encoder_list.splitlines() if len(parts := line.split()) > 1)
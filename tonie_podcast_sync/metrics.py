@@ -0,0 +1,217 @@
+"""Metrics of a sync run in the Prometheus text format, e.g. for the textfile collector of node_exporter."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from tonie_podcast_sync.run_report import RunReport, StageTiming
+
+METRIC_PREFIX = "tonie_podcast_sync"
+# Upper bounds in seconds of the buckets of the stage duration histogram
+STAGE_DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+
+Sample = tuple[str, dict[str, str], float]
+
+
+def render_metrics(run_report: RunReport) -> str:
+    """Render the metrics of a run in the Prometheus text format.
+
+    All values describe the reported run only, so they are exported as gauges.
+
+    Args:
+        run_report: The report of the run
+
+    Returns:
+        The metrics, one sample per line
+    """
+    tonies = {tonie_id: list(timings) for tonie_id, timings in run_report.tonies().items()}
+    lines = [
+        *_family(
+            "last_run_timestamp_seconds",
+            "gauge",
+            "Start time of the last run.",
+            [("", {}, run_report.started.timestamp())],
+        ),
+        *_family("last_run_duration_seconds", "gauge", "Duration of the last run.", [("", {}, run_report.seconds)]),
+        *_family(
+            "sync_success",
+            "gauge",
+            "Whether the sync of a tonie finished without an error.",
+            [("", {"tonie": tonie_id}, _sync_succeeded(timings)) for tonie_id, timings in tonies.items()],
+        ),
+        *_family(
+            "feed_up",
+            "gauge",
+            "Whether the feed of a tonie was fetched without an error.",
+            _feed_samples(tonies, lambda details: "error" not in details),
+        ),
+        *_family(
+            "feed_not_modified",
+            "gauge",
+            "Whether the server reported that the feed of a tonie has not changed since the last fetch.",
+            _feed_samples(tonies, lambda details: bool(details.get("not_modified"))),
+        ),
+        *_family(
+            "downloaded_bytes",
+            "gauge",
+            "Bytes of episodes downloaded from the podcast servers.",
+            _byte_samples(tonies, "download", lambda details: details.get("source") == "download"),
+        ),
+        *_family(
+            "uploaded_bytes",
+            "gauge",
+            "Bytes of episodes uploaded to the Tonie Cloud.",
+            _byte_samples(tonies, "upload", lambda details: bool(details.get("uploaded"))),
+        ),
+        *_family("episodes", "gauge", "Episodes by operation and result.", _episode_samples(tonies)),
+        *_family("retries", "gauge", "Retried downloads and uploads.", _retry_samples(tonies)),
+        *_family(
+            "api_calls",
+            "gauge",
+            "Requests to the Tonie Cloud API by endpoint.",
+            [("", {"endpoint": endpoint}, count) for endpoint, count in run_report.api_calls().items()],
+        ),
+        *_family(
+            "stage_duration_seconds",
+            "histogram",
+            "Duration of the stages of all syncs.",
+            _histogram_samples(
+                [timing for timings in tonies.values() for timing in timings if timing.stage != "retry"]
+            ),
+        ),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(run_report: RunReport, path: Path) -> None:
+    """Write the metrics of a run to a file.
+
+    The file is replaced atomically, so a collector never reads a partially written file.
+
+    Args:
+        run_report: The report of the run
+        path: The file to write the metrics to, usually ending in .prom
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(f"{path.name}.tmp")
+    temporary_path.write_text(render_metrics(run_report), encoding="utf-8")
+    temporary_path.replace(path)
+
+
+def _sync_succeeded(timings: list[StageTiming]) -> bool:
+    """Check if a tonie was synced without an error."""
+    syncs = [timing for timing in timings if timing.stage == "sync"]
+    return bool(syncs) and "error" not in syncs[-1].details
+
+
+def _feed_samples(tonies: dict[str, list[StageTiming]], value: Callable[[dict], bool]) -> list[Sample]:
+    """Evaluate the last feed fetch of each tonie, a feed that cannot be streamed is fetched twice."""
+    samples = []
+    for tonie_id, timings in tonies.items():
+        fetches = [timing for timing in timings if timing.stage == "feed_fetch"]
+        if fetches:
+            labels = {"tonie": tonie_id, "feed": str(fetches[-1].details.get("url", ""))}
+            samples.append(("", labels, value(fetches[-1].details)))
+    return samples
+
+
+def _byte_samples(tonies: dict[str, list[StageTiming]], stage: str, predicate: Callable[[dict], bool]) -> list[Sample]:
+    """Sum the bytes of the stages of the given name whose details match the predicate for each tonie."""
+    return [
+        (
+            "",
+            {"tonie": tonie_id},
+            sum(
+                timing.details.get("bytes") or 0
+                for timing in timings
+                if timing.stage == stage and predicate(timing.details)
+            ),
+        )
+        for tonie_id, timings in tonies.items()
+    ]
+
+
+def _episode_samples(tonies: dict[str, list[StageTiming]]) -> list[Sample]:
+    """Count the downloads by source and the uploads by result for each tonie.
+
+    A stage that raised an error has no source or result, it is counted as failed.
+    """
+    samples = []
+    for tonie_id, timings in tonies.items():
+        counts: dict[tuple[str, str], int] = {}
+        for timing in timings:
+            if timing.stage == "download":
+                key = ("download", timing.details.get("source", "failed"))
+            elif timing.stage == "upload":
+                key = ("upload", "uploaded" if timing.details.get("uploaded") else "failed")
+            else:
+                continue
+            counts[key] = counts.get(key, 0) + 1
+        samples += [
+            ("", {"tonie": tonie_id, "operation": operation, "result": result}, count)
+            for (operation, result), count in sorted(counts.items())
+        ]
+    return samples
+
+
+def _retry_samples(tonies: dict[str, list[StageTiming]]) -> list[Sample]:
+    """Count the retries by operation for each tonie."""
+    samples = []
+    for tonie_id, timings in tonies.items():
+        for operation in ("download", "upload"):
+            retries = sum(
+                timing.stage == "retry" and timing.details.get("operation") == operation for timing in timings
+            )
+            samples.append(("", {"tonie": tonie_id, "operation": operation}, retries))
+    return samples
+
+
+def _histogram_samples(timings: list[StageTiming]) -> list[Sample]:
+    """Build a histogram of the durations of each stage."""
+    durations: dict[str, list[float]] = {}
+    for timing in timings:
+        durations.setdefault(timing.stage, []).append(timing.seconds)
+
+    samples = []
+    for stage, seconds in sorted(durations.items()):
+        for bound in (*STAGE_DURATION_BUCKETS, math.inf):
+            count = sum(duration <= bound for duration in seconds)
+            samples.append(("_bucket", {"stage": stage, "le": _format_value(bound)}, count))
+        samples.append(("_sum", {"stage": stage}, sum(seconds)))
+        samples.append(("_count", {"stage": stage}, len(seconds)))
+    return samples
+
+
+def _family(name: str, kind: str, help_text: str, samples: list[Sample]) -> list[str]:
+    """Render a metric family with its HELP and TYPE lines."""
+    metric = f"{METRIC_PREFIX}_{name}"
+    lines = [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+    for suffix, labels, value in samples:
+        lines.append(f"{metric}{suffix}{_format_labels(labels)} {_format_value(value)}")
+    return lines
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Render the labels of a sample."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape backslashes, quotes and line breaks in a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, booleans are rendered as 0 or 1."""
+    if math.isinf(value):
+        return "+Inf"
+    if isinstance(value, (bool, int)):
+        return str(int(value))
+    return repr(value)
@@ -0,0 +1,95 @@
+"""Helpers to overlap the stages of a sync."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+T = TypeVar("T")
+
+_POLL_INTERVAL_SECONDS = 0.1
+
+
+class _Done:
+    """Marks the end of the produced items."""
+
+
+class _Failed:
+    """Carries an exception of the producer to the consumer."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class _Producer(threading.Thread):
+    """Evaluates an iterable and hands its items over through a bounded queue."""
+
+    def __init__(self, items: Iterable, buffer_size: int, name: str) -> None:
+        super().__init__(name=name, daemon=True)
+        self.items = items
+        self.handoff: queue.Queue = queue.Queue(maxsize=max(1, buffer_size))
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        try:
+            for item in self.items:
+                if not self._put(item):
+                    log.debug("%s: consumer stopped, stopping producer", self.name)
+                    # Let a generator clean up, e.g. shut down its thread pool
+                    close = getattr(self.items, "close", None)
+                    if close:
+                        close()
+                    return
+        except BaseException as e:  # noqa: BLE001
+            self._put(_Failed(e))
+        else:
+            self._put(_Done())
+
+    def _put(self, item: object) -> bool:
+        """Wait until the item fits into the queue, unless the consumer stopped."""
+        while not self.stopped.is_set():
+            try:
+                self.handoff.put(item, timeout=_POLL_INTERVAL_SECONDS)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+
+def pipelined(items: Iterable[T], *, buffer_size: int, name: str = "pipeline") -> Iterator[T]:
+    """Produce items in a background thread while the caller consumes them.
+
+    The items are passed through a bounded queue, so the producer runs at most buffer_size
+    items ahead of the consumer. Items keep their order, and an exception raised by the
+    producer is raised again in the consumer once all items before it were consumed.
+    If the consumer stops early, the producer is stopped before its next item.
+
+    Args:
+        items: The iterable evaluated in the background thread
+        buffer_size: Maximum number of produced items waiting to be consumed
+        name: The name of the background thread
+
+    Yields:
+        The items in the order they were produced
+    """
+    producer = _Producer(items, buffer_size, name)
+    producer.start()
+    try:
+        while True:
+            item = producer.handoff.get()
+            if isinstance(item, _Done):
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+    finally:
+        producer.stopped.set()
+        producer.join()
@@ -0,0 +1,70 @@
+"""Dry-run plans of podcast syncs."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tonie_podcast_sync.podcast import Episode
+
+BITS_PER_BYTE = 8
+
+
+@dataclass
+class PlannedUpload:
+    """An episode that a sync would upload.
+
+    The size is None if neither the feed nor the server announce it. Cached episodes are
+    restored from the episode cache instead of being downloaded.
+    """
+
+    episode: Episode
+    size_bytes: int | None
+    cached: bool = False
+
+
+@dataclass
+class SyncPlan:
+    """What a sync of a podcast to a tonie would do, without downloading or uploading anything.
+
+    A plan with a skip reason leaves the tonie unchanged.
+    """
+
+    tonie_id: str
+    podcast_title: str
+    skip_reason: str | None = None
+    wipe: bool = False
+    deleted_chapters: int = 0
+    uploads: list[PlannedUpload] = field(default_factory=list)
+
+    @property
+    def upload_bytes(self) -> int:
+        """The total size of all uploads with a known size."""
+        return sum(upload.size_bytes or 0 for upload in self.uploads)
+
+    @property
+    def download_bytes(self) -> int:
+        """The total size of all uploads with a known size that are not in the episode cache."""
+        return sum(upload.size_bytes or 0 for upload in self.uploads if not upload.cached)
+
+    @property
+    def unknown_sizes(self) -> int:
+        """The number of uploads whose size is unknown."""
+        return sum(upload.size_bytes is None for upload in self.uploads)
+
+    def estimated_seconds(self, download_mbit: float, upload_mbit: float) -> float:
+        """Estimate the duration of the transfers.
+
+        Downloads and uploads overlap, so the slower of both determines the duration.
+
+        Args:
+            download_mbit: The download bandwidth in Mbit/s
+            upload_mbit: The upload bandwidth in Mbit/s
+
+        Returns:
+            The estimated duration in seconds
+        """
+        download_seconds = self.download_bytes * BITS_PER_BYTE / (download_mbit * 1_000_000)
+        upload_seconds = self.upload_bytes * BITS_PER_BYTE / (upload_mbit * 1_000_000)
+        return max(download_seconds, upload_seconds)
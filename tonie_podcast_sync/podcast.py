@@ -2,30 +2,44 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import random
+import re
 import unicodedata
+from collections import deque
+from contextlib import closing
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING
 
 import feedparser
 
-from tonie_podcast_sync.constants import MAXIMUM_TONIE_MINUTES
+from tonie_podcast_sync.constants import MAXIMUM_TONIE_MINUTES, NORMALIZATION_CACHE_SIZE, STREAM_REPLACEMENT_MINUTES
+from tonie_podcast_sync.feed_stream import UnsupportedFeedError, open_feed_stream
+from tonie_podcast_sync.run_report import StageTimings
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
     from pathlib import Path
     from time import struct_time
 
+    from tonie_podcast_sync.feed_cache import CachedFeed, FeedCache
+    from tonie_podcast_sync.feed_stream import FeedStream
+
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 MAX_EPISODE_TITLES_IN_WARNING = 3
+HTTP_NOT_MODIFIED = 304
 
 
+@functools.lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def normalize_unicode_caseless(s: str) -> str:
     """Converts string to lower-case with unambiguous unicode representation of special characters.
 
+    The results are memoized, as the same titles are normalized repeatedly during a sync.
+
     Args:
             s: The string to convert
 
@@ -54,6 +68,56 @@ def compare_unicode_caseless(s1: str, s2: str) -> bool:
     return normalize_unicode_caseless(s1) == normalize_unicode_caseless(s2)
 
 
+class TitleMatcher:
+    """Finds any of a list of strings in episode titles with a single scan per title.
+
+    The strings are compiled into one regular expression shaped like a prefix tree, so strings
+    sharing a prefix are only compared once. Strings that contain another string of the list
+    are dropped, as they cannot change the result. Like the `in` operator, matching is partial
+    and an empty string matches every title.
+    """
+
+    def __init__(self, strings: Iterable[str]) -> None:
+        """Compile the matcher.
+
+        Args:
+            strings: The strings to find, normalized with normalize_unicode_caseless
+        """
+        trie: dict = {}
+        for string in strings:
+            node = trie
+            for char in string:
+                node = node.setdefault(char, {})
+            node[None] = {}
+        self._regex = re.compile(_trie_pattern(trie)) if trie else None
+
+    def __bool__(self) -> bool:
+        """Return True if the matcher has any strings to find."""
+        return self._regex is not None
+
+    def matches(self, normalized_title: str) -> bool:
+        """Check if the title contains any of the strings.
+
+        Args:
+            normalized_title: The title, normalized with normalize_unicode_caseless
+
+        Returns:
+            True if at least one of the strings is part of the title, False otherwise
+        """
+        return self._regex is not None and self._regex.search(normalized_title) is not None
+
+
+def _trie_pattern(node: dict) -> str:
+    """Convert a prefix tree of strings into a regular expression matching any of them."""
+    if None in node:
+        # A string ends here, longer strings starting with it cannot add a match
+        return ""
+    alternatives = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items())]
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return f"(?:{'|'.join(alternatives)})"
+
+
 class EpisodeSorting(str, Enum):
     """Enum to select the sorting method for podcast episodes."""
 
@@ -62,6 +126,99 @@ class EpisodeSorting(str, Enum):
     RANDOM = "random"
 
 
+class EpisodeSelection(str, Enum):
+    """Enum to select how episodes are packed into the maximum duration of a tonie."""
+
+    GREEDY = "greedy"
+    FILL = "fill"
+    BEST_FIT = "best_fit"
+
+
+@dataclass(frozen=True)
+class FeedEntry:
+    """The fields of a feed item needed to build an episode, parsed once per item."""
+
+    guid: str
+    title: str
+    normalized_title: str
+    published: str
+    published_parsed: struct_time | None
+    duration_str: str
+    duration_sec: int
+    url: str
+    length: int | None
+
+    @classmethod
+    def from_item(cls, item: dict) -> FeedEntry:
+        """Parse a feedparser item.
+
+        Args:
+            item: The feed item dictionary
+
+        Returns:
+            The parsed entry
+        """
+        url, length = _enclosure(item)
+        duration_str = item.get("itunes_duration", "")
+        return cls(
+            guid=item["id"],
+            title=item["title"],
+            normalized_title=normalize_unicode_caseless(item["title"]),
+            published=item["published"],
+            published_parsed=item.get("published_parsed"),
+            duration_str=duration_str,
+            duration_sec=Episode._parse_duration(duration_str),  # noqa: SLF001
+            url=url,
+            length=length,
+        )
+
+    def as_item(self) -> feedparser.FeedParserDict:
+        """Rebuild a feedparser item holding the fields of the entry.
+
+        Returns:
+            A feed item that can be used in place of the original one
+        """
+        item = feedparser.FeedParserDict(
+            id=self.guid,
+            title=self.title,
+            published=self.published,
+            published_parsed=self.published_parsed,
+            links=[_enclosure_link(self.url, self.length)],
+        )
+        if self.duration_str:
+            item["itunes_duration"] = self.duration_str
+        return item
+
+
+@dataclass(frozen=True)
+class ParsedFeed:
+    """The title and parsed entries of a fetched feed, shared by all podcasts of the same feed URL.
+
+    The feed is not complete if reading it stopped early, see the streaming option of Podcast.
+    """
+
+    title: str
+    entries: list[FeedEntry]
+    complete: bool = True
+
+
+def _enclosure(item: dict) -> tuple[str, int | None]:
+    """Return the audio URL and its announced length in bytes of a feed item."""
+    for link in item.get("links", []):
+        if link.get("rel") == "enclosure":
+            length = link.get("length")
+            return link["href"], int(length) if isinstance(length, str) and length.isdigit() else None
+    return item["id"], None
+
+
+def _enclosure_link(url: str, length: int | None) -> dict:
+    """Build the enclosure link of a feed item."""
+    link = {"rel": "enclosure", "href": url}
+    if length is not None:
+        link["length"] = str(length)
+    return link
+
+
 class Podcast:
     """Representation of a podcast feed."""
 
@@ -74,6 +231,12 @@ class Podcast:
         episode_max_duration_sec: int = MAXIMUM_TONIE_MINUTES * 60,
         excluded_title_strings: list[str] | None = None,
         pinned_episode_names: list[str] | None = None,
+        *,
+        feed_cache: FeedCache | None = None,
+        keep_raw: bool = False,
+        streaming: bool = False,
+        parsed_feed: ParsedFeed | None = None,
+        episode_selection: EpisodeSelection = EpisodeSelection.GREEDY,
     ) -> None:
         """Initialize the podcast feed and fetch all episodes.
 
@@ -88,7 +251,21 @@ class Podcast:
                 (case-insensitive matching)
             pinned_episode_names: List of episode names that will always be prioritized
                 in episode sorting. (parital, case-insensitive matching)
+            feed_cache: Cache for conditional requests. If given, the feed is only downloaded and
+                parsed again if the server reports a change since the last fetch.
+            keep_raw: Keep the parsed feed in feed and the feed item of each episode in Episode.raw.
+                Defaults to False, i.e. only the fields needed to sync the episodes are kept.
+            streaming: Parse RSS feeds item by item while they are downloaded instead of parsing the
+                whole document at once. With newest-first sorting, greedy selection and no pinned episodes,
+                reading stops once the episodes read so far fill a tonie and leave enough replacements
+                for failed downloads. Defaults to False.
+            parsed_feed: The feed of url, already fetched for another podcast, see Podcast.parsed_feed.
+                It is used instead of fetching the feed again, unless it is incomplete or keep_raw is set.
+            episode_selection: How the episodes will be packed into a tonie. A streamed feed is read
+                completely unless the selection is GREEDY, as the other selections use older episodes
+                to fill the remaining time. Defaults to GREEDY.
         """
+        self.timings = StageTimings()
         self.volume_adjustment = volume_adjustment
         self.episode_min_duration_sec = episode_min_duration_sec
         self.episode_max_duration_sec = episode_max_duration_sec
@@ -98,15 +275,187 @@ class Podcast:
         self.pinned_episode_names = (
             [normalize_unicode_caseless(s) for s in pinned_episode_names] if pinned_episode_names else []
         )
+        self._excluded_titles = TitleMatcher(self.excluded_title_strings)
+        self._pinned_titles = TitleMatcher(self.pinned_episode_names)
 
         self.epList: list[Episode] = []
         self.epSorting = episode_sorting
+        self.episode_selection = episode_selection
+
+        feed = None
+        if parsed_feed is None or not parsed_feed.complete or keep_raw:
+            fetch_feed = self._stream_feed if streaming else self._fetch_feed
+            feed, parsed_feed = fetch_feed(url, feed_cache, keep_raw=keep_raw)
+        self.parsed_feed = parsed_feed
+        self.title = parsed_feed.title
+        self.entries = parsed_feed.entries
+        self.feed = feed if keep_raw else None
+        with self.timings.measure("filter_sort") as details:
+            self.refresh_feed()
+            details["episodes"] = len(self.epList)
+
+    def _fetch_feed(
+        self, url: str, feed_cache: FeedCache | None, *, keep_raw: bool = False
+    ) -> tuple[feedparser.FeedParserDict, ParsedFeed]:
+        """Fetch and parse the podcast feed, using conditional requests if a feed cache is given.
+
+        Args:
+            url: The URL of the podcast feed
+            feed_cache: The cache holding validators and the parsed entries of earlier fetches
+            keep_raw: Rebuild the feed items from the cached entries if the feed has not changed
+
+        Returns:
+            The parsed feed, rebuilt from the cache if the feed has not changed, and its title and parsed entries
+        """
+        cached_feed = self._load_cached_feed(url, feed_cache)
+        # feedparser downloads and parses the document in one call
+        with self.timings.measure("feed_fetch", url=url) as details:
+            if cached_feed is None:
+                feed = feedparser.parse(url)
+            else:
+                feed = feedparser.parse(url, etag=cached_feed.etag, modified=cached_feed.modified)
+            details["not_modified"] = cached_feed is not None and feed.get("status") == HTTP_NOT_MODIFIED
+            if not details["not_modified"] and feed.bozo:
+                raise feed.bozo_exception
+        if details["not_modified"]:
+            return self._reuse_cached_feed(cached_feed, keep_raw=keep_raw)
+
+        with self.timings.measure("feed_parse", entries=len(feed.entries)):
+            entries = [FeedEntry.from_item(item) for item in feed.entries]
+        if feed_cache:
+            feed_cache.store(url, feed.get("etag"), feed.get("modified"), feed.feed.title, entries)
+        return feed, ParsedFeed(feed.feed.title, entries)
+
+    def _stream_feed(
+        self, url: str, feed_cache: FeedCache | None, *, keep_raw: bool = False
+    ) -> tuple[feedparser.FeedParserDict, ParsedFeed]:
+        """Fetch and parse an RSS feed item by item, see _fetch_feed.
+
+        Feeds that cannot be streamed, e.g. Atom feeds, are fetched and parsed by feedparser instead.
+        A feed that was read only partially is cached with its validators as well, so it is only read
+        again once it changes.
+        """
+        cached_feed = self._load_cached_feed(url, feed_cache)
+        try:
+            # Items are parsed while they are downloaded, fetching only covers the response up to the feed title
+            with self.timings.measure("feed_fetch", url=url, streaming=True) as details:
+                stream = open_feed_stream(
+                    url,
+                    etag=cached_feed.etag if cached_feed else None,
+                    modified=cached_feed.modified if cached_feed else None,
+                )
+                details["not_modified"] = stream is None
+        except UnsupportedFeedError as e:
+            log.info("Parsing %s as a whole, it cannot be streamed: %s", url, e)
+            return self._fetch_feed(url, feed_cache, keep_raw=keep_raw)
+        if stream is None:
+            return self._reuse_cached_feed(cached_feed, keep_raw=keep_raw)
+
+        with self.timings.measure("feed_parse", streaming=True) as details, closing(stream):
+            items, entries, complete = self._read_stream(stream)
+            details["entries"] = len(entries)
+        if feed_cache:
+            feed_cache.store(url, stream.etag, stream.modified, stream.title, entries, complete=complete)
+        feed = feedparser.FeedParserDict(
+            feed=feedparser.FeedParserDict(title=stream.title), entries=items if keep_raw else [], bozo=False
+        )
+        return feed, ParsedFeed(stream.title, entries, complete=complete)
 
-        self.feed = feedparser.parse(url)
-        if self.feed.bozo:
-            raise self.feed.bozo_exception
-        self.title = self.feed.feed.title
-        self.refresh_feed()
+    def _read_stream(self, stream: FeedStream) -> tuple[list[dict], list[FeedEntry], bool]:
+        """Read the items of a feed stream, stopping early if the remaining items cannot be synced.
+
+        Args:
+            stream: The opened feed
+
+        Returns:
+            The items read, their parsed entries and whether all items of the feed were read
+        """
+        items = []
+        entries = []
+
+        def read() -> Iterator[FeedEntry]:
+            for item in stream:
+                items.append(item)
+                entries.append(FeedEntry.from_item(item))
+                yield entries[-1]
+
+        reader = read()
+        needed = self._count_needed_entries(reader)
+        if needed is not None:
+            log.info("%s: read %d items, enough to fill a tonie and replace failed downloads", stream.title, needed)
+            return items, entries, False
+        deque(reader, maxlen=0)
+        return items, entries, True
+
+    def _count_needed_entries(self, entries: Iterable[FeedEntry]) -> int | None:
+        """Count the entries of a feed that are enough to sync the podcast, reading them only as far as needed.
+
+        Only the first entries are needed if the episodes are sorted newest first and selected greedily,
+        no episodes are pinned, the entries are in newest-first order and the episodes among them that
+        pass the filters fill a tonie. Greedy selection never skips an episode to fill the remaining
+        time, but failed downloads are replaced by later episodes, so another STREAM_REPLACEMENT_MINUTES
+        of episodes are needed beyond those that fill a tonie.
+
+        Args:
+            entries: The entries of the feed in feed order
+
+        Returns:
+            The number of first entries that are enough, or None if all entries may be needed
+        """
+        if (
+            self.epSorting != EpisodeSorting.BY_DATE_NEWEST_FIRST
+            or self.episode_selection != EpisodeSelection.GREEDY
+            or self._pinned_titles
+        ):
+            return None
+        needed_seconds = (MAXIMUM_TONIE_MINUTES + STREAM_REPLACEMENT_MINUTES) * 60
+        included_seconds = 0
+        previous_published = None
+        for count, entry in enumerate(entries, start=1):
+            published = entry.published_parsed
+            if published is None or (previous_published is not None and published > previous_published):
+                log.debug("Feed is not sorted newest first, all of its entries are needed")
+                return None
+            previous_published = published
+            if (
+                self.episode_min_duration_sec <= entry.duration_sec <= self.episode_max_duration_sec
+                and not self._excluded_titles.matches(entry.normalized_title)
+            ):
+                included_seconds += entry.duration_sec
+            if included_seconds >= needed_seconds:
+                return count
+        return None
+
+    def _load_cached_feed(self, url: str, feed_cache: FeedCache | None) -> CachedFeed | None:
+        """Load the cached feed of a URL, if its entries are enough to sync the podcast.
+
+        The entries of a partially read feed are not enough if e.g. a podcast with another episode
+        selection read the feed before, so the feed is requested without validators and read again.
+
+        Args:
+            url: The URL of the podcast feed
+            feed_cache: The cache holding validators and the parsed entries of earlier fetches
+
+        Returns:
+            The cached feed, or None if the feed is not cached or its entries are not enough
+        """
+        cached_feed = feed_cache.load(url) if feed_cache else None
+        if cached_feed is None or cached_feed.complete or self._count_needed_entries(cached_feed.entries) is not None:
+            return cached_feed
+        log.info("%s: cached entries are not enough for this podcast, reading the feed again", cached_feed.title)
+        return None
+
+    def _reuse_cached_feed(
+        self, cached_feed: CachedFeed, *, keep_raw: bool = False
+    ) -> tuple[feedparser.FeedParserDict, ParsedFeed]:
+        """Build the feed from the cached entries of an earlier fetch, after the server answered 304 Not Modified."""
+        log.info("%s: feed not modified since last fetch, reusing cached episodes", cached_feed.title)
+        feed = feedparser.FeedParserDict(
+            feed=feedparser.FeedParserDict(title=cached_feed.title),
+            entries=[entry.as_item() for entry in cached_feed.entries] if keep_raw else [],
+            bozo=False,
+        )
+        return feed, ParsedFeed(cached_feed.title, cached_feed.entries, complete=cached_feed.complete)
 
     def _should_include_episode(self, episode: Episode) -> bool:
         """Check if an episode should be included based on filters.
@@ -139,10 +488,7 @@ class Podcast:
                 )
                 return False
 
-            if self.excluded_title_strings and any(
-                excluded_string in normalize_unicode_caseless(episode.title)
-                for excluded_string in self.excluded_title_strings
-            ):
+            if self._excluded_titles.matches(episode.normalized_title):
                 log.info(
                     "%s: skipping episode '%s' as title contains excluded string",
                     self.title,
@@ -161,26 +507,18 @@ class Podcast:
         Returns:
             True if episode should be pinned, False otherwise
         """
-        return self.pinned_episode_names and any(
-            pinned_name in normalize_unicode_caseless(episode.title) for pinned_name in self.pinned_episode_names
-        )
+        return self._pinned_titles.matches(episode.normalized_title)
 
     def refresh_feed(self) -> None:
         """Refresh the podcast feed and populate the episodes list."""
         episodes_without_duration = []
 
-        for item in self.feed.entries:
-            url = self._extract_episode_url(item)
+        items = self.feed.entries if self.feed is not None else [None] * len(self.entries)
+        for entry, item in zip(self.entries, items, strict=True):
+            if not entry.duration_str.strip():
+                episodes_without_duration.append(entry.title)
 
-            if self._is_missing_duration(item):
-                episodes_without_duration.append(item.title)
-
-            episode = Episode(
-                podcast=self.title,
-                raw=item,
-                url=url,
-                volume_adjustment=self.volume_adjustment,
-            )
+            episode = Episode.from_entry(self.title, entry, volume_adjustment=self.volume_adjustment, raw=item)
             episode.pinned = self._should_pin_episode(episode)
 
             if self._should_include_episode(episode):
@@ -190,33 +528,6 @@ class Podcast:
         self.sort_episodes()
         log.info("%s: feed refreshed, %d episodes found", self.title, len(self.epList))
 
-    def _extract_episode_url(self, item: dict) -> str:
-        """Extract the episode audio URL from a feed item.
-
-        Args:
-            item: The feed item dictionary
-
-        Returns:
-            The URL to the audio file
-        """
-        url = item.id
-        for link in item.links:
-            if link["rel"] == "enclosure":
-                url = link["href"]
-                break
-        return url
-
-    def _is_missing_duration(self, item: dict) -> bool:
-        """Check if a feed item is missing duration information.
-
-        Args:
-            item: The feed item dictionary
-
-        Returns:
-            True if duration is missing or empty, False otherwise
-        """
-        return "itunes_duration" not in item or not item.get("itunes_duration", "").strip()
-
     def _warn_about_missing_durations(self, episodes_without_duration: list[str]) -> None:
         """Log a warning if episodes are missing duration information.
 
@@ -253,31 +564,109 @@ class Podcast:
                 self.epList = pinned_episoded + sorting_episodes
 
 
-@dataclass
+@dataclass(init=False, slots=True)
 class Episode:
-    """A dataclass representing a podcast episode."""
+    """A podcast episode, holding only the fields needed to sync it.
+
+    The feed item an episode is created from is dropped unless keep_raw is set, as it holds
+    show notes, summaries and links that make up most of the memory of a large feed.
+    """
 
     podcast: str
-    raw: dict
-    title: str = field(init=False)
-    published: str = field(init=False)
-    published_parsed: struct_time = field(init=False)
-    url: str = ""
-    guid: str = field(init=False)
-    fpath: Path = field(init=False, compare=False)
-    duration_str: str = field(init=False)
-    duration_sec: int = field(init=False)
-    volume_adjustment: int = 0
-    pinned: bool = False
-
-    def __post_init__(self) -> None:
-        """Initialize derived fields from raw feed data."""
-        self.title = self.raw["title"]
-        self.published = self.raw["published"]
-        self.published_parsed = self.raw["published_parsed"]
-        self.guid = self.raw["id"]
-        self.duration_str = self.raw.get("itunes_duration", "0")
+    title: str
+    normalized_title: str = field(compare=False, repr=False)
+    published: str
+    published_parsed: struct_time | None
+    url: str
+    length: int | None = field(compare=False, repr=False)
+    guid: str
+    fpath: Path = field(compare=False)
+    duration_str: str
+    duration_sec: int
+    volume_adjustment: int
+    pinned: bool
+    _raw: dict | None = field(compare=False, repr=False)
+
+    def __init__(  # noqa: PLR0913
+        self,
+        podcast: str,
+        raw: dict,
+        url: str = "",
+        volume_adjustment: int = 0,
+        *,
+        pinned: bool = False,
+        keep_raw: bool = False,
+    ) -> None:
+        """Initialize the episode from a feed item.
+
+        Args:
+            podcast: The title of the podcast
+            raw: The feed item of the episode
+            url: The URL of the audio file
+            volume_adjustment: Volume adjustment in dB (0 = no adjustment)
+            pinned: Whether the episode is prioritized in sorting
+            keep_raw: Keep the feed item, see raw. Defaults to False.
+        """
+        self.podcast = podcast
+        self.title = raw["title"]
+        self.normalized_title = normalize_unicode_caseless(self.title)
+        self.published = raw["published"]
+        self.published_parsed = raw["published_parsed"]
+        self.url = url
+        self.length = _enclosure(raw)[1]
+        self.guid = raw["id"]
+        self.duration_str = raw.get("itunes_duration", "0")
         self.duration_sec = self._parse_duration(self.duration_str)
+        self.volume_adjustment = volume_adjustment
+        self.pinned = pinned
+        self._raw = raw if keep_raw else None
+
+    @classmethod
+    def from_entry(cls, podcast: str, entry: FeedEntry, volume_adjustment: int = 0, raw: dict | None = None) -> Episode:
+        """Create an episode from an already parsed feed entry.
+
+        Args:
+            podcast: The title of the podcast
+            entry: The parsed feed entry
+            volume_adjustment: Volume adjustment in dB (0 = no adjustment)
+            raw: The feed item to keep, see raw. Defaults to None.
+
+        Returns:
+            The episode
+        """
+        episode = cls.__new__(cls)
+        episode.podcast = podcast
+        episode.title = entry.title
+        episode.normalized_title = entry.normalized_title
+        episode.published = entry.published
+        episode.published_parsed = entry.published_parsed
+        episode.url = entry.url
+        episode.length = entry.length
+        episode.guid = entry.guid
+        episode.duration_str = entry.duration_str or "0"
+        episode.duration_sec = entry.duration_sec
+        episode.volume_adjustment = volume_adjustment
+        episode.pinned = False
+        episode._raw = raw  # noqa: SLF001
+        return episode
+
+    @property
+    def raw(self) -> dict:
+        """The feed item of the episode.
+
+        Only episodes created with keep_raw hold the original feed item. For all other episodes
+        a feed item with the fields of the episode is rebuilt on each access.
+        """
+        if self._raw is not None:
+            return self._raw
+        return {
+            "id": self.guid,
+            "title": self.title,
+            "published": self.published,
+            "published_parsed": self.published_parsed,
+            "itunes_duration": self.duration_str,
+            "links": [_enclosure_link(self.url, self.length)],
+        }
 
     @staticmethod
     def _parse_duration(duration_str: str) -> int:
@@ -0,0 +1,154 @@
+"""Retry policy shared by episode downloads and uploads."""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from requests.exceptions import InvalidSchema, InvalidURL, MissingSchema
+
+from tonie_podcast_sync.constants import (
+    RETRY_BUDGET_SECONDS,
+    RETRY_DELAY_SECONDS,
+    RETRY_JITTER,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY_SECONDS,
+)
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# Client errors that may succeed when the request is repeated, all other 4xx responses are fatal
+RETRYABLE_CLIENT_ERRORS = frozenset({408, 425, 429})
+RETRY_AFTER_STATUS_CODES = frozenset({429, 503})
+# Errors of requests that can never succeed, no matter how often they are sent
+INVALID_REQUEST_ERRORS = (InvalidSchema, InvalidURL, MissingSchema)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long to wait before a failed request is repeated.
+
+    The delay doubles with every attempt, starting at base_delay and limited to max_delay.
+    A random share of up to jitter of each delay is dropped, so concurrent requests that
+    failed at the same time do not retry at the same time. A Retry-After header of a 429 or 503
+    response is honored. No retry is made once the total time budget would be exceeded.
+    """
+
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_DELAY_SECONDS
+    max_delay: float = RETRY_MAX_DELAY_SECONDS
+    total_budget: float = RETRY_BUDGET_SECONDS
+    jitter: float = RETRY_JITTER
+    fatal_status_codes: frozenset[int] = field(default_factory=frozenset)
+
+    def start(self) -> RetryAttempts:
+        """Start tracking the attempts of a new request.
+
+        Returns:
+            The attempt tracker of the request
+        """
+        return RetryAttempts(self)
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Check if a failed request may succeed when it is repeated.
+
+        Server errors, rate limiting, timeouts and connection errors are retryable. Other client
+        errors, e.g. 404 Not Found, invalid URLs and the configured fatal status codes are not.
+
+        Args:
+            error: The exception raised by the request
+
+        Returns:
+            True if the request should be retried, False otherwise
+        """
+        status_code = _status_code(error)
+        if status_code is None:
+            return not isinstance(error, INVALID_REQUEST_ERRORS)
+        if status_code in self.fatal_status_codes:
+            return False
+        return status_code >= 500 or status_code in RETRYABLE_CLIENT_ERRORS  # noqa: PLR2004
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before the next attempt, without Retry-After.
+
+        Args:
+            attempt: The number of the failed attempt, starting at 1
+
+        Returns:
+            The delay in seconds
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())  # noqa: S311
+
+
+class RetryAttempts:
+    """Tracks the attempts of a single request against its retry policy."""
+
+    def __init__(self, policy: RetryPolicy) -> None:
+        """Initialize the tracker.
+
+        Args:
+            policy: The retry policy to apply
+        """
+        self.policy = policy
+        self.attempts = 0
+        self._deadline = time.monotonic() + policy.total_budget
+
+    def next_delay(self, error: Exception) -> float | None:
+        """Register a failed attempt and decide whether to retry it.
+
+        Args:
+            error: The exception raised by the failed attempt
+
+        Returns:
+            The seconds to wait before the next attempt, or None if the request should not be retried
+        """
+        self.attempts += 1
+        if self.attempts >= self.policy.max_attempts:
+            return None
+        if not self.policy.is_retryable(error):
+            log.debug("Not retrying after fatal error: %s", error)
+            return None
+
+        delay = self.policy.backoff(self.attempts)
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        if time.monotonic() + delay > self._deadline:
+            log.debug("Not retrying, waiting %.1f seconds would exceed the retry budget", delay)
+            return None
+        return delay
+
+
+def _status_code(error: Exception) -> int | None:
+    """Return the HTTP error status code of a failed request, if the server answered with an error."""
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None)
+    # Errors raised while reading a successful response, e.g. a broken connection, have no error status
+    return status_code if isinstance(status_code, int) and status_code >= 400 else None  # noqa: PLR2004
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Return the delay requested by the Retry-After header of a 429 or 503 response."""
+    if _status_code(error) not in RETRY_AFTER_STATUS_CODES:
+        return None
+    value = error.response.headers.get("Retry-After")
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        log.debug("Ignoring invalid Retry-After header: %s", value)
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
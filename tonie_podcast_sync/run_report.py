@@ -0,0 +1,181 @@
+"""Timings of the stages of a sync run, collected into a machine-readable report."""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+# Path segments naming an endpoint, e.g. v2 or creativetonies, all others are IDs
+_ENDPOINT_SEGMENT = re.compile(r"[a-z]+[0-9]*")
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    """The duration of one stage of a sync, e.g. the download of an episode.
+
+    The details describe what the stage worked on. If they contain the number of bytes
+    transferred, the report also shows the throughput of the stage.
+    """
+
+    stage: str
+    seconds: float
+    details: dict = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        """Return the timing as a JSON-serializable dictionary."""
+        result = {"stage": self.stage, "seconds": round(self.seconds, 3), **self.details}
+        transferred = self.details.get("bytes")
+        if transferred and self.seconds > 0:
+            result["bytes_per_second"] = round(transferred / self.seconds)
+        return result
+
+
+class StageTimings:
+    """The stage timings of a podcast or a tonie, recorded from any thread."""
+
+    def __init__(self) -> None:
+        """Start without any recorded stages."""
+        self._timings: list[StageTiming] = []
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[StageTiming]:
+        """Iterate over the recorded stages in the order they finished."""
+        with self._lock:
+            return iter(list(self._timings))
+
+    def record(self, stage: str, seconds: float, **details: object) -> None:
+        """Record the duration of a stage.
+
+        Args:
+            stage: The name of the stage
+            seconds: The duration of the stage in seconds
+            **details: What the stage worked on, e.g. the title of an episode
+        """
+        with self._lock:
+            self._timings.append(StageTiming(stage, seconds, details))
+
+    def extend(self, timings: StageTimings) -> None:
+        """Add all stages recorded by other timings, e.g. the feed stages of a podcast.
+
+        Args:
+            timings: The timings to add
+        """
+        for timing in timings:
+            self.record(timing.stage, timing.seconds, **timing.details)
+
+    @contextmanager
+    def measure(self, stage: str, **details: object) -> Iterator[dict]:
+        """Measure the duration of a stage, also if it fails.
+
+        The error of a failed stage is added to its details.
+
+        Args:
+            stage: The name of the stage
+            **details: What the stage works on, e.g. the title of an episode
+
+        Yields:
+            The details of the stage, which may be extended until the stage ends
+        """
+        start = time.perf_counter()
+        try:
+            yield details
+        except Exception as e:
+            details["error"] = str(e) or type(e).__name__
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - start, **details)
+
+    def as_dict(self) -> dict:
+        """Return all stages and the total duration per stage as a JSON-serializable dictionary."""
+        timings = list(self)
+        totals: dict[str, float] = {}
+        for timing in timings:
+            totals[timing.stage] = totals.get(timing.stage, 0) + timing.seconds
+        return {
+            "stages": [timing.as_dict() for timing in timings],
+            "totals": {stage: round(seconds, 3) for stage, seconds in totals.items()},
+        }
+
+
+class RunReport:
+    """The stage timings of all tonies synced in one run."""
+
+    def __init__(self) -> None:
+        """Start the report of a run that begins now."""
+        self.started = datetime.now(tz=timezone.utc)
+        self._start = time.perf_counter()
+        self._tonies: dict[str, StageTimings] = {}
+        self._api_calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def tonie(self, tonie_id: str) -> StageTimings:
+        """Return the stage timings of a tonie, creating them on first use.
+
+        Args:
+            tonie_id: The ID of the tonie
+
+        Returns:
+            The stage timings of the tonie
+        """
+        with self._lock:
+            return self._tonies.setdefault(tonie_id, StageTimings())
+
+    def tonies(self) -> dict[str, StageTimings]:
+        """Return the stage timings of all tonies by tonie ID."""
+        with self._lock:
+            return dict(self._tonies)
+
+    def count_api_call(self, method: str, url: str) -> None:
+        """Count a request to the Tonie Cloud API.
+
+        The IDs in the URL are replaced by {id}, so the calls are counted per endpoint.
+
+        Args:
+            method: The HTTP method of the request
+            url: The URL of the request
+        """
+        segments = urlsplit(url).path.strip("/").split("/")
+        path = "/".join(segment if _ENDPOINT_SEGMENT.fullmatch(segment) else "{id}" for segment in segments)
+        endpoint = f"{method} /{path}"
+        with self._lock:
+            self._api_calls[endpoint] = self._api_calls.get(endpoint, 0) + 1
+
+    def api_calls(self) -> dict[str, int]:
+        """Return the number of Tonie Cloud API requests by endpoint."""
+        with self._lock:
+            return dict(sorted(self._api_calls.items()))
+
+    @property
+    def seconds(self) -> float:
+        """The duration of the run so far."""
+        return time.perf_counter() - self._start
+
+    def as_dict(self) -> dict:
+        """Return the report as a JSON-serializable dictionary."""
+        tonies = self.tonies()
+        return {
+            "started": self.started.isoformat(),
+            "seconds": round(self.seconds, 3),
+            "api_calls": self.api_calls(),
+            "tonies": {tonie_id: timings.as_dict() for tonie_id, timings in tonies.items()},
+        }
+
+    def write(self, path: Path) -> None:
+        """Write the report as JSON.
+
+        Args:
+            path: The file to write the report to, it is replaced if it exists
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.as_dict(), indent=2), encoding="utf-8")
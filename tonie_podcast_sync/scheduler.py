@@ -0,0 +1,134 @@
+"""The poll schedule of the feeds watched by the daemon, adapted to how often each feed publishes."""
+
+from __future__ import annotations
+
+import calendar
+import statistics
+import time
+from dataclasses import dataclass, field
+from itertools import pairwise
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from tonie_podcast_sync.podcast import FeedEntry
+
+# Number of the latest episodes whose publication dates determine the poll interval of a feed
+PUBLICATION_HISTORY = 10
+# How often a feed is polled in the median time between two of its episodes
+POLLS_PER_EPISODE = 4
+
+
+def poll_interval(entries: Iterable[FeedEntry], minimum: float, maximum: float) -> float:
+    """Derive how often to poll a feed from how often it publishes.
+
+    The interval is a fraction of the median gap between the latest episodes, so a new episode of a daily
+    feed is noticed within hours, while a monthly feed is only polled a few times a week.
+
+    Args:
+        entries: The entries of the feed
+        minimum: The shortest interval in seconds
+        maximum: The longest interval in seconds, also used if the publication dates are unknown
+
+    Returns:
+        The interval in seconds
+    """
+    published = sorted(
+        (calendar.timegm(entry.published_parsed) for entry in entries if entry.published_parsed), reverse=True
+    )[:PUBLICATION_HISTORY]
+    gaps = [newer - older for newer, older in pairwise(published) if newer > older]
+    if not gaps:
+        return maximum
+    return min(max(statistics.median(gaps) / POLLS_PER_EPISODE, minimum), maximum)
+
+
+@dataclass
+class _WatchedFeed:
+    """The tonies of a feed, when to poll it next and what it contained at the last poll."""
+
+    tonie_ids: list[str] = field(default_factory=list)
+    next_poll: float = 0.0
+    fingerprint: int | None = None
+
+
+class FeedScheduler:
+    """Decides when to poll each feed and whether a feed changed since its last poll.
+
+    All feeds are due right away and their first poll counts as a change, so every tonie is synced once
+    when the daemon starts.
+    """
+
+    def __init__(
+        self,
+        feed_urls: dict[str, str],
+        minimum: float,
+        maximum: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Start watching the feeds of the tonies.
+
+        Args:
+            feed_urls: The feed URL of each tonie by tonie ID
+            minimum: The shortest poll interval of a feed in seconds, also used to retry failed feeds
+            maximum: The longest poll interval of a feed in seconds
+            clock: The monotonic clock the schedule is based on
+        """
+        self._minimum = minimum
+        self._maximum = max(minimum, maximum)
+        self._clock = clock
+        self._feeds: dict[str, _WatchedFeed] = {}
+        for tonie_id, url in feed_urls.items():
+            self._feeds.setdefault(url, _WatchedFeed()).tonie_ids.append(tonie_id)
+
+    def due_feeds(self) -> list[str]:
+        """Return the URLs of the feeds that should be polled now."""
+        now = self._clock()
+        return [url for url, feed in self._feeds.items() if feed.next_poll <= now]
+
+    def tonies_of(self, url: str) -> list[str]:
+        """Return the IDs of the tonies syncing the given feed.
+
+        Args:
+            url: The URL of the feed
+
+        Returns:
+            The tonie IDs in the order of the settings
+        """
+        return list(self._feeds[url].tonie_ids)
+
+    def update(self, url: str, entries: list[FeedEntry]) -> bool:
+        """Remember the entries of a polled feed and schedule its next poll.
+
+        Args:
+            url: The URL of the feed
+            entries: The entries of the feed
+
+        Returns:
+            True if the entries changed since the last poll or the feed was never polled, False otherwise
+        """
+        feed = self._feeds[url]
+        fingerprint = hash(tuple(entries))
+        changed = fingerprint != feed.fingerprint
+        feed.fingerprint = fingerprint
+        feed.next_poll = self._clock() + poll_interval(entries, self._minimum, self._maximum)
+        return changed
+
+    def retry(self, url: str) -> None:
+        """Poll a feed again after the minimum interval, e.g. because fetching or syncing it failed.
+
+        The feed is forgotten, so the next poll counts as a change even if the entries are the same.
+
+        Args:
+            url: The URL of the feed
+        """
+        feed = self._feeds[url]
+        feed.fingerprint = None
+        feed.next_poll = self._clock() + self._minimum
+
+    def seconds_until_next_poll(self) -> float:
+        """Return how long to wait until the next feed is due, 0 if a feed is already due."""
+        if not self._feeds:
+            return self._maximum
+        next_poll = min(feed.next_poll for feed in self._feeds.values())
+        return max(0.0, next_poll - self._clock())
@@ -2,33 +2,49 @@
 
 import logging
 import os
-import platform
 import subprocess
 import tempfile
+import threading
 import time
 from collections import deque
-from io import BytesIO
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 import requests
 from pathvalidate import sanitize_filename, sanitize_filepath
-from pydub import AudioSegment
-from requests.exceptions import HTTPError, RequestException
+from requests.exceptions import RequestException
 from rich.console import Console
 from rich.progress import track
 from rich.table import Table
 from tonie_api.api import TonieAPI
-from tonie_api.models import CreativeTonie
+from tonie_api.models import Chapter, CreativeTonie
 
 from tonie_podcast_sync.constants import (
-    DOWNLOAD_RETRY_COUNT,
+    DEFAULT_DOWNLOAD_WORKERS,
+    DEFAULT_UPLOAD_WORKERS,
     MAX_SHUFFLE_ATTEMPTS,
     MAXIMUM_TONIE_MINUTES,
-    RETRY_DELAY_SECONDS,
-    UPLOAD_RETRY_COUNT,
+    PACKING_CANDIDATES,
+    PACKING_RESOLUTION_SECONDS,
+    PIPELINE_BUFFER_SIZE,
 )
 from tonie_podcast_sync.container_detection import is_running_in_container
-from tonie_podcast_sync.podcast import Episode, EpisodeSorting, Podcast, compare_unicode_caseless
+from tonie_podcast_sync.episode_cache import EpisodeCache, link_or_copy
+from tonie_podcast_sync.ffmpeg import ffmpeg_executable, probe_ffmpeg
+from tonie_podcast_sync.pipeline import pipelined
+from tonie_podcast_sync.plan import PlannedUpload, SyncPlan
+from tonie_podcast_sync.podcast import (
+    Episode,
+    EpisodeSelection,
+    EpisodeSorting,
+    Podcast,
+    compare_unicode_caseless,
+    normalize_unicode_caseless,
+)
+from tonie_podcast_sync.retry import RetryPolicy
+from tonie_podcast_sync.run_report import RunReport, StageTimings
 
 
 def _get_soft_wrap_setting() -> bool:
@@ -51,27 +67,140 @@ console = Console(soft_wrap=_get_soft_wrap_setting())
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+HTTP_PARTIAL_CONTENT = 206
+HTTP_RANGE_NOT_SATISFIABLE = 416
+
+
+class IncompleteDownloadError(RequestException):
+    """The connection was closed before the whole file was received."""
+
+
+def _expected_size(response: requests.Response, offset: int) -> int | None:
+    """Return the size the downloaded file should have, if the server announced it.
+
+    Args:
+        response: The HTTP response of the download
+        offset: The number of bytes that were already downloaded before the response
+
+    Returns:
+        The expected file size in bytes, or None if it is unknown
+    """
+    # The length of compressed responses does not match the decoded content
+    if response.headers.get("Content-Encoding") not in {None, "identity"}:
+        return None
+    content_length = response.headers.get("Content-Length")
+    if not isinstance(content_length, str) or not content_length.isdigit():
+        return None
+    return offset + int(content_length)
+
+
+class _SharedDownload:
+    """A download of an episode file that other syncs of the same episode can wait for."""
+
+    def __init__(self, cache_directory: Path) -> None:
+        self.cache_directory = cache_directory
+        self.finished = threading.Event()
+        self.path: Path | None = None
+
 
 class ToniePodcastSync:
     """The class of syncing podcasts to given tonies."""
 
-    def __init__(self, user: str, pwd: str) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        user: str,
+        pwd: str,
+        *,
+        download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        upload_workers: int = DEFAULT_UPLOAD_WORKERS,
+        episode_cache: EpisodeCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        run_report: RunReport | None = None,
+    ) -> None:
         """Initialize ToniePodcastSync and connect to the TonieAPI.
 
         Args:
             user: The username for the Tonie Cloud API
             pwd: The password for the Tonie Cloud API
+            download_workers: Maximum number of episodes downloaded at the same time per sync
+            upload_workers: Maximum number of episodes uploaded at the same time per sync.
+                Defaults to 1, i.e. one upload after another.
+            episode_cache: Persistent cache that is checked before downloading an episode.
+                Defaults to None, i.e. every episode is downloaded on each sync.
+            retry_policy: When and how long to wait before retrying failed downloads and uploads.
+                Defaults to the default RetryPolicy.
+            run_report: Report the duration of each stage of every sync is recorded in.
+                Defaults to None, i.e. no timings are recorded.
         """
+        self._download_workers = max(1, download_workers)
+        self._upload_workers = max(1, upload_workers)
+        self._episode_cache = episode_cache
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._run_report = run_report
+        self.__user = user
+        self.__pwd = pwd
         self._api = TonieAPI(user, pwd)
+        self._api.session.hooks["response"].append(self._count_api_call)
         self._households = {household.id: household for household in self._api.get_households()}
+        self._tonie_titles: dict[str, tuple[CreativeTonie, list[str]]] = {}
+        self._shared_downloads: dict[str, _SharedDownload] = {}
+        self._shared_downloads_lock = threading.Lock()
         self._update_tonies()
         self._session = requests.Session()
+        self._thread_state = threading.local()
         log.debug("Performance optimization: HTTP session initialized for connection reuse")
 
+    @property
+    def podcast_cache_directory(self) -> Path:
+        """The cache directory of the sync running in the current thread."""
+        return self._thread_state.podcast_cache_directory
+
+    @podcast_cache_directory.setter
+    def podcast_cache_directory(self, path: Path) -> None:
+        self._thread_state.podcast_cache_directory = path
+
+    @property
+    def run_report(self) -> RunReport | None:
+        """The report the stage timings of the following syncs are recorded in."""
+        return self._run_report
+
+    @run_report.setter
+    def run_report(self, run_report: RunReport | None) -> None:
+        self._run_report = run_report
+
+    @property
+    def _stage_timings(self) -> StageTimings:
+        """The stage timings of the sync running in the current thread.
+
+        Outside of a sync, or without a run report, the timings are recorded but never reported.
+        """
+        timings = getattr(self._thread_state, "stage_timings", None)
+        return timings if timings is not None else StageTimings()
+
     def _update_tonies(self) -> None:
         """Refresh the internal cache of creative tonies."""
         self._tonies = {tonie.id: tonie for tonie in self._api.get_all_creative_tonies()}
 
+    def refresh(self) -> None:
+        """Log in to the Tonie Cloud again and reload all creative tonies.
+
+        The token of a login expires, so long-running processes call this before syncing instead of
+        creating a new instance, which would also reload the households.
+
+        Raises:
+            ValueError: If the login failed
+        """
+        self._api.session.acquire_token(self.__user, self.__pwd)
+        if self._api.session.token is None:
+            msg = "Failed to acquire session token. Please check your credentials or network connection."
+            raise ValueError(msg)
+        self._update_tonies()
+
+    def _count_api_call(self, response: requests.Response, *_args: object, **_kwargs: object) -> None:
+        """Count a request to the Tonie Cloud API in the run report, called by the session for each response."""
+        if self._run_report:
+            self._run_report.count_api_call(response.request.method or "", response.request.url or "")
+
     def get_tonies(self) -> list[CreativeTonie]:
         """Return a list of all creative tonies.
 
@@ -101,12 +230,15 @@ class ToniePodcastSync:
             )
         console.print(table)
 
-    def sync_podcast_to_tonie(
+    def sync_podcast_to_tonie(  # noqa: PLR0913
         self,
         podcast: Podcast,
         tonie_id: str,
         max_minutes: int = 90,
         wipe: bool = True,  # noqa: FBT001, FBT002
+        *,
+        episode_selection: EpisodeSelection = EpisodeSelection.GREEDY,
+        incremental: bool = False,
     ) -> None:
         """Sync new episodes from a podcast feed to a creative Tonie.
 
@@ -118,9 +250,20 @@ class ToniePodcastSync:
             tonie_id: The ID of the target Tonie
             max_minutes: Maximum total duration of episodes in minutes. Defaults to 90.
             wipe: Whether to clear existing content before syncing. Defaults to True.
+                Ignored in incremental mode.
+            episode_selection: How episodes are packed into max_minutes. Defaults to GREEDY.
+            incremental: Only upload episodes missing on the Tonie and only delete chapters that
+                are not part of the selection anymore. Defaults to False.
         """
-        with tempfile.TemporaryDirectory() as podcast_cache_directory:
-            self.podcast_cache_directory = Path(podcast_cache_directory)
+        timings = self._run_report.tonie(tonie_id) if self._run_report else StageTimings()
+        if self._run_report:
+            timings.extend(podcast.timings)
+        self._thread_state.stage_timings = timings
+        with (
+            timings.measure("sync", podcast=podcast.title),
+            self._sync_cache_directory() as podcast_cache_directory,
+        ):
+            self.podcast_cache_directory = podcast_cache_directory
             log.debug("Cache path is %s", self.podcast_cache_directory)
 
             if not self._validate_tonie_exists(tonie_id):
@@ -132,16 +275,277 @@ class ToniePodcastSync:
             if not self._should_update_tonie(podcast, tonie_id):
                 return
 
-            if wipe:
+            if wipe and not incremental:
                 self._wipe_tonie(tonie_id)
 
             # For RANDOM mode, reshuffle before caching to ensure fresh episodes
             if podcast.epSorting == EpisodeSorting.RANDOM and not self._is_tonie_empty(tonie_id):
-                latest_episode_tonie = self._tonies[tonie_id].chapters[0].title
-                self.__reshuffle_until_different(podcast, latest_episode_tonie)
+                current_titles = [chapter.title for chapter in self._tonies[tonie_id].chapters]
+                self.__reshuffle_until_different(podcast, current_titles)
+
+            if incremental:
+                self._sync_incremental(podcast, tonie_id, max_minutes, episode_selection)
+                return
+
+            max_minutes = self._limit_max_minutes(max_minutes)
+            with timings.measure("selection") as details:
+                episodes_to_cache = self._select_episodes_within_time_limit(podcast, max_minutes, episode_selection)
+                details["episodes"] = len(episodes_to_cache)
+            if not episodes_to_cache:
+                self._warn_no_episodes_fit(podcast, max_minutes)
+                return
+
+            available_episodes = [ep for ep in podcast.epList if ep not in episodes_to_cache]
+            self._transfer_episodes(podcast, tonie_id, episodes_to_cache, available_episodes, max_minutes * 60)
+
+    def plan_podcast_sync(  # noqa: PLR0913
+        self,
+        podcast: Podcast,
+        tonie_id: str,
+        max_minutes: int = 90,
+        wipe: bool = True,  # noqa: FBT001, FBT002
+        *,
+        episode_selection: EpisodeSelection = EpisodeSelection.GREEDY,
+        incremental: bool = False,
+    ) -> SyncPlan:
+        """Plan a sync without downloading or uploading anything.
 
-            cached_episodes = self.__cache_podcast_episodes(podcast, max_minutes)
-            self._upload_episodes_to_tonie(podcast, cached_episodes, tonie_id)
+        Takes the same decisions as sync_podcast_to_tonie. The size of each planned upload is
+        taken from the feed, or requested with a HEAD request if the feed does not announce it.
+        Episodes that are later replaced because their download fails are not part of the plan.
+
+        Args:
+            podcast: The podcast to sync episodes from
+            tonie_id: The ID of the target Tonie
+            max_minutes: Maximum total duration of episodes in minutes. Defaults to 90.
+            wipe: Whether to clear existing content before syncing. Defaults to True.
+                Ignored in incremental mode.
+            episode_selection: How episodes are packed into max_minutes. Defaults to GREEDY.
+            incremental: Only plan uploads of episodes missing on the Tonie. Defaults to False.
+
+        Returns:
+            The planned sync
+        """
+        plan = SyncPlan(tonie_id=tonie_id, podcast_title=podcast.title)
+        if not self._validate_tonie_exists(tonie_id):
+            plan.skip_reason = "tonie not found"
+            return plan
+        if not self._validate_podcast_has_episodes(podcast, tonie_id):
+            plan.skip_reason = "no episodes in feed"
+            return plan
+        if not self._should_update_tonie(podcast, tonie_id):
+            plan.skip_reason = "no new episodes"
+            return plan
+
+        if podcast.epSorting == EpisodeSorting.RANDOM and not self._is_tonie_empty(tonie_id):
+            current_titles = [chapter.title for chapter in self._tonies[tonie_id].chapters]
+            self.__reshuffle_until_different(podcast, current_titles)
+
+        max_minutes = self._limit_max_minutes(max_minutes)
+        selection = self._select_episodes_within_time_limit(podcast, max_minutes, episode_selection)
+        if not selection:
+            self._warn_no_episodes_fit(podcast, max_minutes)
+            plan.skip_reason = "no episodes fit"
+            return plan
+
+        if incremental:
+            kept_chapters, _kept_episodes, selection = self._split_selection(tonie_id, selection)
+            plan.deleted_chapters = len(self._tonies[tonie_id].chapters) - len(kept_chapters)
+        else:
+            plan.wipe = wipe and not self._is_tonie_empty(tonie_id)
+        plan.uploads = [
+            PlannedUpload(
+                episode,
+                self._episode_size(episode),
+                cached=bool(self._episode_cache and self._episode_cache.contains(episode)),
+            )
+            for episode in selection
+        ]
+        return plan
+
+    def _episode_size(self, episode: Episode) -> int | None:
+        """Return the size of an episode file as announced by the feed or the server.
+
+        Args:
+            episode: The episode to look up
+
+        Returns:
+            The size in bytes, or None if it is unknown
+        """
+        if episode.length:
+            return episode.length
+        try:
+            response = self._session.head(episode.url, allow_redirects=True, timeout=30)
+            response.raise_for_status()
+        except RequestException as e:
+            log.debug("Unable to request the size of episode '%s': %s", episode.title, e)
+            return None
+        content_length = response.headers.get("Content-Length")
+        return int(content_length) if isinstance(content_length, str) and content_length.isdigit() else None
+
+    def _sync_incremental(
+        self,
+        podcast: Podcast,
+        tonie_id: str,
+        max_minutes: int,
+        episode_selection: EpisodeSelection,
+    ) -> None:
+        """Bring a Tonie in line with the current selection by only transferring the delta.
+
+        Chapters that are not part of the selection anymore are deleted, episodes that are not
+        on the Tonie yet are uploaded, and the chapters are sorted in selection order afterwards.
+
+        Args:
+            podcast: The podcast to sync episodes from
+            tonie_id: The ID of the target Tonie
+            max_minutes: Maximum total duration of episodes in minutes
+            episode_selection: How episodes are packed into max_minutes
+        """
+        max_minutes = self._limit_max_minutes(max_minutes)
+        with self._stage_timings.measure("selection") as details:
+            selection = self._select_episodes_within_time_limit(podcast, max_minutes, episode_selection)
+            details["episodes"] = len(selection)
+        if not selection:
+            self._warn_no_episodes_fit(podcast, max_minutes)
+            return
+
+        tonie = self._tonies[tonie_id]
+        kept_chapters, kept_episodes, missing_episodes = self._split_selection(tonie_id, selection)
+        if len(kept_chapters) < len(tonie.chapters):
+            console.print(
+                f"Delete {len(tonie.chapters) - len(kept_chapters)} outdated chapter(s) of Tonie '{tonie.name}'"
+            )
+            self._api.sort_chapter_of_tonie(tonie, kept_chapters)
+
+        if not missing_episodes:
+            log.info("%s: all selected episodes are already on the tonie", podcast.title)
+        else:
+            available_episodes = [ep for ep in podcast.epList if ep not in selection]
+            remaining_seconds = max_minutes * 60 - sum(ep.duration_sec for ep in kept_episodes)
+            kept_episodes += self._transfer_episodes(
+                podcast, tonie_id, missing_episodes, available_episodes, remaining_seconds
+            )
+
+        self._refresh_tonie(tonie_id)
+        on_tonie = {id(episode) for episode in kept_episodes}
+        self._sort_tonie_chapters(tonie_id, [ep for ep in podcast.epList if id(ep) in on_tonie])
+
+    def _split_selection(
+        self, tonie_id: str, selection: list[Episode]
+    ) -> tuple[list[Chapter], list[Episode], list[Episode]]:
+        """Compare the selected episodes with the chapters on a Tonie.
+
+        Args:
+            tonie_id: The ID of the Tonie
+            selection: The selected episodes
+
+        Returns:
+            The chapters of selected episodes, the selected episodes that are already on the Tonie
+            and the selected episodes that are missing on the Tonie
+        """
+        chapter_titles = self._normalized_chapter_titles(tonie_id)
+        present_titles = set(chapter_titles)
+        selected_titles = {self._normalized_episode_title(ep) for ep in selection}
+        chapters = self._tonies[tonie_id].chapters
+        kept_chapters = [
+            chapter for chapter, title in zip(chapters, chapter_titles, strict=True) if title in selected_titles
+        ]
+
+        kept_episodes = []
+        missing_episodes = []
+        for episode in selection:
+            if self._normalized_episode_title(episode) in present_titles:
+                kept_episodes.append(episode)
+            else:
+                missing_episodes.append(episode)
+        return kept_chapters, kept_episodes, missing_episodes
+
+    def _sort_tonie_chapters(self, tonie_id: str, episodes: list[Episode]) -> None:
+        """Sort the chapters of a Tonie in the order of the given episodes.
+
+        Chapters that do not belong to any of the episodes are kept at the end.
+
+        Args:
+            tonie_id: The ID of the Tonie
+            episodes: The episodes in the desired chapter order
+        """
+        tonie = self._tonies[tonie_id]
+        self._apply_chapter_order(tonie_id, self._order_chapters(tonie.chapters, episodes))
+
+    def _order_chapters(self, chapters: list[Chapter], episodes: list[Episode]) -> list[Chapter]:
+        """Order chapters like the episodes they belong to.
+
+        Args:
+            chapters: The chapters to order
+            episodes: The episodes in the desired chapter order
+
+        Returns:
+            The chapters of the episodes in episode order, followed by all other chapters
+        """
+        chapters_by_title: dict[str, list[Chapter]] = {}
+        for chapter in chapters:
+            chapters_by_title.setdefault(normalize_unicode_caseless(chapter.title), []).append(chapter)
+
+        ordered_chapters = []
+        for episode in episodes:
+            matching_chapters = chapters_by_title.get(self._normalized_episode_title(episode))
+            if matching_chapters:
+                ordered_chapters.append(matching_chapters.pop(0))
+        sorted_ids = {chapter.id for chapter in ordered_chapters}
+        return ordered_chapters + [chapter for chapter in chapters if chapter.id not in sorted_ids]
+
+    def _apply_chapter_order(self, tonie_id: str, ordered_chapters: list[Chapter]) -> None:
+        """Sort the chapters of a Tonie if their order differs from the given one.
+
+        Args:
+            tonie_id: The ID of the Tonie
+            ordered_chapters: All chapters of the Tonie in the desired order
+        """
+        tonie = self._tonies[tonie_id]
+        if [chapter.id for chapter in ordered_chapters] != [chapter.id for chapter in tonie.chapters]:
+            log.debug("Sorting %d chapters of tonie %s", len(ordered_chapters), tonie.name)
+            self._api.sort_chapter_of_tonie(tonie, ordered_chapters)
+            self._tonies[tonie_id] = tonie.model_copy(update={"chapters": ordered_chapters})
+
+    def _normalized_chapter_titles(self, tonie_id: str) -> list[str]:
+        """Return the normalized titles of the chapters of a Tonie.
+
+        The titles are normalized once per known state of the Tonie, they are normalized
+        again only after the Tonie was refreshed or its chapters were changed.
+
+        Args:
+            tonie_id: The ID of the Tonie
+
+        Returns:
+            The normalized chapter titles in chapter order
+        """
+        tonie = self._tonies[tonie_id]
+        cached = self._tonie_titles.get(tonie_id)
+        if cached is None or cached[0] is not tonie:
+            cached = (tonie, [normalize_unicode_caseless(chapter.title) for chapter in tonie.chapters])
+            self._tonie_titles[tonie_id] = cached
+        return cached[1]
+
+    def _normalized_episode_title(self, episode: Episode) -> str:
+        """Return the normalized chapter title of an episode, to compare it to chapters on a Tonie.
+
+        Args:
+            episode: The episode to generate the title for
+
+        Returns:
+            The normalized chapter title
+        """
+        return normalize_unicode_caseless(self._generate_chapter_title(episode))
+
+    def _refresh_tonie(self, tonie_id: str) -> None:
+        """Refresh the cached state of a single Tonie by only querying its household.
+
+        Args:
+            tonie_id: The ID of the Tonie to refresh
+        """
+        household = self._households[self._tonies[tonie_id].householdId]
+        for tonie in self._api.get_all_creative_tonies_by_household(household):
+            self._tonies[tonie.id] = tonie
 
     def _validate_tonie_exists(self, tonie_id: str) -> bool:
         """Check if a Tonie with the given ID exists.
@@ -196,13 +600,14 @@ class ToniePodcastSync:
 
         # Check if new feed has newer episodes than tonie
         # or the episode pinning changed
-        latest_episodes_tonie = [chapter.title for chapter in self._tonies[tonie_id].chapters]
-        latest_episodes_feed = [self._generate_chapter_title(ep) for ep in podcast.epList[: len(latest_episodes_tonie)]]
-
-        if all(
-            compare_unicode_caseless(a, b) for a, b in zip(latest_episodes_tonie, latest_episodes_feed, strict=True)
-        ):
-            msg = f"Podcast '{podcast.title}' has no new episodes, latest episode is '{latest_episodes_tonie[0]}'"
+        latest_episodes_tonie = self._normalized_chapter_titles(tonie_id)
+        latest_episodes_feed = [
+            self._normalized_episode_title(ep) for ep in podcast.epList[: len(latest_episodes_tonie)]
+        ]
+
+        if latest_episodes_tonie == latest_episodes_feed:
+            latest_episode = self._tonies[tonie_id].chapters[0].title
+            msg = f"Podcast '{podcast.title}' has no new episodes, latest episode is '{latest_episode}'"
             log.info(msg)
             console.print(msg)
             return False
@@ -212,33 +617,91 @@ class ToniePodcastSync:
     def _upload_episodes_to_tonie(
         self,
         podcast: Podcast,
-        episodes: list[Episode],
+        episodes: Iterable[Episode],
         tonie_id: str,
+        total: int | None = None,
     ) -> None:
-        """Upload a list of episodes to a Tonie.
+        """Upload episodes to a Tonie.
+
+        The episodes may be produced while they are uploaded, e.g. by a running download.
+        With more than one upload worker the episodes are uploaded concurrently. The Tonie
+        appends chapters in the order the uploads finish, so the new chapters are sorted
+        back into the order of the episodes afterwards.
 
         Args:
             podcast: The podcast object (for title information)
-            episodes: List of episodes to upload
+            episodes: The episodes to upload
             tonie_id: The ID of the target Tonie
+            total: The number of episodes, required if episodes is not a list
         """
+        total = len(episodes) if total is None else total
         successfully_uploaded = []
         failed_episodes = []
-
-        for episode in track(
-            episodes,
-            description=(f"{podcast.title}: transferring {len(episodes)} episodes to {self._tonies[tonie_id].name}"),
-            total=len(episodes),
-            transient=True,
-            refresh_per_second=2,
+        concurrent = self._upload_workers > 1 and total > 1
+        previous_chapter_ids = [chapter.id for chapter in self._tonies[tonie_id].chapters]
+        timings = self._stage_timings
+
+        if concurrent:
+            results = self._upload_concurrently(episodes, tonie_id, timings)
+        else:
+            results = ((episode, self._upload_episode(episode, tonie_id, timings)) for episode in episodes)
+
+        for episode, uploaded in self._track(
+            results,
+            description=f"{podcast.title}: transferring {total} episodes to {self._tonies[tonie_id].name}",
+            total=total,
         ):
-            if self._upload_episode(episode, tonie_id):
+            if uploaded:
                 successfully_uploaded.append(episode)
             else:
                 failed_episodes.append(episode)
 
+        if concurrent and len(successfully_uploaded) > 1:
+            self._restore_upload_order(tonie_id, previous_chapter_ids, successfully_uploaded)
+
         self._report_upload_results(podcast.title, tonie_id, successfully_uploaded, failed_episodes)
 
+    def _upload_concurrently(
+        self, episodes: Iterable[Episode], tonie_id: str, timings: StageTimings | None = None
+    ) -> Iterator[tuple[Episode, bool]]:
+        """Upload episodes with the upload workers as soon as they are produced.
+
+        Args:
+            episodes: The episodes to upload
+            tonie_id: The ID of the target Tonie
+            timings: The stage timings to record the uploads in
+
+        Yields:
+            Each episode with its upload result, in the order of the episodes
+        """
+        with ThreadPoolExecutor(max_workers=self._upload_workers, thread_name_prefix="episode-upload") as executor:
+            pending: deque[tuple[Episode, Future[bool]]] = deque()
+            for episode in episodes:
+                pending.append((episode, executor.submit(self._upload_episode, episode, tonie_id, timings)))
+                while pending and pending[0][1].done():
+                    finished_episode, future = pending.popleft()
+                    yield finished_episode, future.result()
+            while pending:
+                finished_episode, future = pending.popleft()
+                yield finished_episode, future.result()
+
+    def _restore_upload_order(self, tonie_id: str, previous_chapter_ids: list[str], uploaded: list[Episode]) -> None:
+        """Sort chapters added by concurrent uploads into the order of the uploaded episodes.
+
+        Chapters that were on the Tonie before the upload keep their position in front of the new ones.
+
+        Args:
+            tonie_id: The ID of the Tonie
+            previous_chapter_ids: The IDs of the chapters on the Tonie before the upload
+            uploaded: The uploaded episodes in the desired order
+        """
+        self._refresh_tonie(tonie_id)
+        chapters = self._tonies[tonie_id].chapters
+        known_ids = set(previous_chapter_ids)
+        previous_chapters = [chapter for chapter in chapters if chapter.id in known_ids]
+        new_chapters = [chapter for chapter in chapters if chapter.id not in known_ids]
+        self._apply_chapter_order(tonie_id, previous_chapters + self._order_chapters(new_chapters, uploaded))
+
     def _report_upload_results(
         self,
         podcast_title: str,
@@ -268,28 +731,73 @@ class ToniePodcastSync:
                 style="red",
             )
 
-    def _upload_episode(self, episode: Episode, tonie_id: str) -> bool:
+    def _upload_episode(self, episode: Episode, tonie_id: str, timings: StageTimings | None = None) -> bool:
         """Upload a single episode to a creative Tonie.
 
         Args:
             episode: The episode to upload
             tonie_id: The ID of the target Tonie
+            timings: The stage timings to record the upload in. Defaults to the timings of the
+                sync running in the current thread.
+
+        Returns:
+            True if upload was successful, False otherwise
+        """
+        timings = timings if timings is not None else self._stage_timings
+        with timings.measure("upload", episode=episode.title) as details:
+            uploaded = self._upload_episode_file(episode, tonie_id, timings)
+            details["uploaded"] = uploaded
+            if uploaded:
+                details["bytes"] = self._file_size(episode.fpath)
+        return uploaded
+
+    def _upload_episode_file(self, episode: Episode, tonie_id: str, timings: StageTimings) -> bool:
+        """Upload the file of an episode, retrying failed uploads according to the retry policy.
+
+        Args:
+            episode: The episode to upload
+            tonie_id: The ID of the target Tonie
+            timings: The stage timings to record the delays before retries in
 
         Returns:
             True if upload was successful, False otherwise
         """
         tonie = self._tonies[tonie_id]
-        for _attempt in range(UPLOAD_RETRY_COUNT):
+        retry = self._retry_policy.start()
+        while True:
             try:
                 self._api.upload_file_to_tonie(tonie, episode.fpath, self._generate_chapter_title(episode))
                 return True  # noqa: TRY300
-            except HTTPError as e:  # noqa: PERF203
-                log.warning("Upload failed for %s, retrying in %d seconds: %s", episode.title, RETRY_DELAY_SECONDS, e)
-                time.sleep(RETRY_DELAY_SECONDS)
-
-        log.error("Unable to upload file %s after %d attempts", episode.title, UPLOAD_RETRY_COUNT)
+            except RequestException as e:  # noqa: PERF203
+                delay = retry.next_delay(e)
+                if delay is None:
+                    log.warning("Upload failed for %s, giving up: %s", episode.title, e)
+                    break
+                log.warning("Upload failed for %s, retrying in %.1f seconds: %s", episode.title, delay, e)
+                timings.record("retry", delay, operation="upload", episode=episode.title, error=str(e))
+                time.sleep(delay)
+
+        log.error("Unable to upload file %s after %d attempt(s)", episode.title, retry.attempts)
         return False
 
+    def _track(self, sequence: Iterable, description: str, total: int) -> Iterable:
+        """Wrap a sequence with a progress bar if running in the main thread.
+
+        Rich only supports one live display per console, so concurrent syncs
+        running in worker threads iterate without a progress bar.
+
+        Args:
+            sequence: The sequence to iterate over
+            description: Description shown next to the progress bar
+            total: Total number of items in the sequence
+
+        Returns:
+            An iterable over the items of the sequence
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return sequence
+        return track(sequence, description=description, total=total, transient=True, refresh_per_second=2)
+
     def _wipe_tonie(self, tonie_id: str) -> None:
         """Remove all chapters from a Tonie.
 
@@ -298,55 +806,85 @@ class ToniePodcastSync:
         """
         tonie = self._tonies[tonie_id]
         console.print(f"Wipe all chapters of Tonie '{tonie.name}'")
-        self._api.clear_all_chapter_of_tonie(tonie)
-        self._update_tonies()
+        with self._stage_timings.measure("wipe", chapters=len(tonie.chapters)):
+            self._api.clear_all_chapter_of_tonie(tonie)
+        # The cleared tonie is known without asking the Tonie Cloud for all tonies of all households again
+        self._tonies[tonie_id] = tonie.model_copy(
+            update={
+                "chapters": [],
+                "chaptersPresent": 0,
+                "chaptersRemaining": tonie.chaptersRemaining + tonie.chaptersPresent,
+                "secondsPresent": 0,
+                "secondsRemaining": tonie.secondsRemaining + tonie.secondsPresent,
+            }
+        )
 
-    def __cache_podcast_episodes(self, podcast: Podcast, max_minutes: int = MAXIMUM_TONIE_MINUTES) -> list[Episode]:
-        """Download podcast episodes locally, limited to max_minutes total duration.
+    def _limit_max_minutes(self, max_minutes: int) -> int:
+        """Limit the requested duration to the valid range of a Tonie.
 
         Args:
-            podcast: The podcast to cache episodes from
-            max_minutes: Maximum total duration in minutes
+            max_minutes: The requested maximum duration in minutes
 
         Returns:
-            List of successfully cached episodes
+            max_minutes, or MAXIMUM_TONIE_MINUTES if it is out of range
         """
         if max_minutes <= 0 or max_minutes > MAXIMUM_TONIE_MINUTES:
-            max_minutes = MAXIMUM_TONIE_MINUTES
-
-        episodes_to_cache = self._select_episodes_within_time_limit(podcast, max_minutes)
+            return MAXIMUM_TONIE_MINUTES
+        return max_minutes
 
-        if not episodes_to_cache:
-            msg = f"No episodes found for podcast '{podcast.title}' that fit within {max_minutes} minutes"
-            log.warning(msg)
-            console.print(f"WARNING: {msg}", style="yellow")
-            return []
-
-        # Track available fallback episodes
-        available_episodes = [ep for ep in podcast.epList if ep not in episodes_to_cache]
+    def _warn_no_episodes_fit(self, podcast: Podcast, max_minutes: int) -> None:
+        """Warn that no episode of the podcast fits within the time limit.
 
-        cached_episodes, failed_episodes = self._download_episodes_with_fallback(
-            podcast, episodes_to_cache, available_episodes, max_minutes
-        )
-
-        self._log_caching_summary(podcast, cached_episodes, failed_episodes)
-        return cached_episodes
+        Args:
+            podcast: The podcast object
+            max_minutes: Maximum total duration in minutes
+        """
+        msg = f"No episodes found for podcast '{podcast.title}' that fit within {max_minutes} minutes"
+        log.warning(msg)
+        console.print(f"WARNING: {msg}", style="yellow")
 
-    def _select_episodes_within_time_limit(self, podcast: Podcast, max_minutes: int) -> list[Episode]:
+    def _select_episodes_within_time_limit(
+        self,
+        podcast: Podcast,
+        max_minutes: int,
+        episode_selection: EpisodeSelection = EpisodeSelection.GREEDY,
+    ) -> list[Episode]:
         """Select episodes from podcast that fit within the time limit.
 
         Args:
             podcast: The podcast to select episodes from
             max_minutes: Maximum total duration in minutes
+            episode_selection: How episodes are packed into the time limit. Defaults to GREEDY.
 
         Returns:
-            List of episodes that fit within the time limit
+            List of episodes that fit within the time limit, in the order of podcast.epList
+        """
+        max_seconds = max_minutes * 60
+        episodes = self._select_greedy(podcast.epList, max_seconds)
+
+        match episode_selection:
+            case EpisodeSelection.FILL:
+                return self._fill_remaining_time(podcast.epList, episodes, max_seconds)
+            case EpisodeSelection.BEST_FIT:
+                episodes = self._pack_remaining_time(podcast.epList, episodes, max_seconds)
+                return self._fill_remaining_time(podcast.epList, episodes, max_seconds)
+            case _:
+                return episodes
+
+    def _select_greedy(self, candidates: list[Episode], max_seconds: int) -> list[Episode]:
+        """Select episodes in order until the first episode does not fit anymore.
+
+        Args:
+            candidates: The episodes in order of priority
+            max_seconds: Maximum total duration in seconds
+
+        Returns:
+            The longest prefix of fitting episodes, skipping episodes that are too long on their own
         """
         episodes = []
         total_seconds = 0
-        max_seconds = max_minutes * 60
 
-        for episode in podcast.epList:
+        for episode in candidates:
             if episode.duration_sec > max_seconds:
                 continue
             if (total_seconds + episode.duration_sec) > max_seconds:
@@ -356,28 +894,157 @@ class ToniePodcastSync:
 
         return episodes
 
-    def _download_episodes_with_fallback(
+    def _fill_remaining_time(
+        self, candidates: list[Episode], selected: list[Episode], max_seconds: int
+    ) -> list[Episode]:
+        """Add every further episode that still fits, skipping the ones that do not.
+
+        Episodes without known duration are not used to fill up time.
+
+        Args:
+            candidates: The episodes in order of priority
+            selected: The episodes selected so far
+            max_seconds: Maximum total duration in seconds
+
+        Returns:
+            The selected episodes plus the added ones, in order of priority
+        """
+        chosen = {id(episode) for episode in selected}
+        remaining_seconds = max_seconds - sum(episode.duration_sec for episode in selected)
+
+        for episode in candidates:
+            if remaining_seconds <= 0:
+                break
+            if id(episode) in chosen or not 0 < episode.duration_sec <= remaining_seconds:
+                continue
+            chosen.add(id(episode))
+            remaining_seconds -= episode.duration_sec
+
+        return [episode for episode in candidates if id(episode) in chosen]
+
+    def _pack_remaining_time(
+        self, candidates: list[Episode], selected: list[Episode], max_seconds: int
+    ) -> list[Episode]:
+        """Fill the remaining time optimally with the next unselected episodes.
+
+        Solves a 0/1 knapsack over the next PACKING_CANDIDATES episodes that fit on their own,
+        with durations rounded up to PACKING_RESOLUTION_SECONDS. This bounds the runtime
+        independently of the feed size. Each total keeps the first candidates that reach it,
+        which favours earlier episodes among equally good packings.
+
+        Args:
+            candidates: The episodes in order of priority
+            selected: The episodes selected so far
+            max_seconds: Maximum total duration in seconds
+
+        Returns:
+            The selected episodes plus the packed ones, in order of priority
+        """
+        chosen = {id(episode) for episode in selected}
+        remaining_seconds = max_seconds - sum(episode.duration_sec for episode in selected)
+        capacity = remaining_seconds // PACKING_RESOLUTION_SECONDS
+
+        packing_candidates = [
+            episode
+            for episode in candidates
+            if id(episode) not in chosen and 0 < episode.duration_sec <= remaining_seconds
+        ][:PACKING_CANDIDATES]
+
+        # Maps each reachable total (in resolution units) to the candidate that reached it first
+        # and the total before adding it, so the packing can be reconstructed afterwards.
+        reachable: dict[int, tuple[int, int]] = {0: (-1, 0)}
+        for index, episode in enumerate(packing_candidates):
+            units = -(-episode.duration_sec // PACKING_RESOLUTION_SECONDS)
+            for total in list(reachable):
+                new_total = total + units
+                if new_total <= capacity and new_total not in reachable:
+                    reachable[new_total] = (index, total)
+
+        total = max(reachable)
+        while total > 0:
+            index, total = reachable[total]
+            chosen.add(id(packing_candidates[index]))
+
+        return [episode for episode in candidates if id(episode) in chosen]
+
+    def _transfer_episodes(
         self,
         podcast: Podcast,
+        tonie_id: str,
         episodes_to_cache: list[Episode],
         available_episodes: list[Episode],
-        max_minutes: int,
-    ) -> tuple[list[Episode], list[Episode]]:
-        """Download episodes with fallback to alternative episodes on failure.
+        max_seconds: int,
+    ) -> list[Episode]:
+        """Download episodes and upload each of them as soon as its download has finished.
+
+        Downloads run in a background thread and are handed over to the upload through a
+        bounded queue, so uploading an episode overlaps with downloading the next ones.
 
         Args:
-            podcast: The podcast object
+            podcast: The podcast to sync episodes from
+            tonie_id: The ID of the target Tonie
             episodes_to_cache: Primary list of episodes to download
             available_episodes: List of fallback episodes
-            max_minutes: Maximum total duration in minutes
+            max_seconds: Maximum total duration in seconds
 
         Returns:
-            Tuple of (successfully cached episodes, failed episodes without replacement)
+            The successfully downloaded episodes in upload order
         """
         cached_episodes: list[Episode] = []
-        failed_episodes = []
-        current_duration = 0
-        max_seconds = max_minutes * 60
+        failed_episodes: list[Episode] = []
+        downloads = self._iter_cached_episodes(
+            podcast,
+            episodes_to_cache,
+            available_episodes,
+            max_seconds,
+            failed_episodes,
+            self.podcast_cache_directory,
+            self._stage_timings,
+        )
+
+        def collect(episodes: Iterable[Episode]) -> Iterator[Episode]:
+            for episode in episodes:
+                cached_episodes.append(episode)
+                yield episode
+
+        self._upload_episodes_to_tonie(
+            podcast,
+            collect(pipelined(downloads, buffer_size=PIPELINE_BUFFER_SIZE, name="episode-download")),
+            tonie_id,
+            total=len(episodes_to_cache),
+        )
+        self._log_caching_summary(podcast, cached_episodes, failed_episodes)
+        return cached_episodes
+
+    def _iter_cached_episodes(  # noqa: PLR0913
+        self,
+        podcast: Podcast,
+        episodes_to_cache: list[Episode],
+        available_episodes: list[Episode],
+        max_seconds: int,
+        failed_episodes: list[Episode],
+        cache_directory: Path,
+        timings: StageTimings | None = None,
+    ) -> Iterator[Episode]:
+        """Download episodes concurrently and yield them in selection order.
+
+        The selected episodes are downloaded by a bounded thread pool, but their results are
+        processed in selection order. A replacement for a failed episode takes its place in the
+        list and must fit into the time left by all selected episodes that have not failed.
+
+        Args:
+            podcast: The podcast object
+            episodes_to_cache: Primary list of episodes to download
+            available_episodes: List of fallback episodes
+            max_seconds: Maximum total duration in seconds
+            failed_episodes: List the episodes that failed without replacement are added to
+            cache_directory: Directory to cache the episodes in
+            timings: The stage timings to record the downloads in
+
+        Yields:
+            The successfully cached episodes
+        """
+        committed_duration = sum(episode.duration_sec for episode in episodes_to_cache)
 
         available_queue = deque(available_episodes)
         log.debug(
@@ -385,34 +1052,44 @@ class ToniePodcastSync:
             len(available_queue),
         )
 
-        for episode in track(
-            episodes_to_cache,
-            description=f"{podcast.title}: Cache episodes ...",
-            total=len(episodes_to_cache),
-            transient=True,
-            refresh_per_second=2,
-        ):
-            if self.__cache_episode(episode):
-                cached_episodes.append(episode)
-                current_duration += episode.duration_sec
-            else:
-                failed_episodes.append(episode)
-                replacement = self._find_replacement_episode(available_queue, max_seconds, current_duration)
-
-                if replacement and self._try_cache_replacement(podcast, replacement, episode):
-                    cached_episodes.append(replacement)
-                    current_duration += replacement.duration_sec
-                    failed_episodes.remove(episode)
-
-        return cached_episodes, failed_episodes
+        with ThreadPoolExecutor(max_workers=self._download_workers, thread_name_prefix="episode-download") as executor:
+            results = executor.map(
+                lambda episode: self.__cache_episode(episode, cache_directory, timings), episodes_to_cache
+            )
+            for episode, cached in zip(
+                episodes_to_cache,
+                self._track(results, description=f"{podcast.title}: Cache episodes ...", total=len(episodes_to_cache)),
+                strict=True,
+            ):
+                if cached:
+                    yield episode
+                    continue
+
+                committed_duration -= episode.duration_sec
+                replacement = self._find_replacement_episode(available_queue, max_seconds, committed_duration)
+
+                if replacement and self._try_cache_replacement(podcast, replacement, episode, cache_directory, timings):
+                    committed_duration += replacement.duration_sec
+                    yield replacement
+                else:
+                    failed_episodes.append(episode)
 
-    def _try_cache_replacement(self, podcast: Podcast, replacement: Episode, failed_episode: Episode) -> bool:
+    def _try_cache_replacement(
+        self,
+        podcast: Podcast,
+        replacement: Episode,
+        failed_episode: Episode,
+        cache_directory: Path | None = None,
+        timings: StageTimings | None = None,
+    ) -> bool:
         """Attempt to cache a replacement episode.
 
         Args:
             podcast: The podcast object
             replacement: The replacement episode to try
             failed_episode: The episode that failed to download
+            cache_directory: Directory to cache the episode in. Defaults to the current cache directory.
+            timings: The stage timings to record the download in. Defaults to the current timings.
 
         Returns:
             True if replacement was successfully cached, False otherwise
@@ -424,7 +1101,7 @@ class ToniePodcastSync:
             failed_episode.title,
         )
 
-        if self.__cache_episode(replacement):
+        if self.__cache_episode(replacement, cache_directory, timings):
             return True
 
         log.warning(
@@ -470,7 +1147,7 @@ class ToniePodcastSync:
         Args:
             available_episodes: Deque of episodes not yet selected
             max_seconds: Maximum total seconds allowed
-            current_seconds: Current total seconds already downloaded
+            current_seconds: Total seconds of all episodes already downloaded or still pending
 
         Returns:
             A replacement episode if found (removed from deque), None otherwise
@@ -486,16 +1163,46 @@ class ToniePodcastSync:
                 return episode
         return None
 
-    def __cache_episode(self, episode: Episode) -> bool:
+    def __cache_episode(
+        self, episode: Episode, cache_directory: Path | None = None, timings: StageTimings | None = None
+    ) -> bool:
         """Download a single episode to local cache.
 
         Args:
             episode: The episode to download
+            cache_directory: Directory to cache the episode in. Defaults to the cache directory
+                of the sync running in the current thread.
+            timings: The stage timings to record the download in. Defaults to the timings of the
+                sync running in the current thread.
 
         Returns:
             True if download was successful, False otherwise
         """
-        podcast_path = self.podcast_cache_directory / sanitize_filepath(episode.podcast)
+        cache_directory = cache_directory or self.podcast_cache_directory
+        timings = timings if timings is not None else self._stage_timings
+        details = {"episode": episode.title}
+        if episode.volume_adjustment:
+            # ffmpeg adjusts the volume while the episode is downloaded, so both are timed together
+            details["volume_adjustment"] = episode.volume_adjustment
+        with timings.measure("download", **details) as details:
+            source = self._provide_episode_file(episode, cache_directory, timings)
+            details["source"] = source or "failed"
+            if source:
+                details["bytes"] = self._file_size(episode.fpath)
+        return source is not None
+
+    def _provide_episode_file(self, episode: Episode, cache_directory: Path, timings: StageTimings) -> str | None:
+        """Provide the file of an episode in the cache directory.
+
+        Args:
+            episode: The episode to provide
+            cache_directory: Directory to cache the episode in
+            timings: The stage timings to record the delays before retries in
+
+        Returns:
+            Where the file came from, i.e. "cache", "shared" or "download", or None if it is not available
+        """
+        podcast_path = cache_directory / sanitize_filepath(episode.podcast)
         podcast_path.mkdir(parents=True, exist_ok=True)
 
         filepath = podcast_path / self._generate_filename(episode)
@@ -503,79 +1210,307 @@ class ToniePodcastSync:
             log.info("File %s exists, will be overwritten", episode.guid)
             filepath.unlink()
 
-        for _attempt in range(DOWNLOAD_RETRY_COUNT):
+        if self._restore_from_episode_cache(episode, filepath):
+            log.info("Using cached file for episode '%s'", episode.title)
+            episode.fpath = filepath
+            return "cache"
+
+        key = EpisodeCache.key_for(episode)
+        with self._shared_downloads_lock:
+            shared = self._shared_downloads.get(key)
+            is_owner = shared is None or (shared.finished.is_set() and not self._is_file(shared.path))
+            if is_owner:
+                shared = self._shared_downloads[key] = _SharedDownload(cache_directory)
+
+        if not is_owner and self._reuse_shared_download(episode, shared, filepath):
+            return "shared"
+
+        downloaded = False
+        try:
+            downloaded = self._download_episode(episode, filepath, timings)
+        finally:
+            if is_owner:
+                shared.path = filepath if downloaded else None
+                shared.finished.set()
+        return "download" if downloaded else None
+
+    def _restore_from_episode_cache(self, episode: Episode, filepath: Path) -> bool:
+        """Provide an episode file from the episode cache, if it is cached.
+
+        The episode cache is optional, so errors reading it only mean that the episode is downloaded.
+
+        Args:
+            episode: The episode to restore
+            filepath: The path the episode file should be available at
+
+        Returns:
+            True if the episode file was restored, False otherwise
+        """
+        if not self._episode_cache:
+            return False
+        try:
+            return self._episode_cache.restore(episode, filepath)
+        except OSError as e:
+            log.warning("Unable to restore episode '%s' from the episode cache: %s", episode.title, e)
+            filepath.unlink(missing_ok=True)
+            return False
+
+    def _store_in_episode_cache(self, episode: Episode, filepath: Path) -> None:
+        """Add a downloaded episode file to the episode cache, if there is one.
+
+        Errors writing the cache, e.g. a full disk, are logged, as the downloaded file can be used anyway.
+
+        Args:
+            episode: The episode the file belongs to
+            filepath: The downloaded episode file
+        """
+        if not self._episode_cache:
+            return
+        try:
+            self._episode_cache.store(episode, filepath)
+        except OSError as e:
+            log.warning("Unable to add episode '%s' to the episode cache: %s", episode.title, e)
+
+    @contextmanager
+    def _sync_cache_directory(self) -> Iterator[Path]:
+        """Provide the temporary cache directory of a sync and forget its downloads once it is removed.
+
+        Yields:
+            The path of the cache directory
+        """
+        with tempfile.TemporaryDirectory() as podcast_cache_directory:
+            cache_directory = Path(podcast_cache_directory)
+            try:
+                yield cache_directory
+            finally:
+                with self._shared_downloads_lock:
+                    for key, shared in list(self._shared_downloads.items()):
+                        if shared.cache_directory == cache_directory:
+                            del self._shared_downloads[key]
+
+    def _reuse_shared_download(self, episode: Episode, shared: _SharedDownload, filepath: Path) -> bool:
+        """Wait for another sync that downloads the same episode and use its file.
+
+        Args:
+            episode: The episode to download
+            shared: The download of the other sync
+            filepath: The path the episode file should be available at
+
+        Returns:
+            True if the file of the other sync is now available at filepath, False otherwise
+        """
+        log.debug("Waiting for the download of episode '%s' by another sync", episode.title)
+        shared.finished.wait()
+        if shared.path is None:
+            return False
+        try:
+            link_or_copy(shared.path, filepath)
+        except OSError as e:
+            # The other sync may have finished and removed its files in the meantime
+            log.debug("Unable to reuse the download of episode '%s': %s", episode.title, e)
+            filepath.unlink(missing_ok=True)
+            return False
+        log.info("Using file downloaded for another tonie for episode '%s'", episode.title)
+        episode.fpath = filepath
+        return True
+
+    @staticmethod
+    def _is_file(path: Path | None) -> bool:
+        return path is not None and path.is_file()
+
+    @staticmethod
+    def _file_size(path: Path | str) -> int | None:
+        try:
+            return Path(path).stat().st_size
+        except OSError:
+            return None
+
+    def _download_episode(self, episode: Episode, filepath: Path, timings: StageTimings | None = None) -> bool:
+        """Download an episode file, retrying failed requests according to the retry policy.
+
+        Args:
+            episode: The episode to download
+            filepath: The path to download the episode file to
+            timings: The stage timings to record the delays before retries in. Defaults to the
+                timings of the sync running in the current thread.
+
+        Returns:
+            True if download was successful, False otherwise
+        """
+        timings = timings if timings is not None else self._stage_timings
+        retry = self._retry_policy.start()
+        volume_adjusted = episode.volume_adjustment != 0 and self._is_ffmpeg_available()
+        resumable = False
+        while True:
+            # Only plain downloads can be resumed, ffmpeg output does not continue a partial file
+            resume_from = filepath.stat().st_size if resumable and filepath.exists() else 0
             try:
-                response = self._session.get(episode.url, timeout=180, stream=True)
+                response = self._request_episode(episode, filepath, resume_from)
                 response.raise_for_status()
 
-                if episode.volume_adjustment != 0 and self._is_ffmpeg_available():
+                if volume_adjusted:
                     log.debug(
-                        "Loading episode '%s' to memory for volume adjustment",
+                        "Streaming episode '%s' through ffmpeg for volume adjustment",
                         episode.title,
                     )
-                    content = self._download_to_memory(response)
-                    content = self._adjust_volume(content, episode.volume_adjustment)
-                    with filepath.open("wb") as file:
-                        file.write(content)
+                    self._download_with_volume_adjustment(response, filepath, episode.volume_adjustment)
                 else:
                     log.debug(
                         "Streaming episode '%s' directly to disk (memory-efficient)",
                         episode.title,
                     )
-                    self._download_to_file(response, filepath)
+                    resumable = response.headers.get("Accept-Ranges") == "bytes"
+                    self._download_to_file(response, filepath, resume_from)
 
+                # Only cache files whose content matches the cache key, including the volume adjustment
+                if episode.volume_adjustment == 0 or volume_adjusted:
+                    self._store_in_episode_cache(episode, filepath)
                 episode.fpath = filepath
                 return True  # noqa: TRY300
-            except RequestException as e:  # noqa: PERF203
+            except subprocess.CalledProcessError as e:
+                # A corrupt or truncated enclosure fails the same way on every attempt, so it is not retried
+                error_lines = (e.stderr or b"").decode(errors="replace").strip().splitlines()
                 log.warning(
-                    "Download failed for %s, retrying in %d seconds: %s",
-                    episode.url,
-                    RETRY_DELAY_SECONDS,
-                    e,
+                    "ffmpeg failed to adjust the volume of %s: %s", episode.url, error_lines[-1] if error_lines else e
                 )
-                if filepath.exists():
+                filepath.unlink(missing_ok=True)
+                return False
+            except RequestException as e:
+                if filepath.exists() and not resumable:
                     filepath.unlink()
-                time.sleep(RETRY_DELAY_SECONDS)
-
-        log.error("Unable to download file from %s after %d attempts", episode.url, DOWNLOAD_RETRY_COUNT)
+                delay = retry.next_delay(e)
+                if delay is None:
+                    log.warning("Download failed for %s, giving up: %s", episode.url, e)
+                    break
+                log.warning("Download failed for %s, retrying in %.1f seconds: %s", episode.url, delay, e)
+                timings.record("retry", delay, operation="download", episode=episode.title, error=str(e))
+                time.sleep(delay)
+
+        filepath.unlink(missing_ok=True)
+        log.error("Unable to download file from %s after %d attempt(s)", episode.url, retry.attempts)
         return False
 
-    def _download_to_memory(self, response: requests.Response) -> bytes:
-        """Download streaming response to memory.
+    def _request_episode(self, episode: Episode, filepath: Path, resume_from: int) -> requests.Response:
+        """Request the audio file of an episode, continuing a partial download if possible.
 
         Args:
-            response: Streaming HTTP response
+            episode: The episode to download
+            filepath: Path of the partial download
+            resume_from: Size of the partial download, 0 to download the whole file
 
         Returns:
-            Downloaded content as bytes
+            The streaming HTTP response
         """
-        return b"".join(chunk for chunk in response.iter_content(chunk_size=8192) if chunk)
+        if resume_from:
+            log.info("Resuming download of '%s' at byte %d", episode.title, resume_from)
+            response = self._session.get(
+                episode.url, timeout=180, stream=True, headers={"Range": f"bytes={resume_from}-"}
+            )
+            if response.status_code != HTTP_RANGE_NOT_SATISFIABLE:
+                return response
+            log.debug("Server rejected resuming '%s', restarting the download", episode.title)
+            filepath.unlink()
+        return self._session.get(episode.url, timeout=180, stream=True)
 
-    def _download_to_file(self, response: requests.Response, filepath: Path) -> None:
+    def _download_to_file(self, response: requests.Response, filepath: Path, resume_from: int = 0) -> None:
         """Stream download directly to file.
 
+        A partial response to a Range request is appended to the file, any other response
+        replaces its content. The final file size is checked against the announced length.
+
         Args:
             response: Streaming HTTP response
             filepath: Path to write the file to
+            resume_from: Size of the partial file the response was requested for
+
+        Raises:
+            IncompleteDownloadError: If the file is shorter or longer than announced by the server
         """
-        with filepath.open("wb") as file:
+        offset = resume_from if resume_from and response.status_code == HTTP_PARTIAL_CONTENT else 0
+        content_range = response.headers.get("Content-Range")
+        if offset and isinstance(content_range, str) and not content_range.startswith(f"bytes {offset}-"):
+            filepath.unlink()
+            msg = f"Server sent range '{content_range}' instead of the requested range starting at {offset}"
+            raise IncompleteDownloadError(msg, response=response)
+
+        with filepath.open("ab" if offset else "wb") as file:
             for chunk in response.iter_content(chunk_size=8192):
                 if chunk:
                     file.write(chunk)
 
-    def _process_audio_content(self, content: bytes, volume_adjustment: int) -> bytes:
-        """Process audio content, applying volume adjustment if needed.
+        expected_size = _expected_size(response, offset)
+        actual_size = filepath.stat().st_size
+        if expected_size is not None and actual_size != expected_size:
+            if actual_size > expected_size:
+                # The file can not be resumed, it does not match the file on the server
+                filepath.unlink()
+            msg = f"Received {actual_size} of {expected_size} bytes"
+            raise IncompleteDownloadError(msg, response=response)
+
+    def _download_with_volume_adjustment(
+        self,
+        response: requests.Response,
+        filepath: Path,
+        volume_adjustment: int,
+    ) -> None:
+        """Stream a download through ffmpeg to adjust its volume on the fly.
+
+        The response body is piped into ffmpeg chunk by chunk and ffmpeg writes the adjusted
+        audio directly to the file, so memory usage does not depend on the episode length.
+
+        Args:
+            response: Streaming HTTP response
+            filepath: Path to write the adjusted file to
+            volume_adjustment: Volume adjustment in dB
+
+        Raises:
+            subprocess.CalledProcessError: If ffmpeg fails to process the audio
+        """
+        command = self._volume_adjustment_command(volume_adjustment)
+        # The error output goes to a file, a full pipe would block ffmpeg and with it the writes to stdin
+        with filepath.open("wb") as file, tempfile.TemporaryFile() as error_output:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=file, stderr=error_output)  # noqa: S603
+            try:
+                for chunk in response.iter_content(chunk_size=8192):
+                    if chunk:
+                        process.stdin.write(chunk)
+                process.stdin.close()
+            except BrokenPipeError:
+                # ffmpeg exited early, its return code and error output are checked below
+                pass
+            except BaseException:
+                process.kill()
+                process.wait()
+                raise
+            return_code = process.wait()
+            error_output.seek(0)
+            stderr = error_output.read()
+
+        if return_code != 0:
+            raise subprocess.CalledProcessError(return_code, command, stderr=stderr)
+
+    def _volume_adjustment_command(self, volume_adjustment: int) -> list[str]:
+        """Build the ffmpeg command that adjusts the volume of audio read from stdin.
 
         Args:
-            content: The raw audio content
-            volume_adjustment: Volume adjustment in dB (0 means no adjustment)
+            volume_adjustment: Volume adjustment in dB
 
         Returns:
-            Processed audio content
+            The command line as list of arguments
         """
-        if volume_adjustment != 0 and self._is_ffmpeg_available():
-            return self._adjust_volume(content, volume_adjustment)
-        return content
+        return [
+            self._ffmpeg_executable(),
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            "pipe:0",
+            "-filter:a",
+            f"volume={volume_adjustment}dB",
+            "-f",
+            "mp3",
+            "pipe:1",
+        ]
 
     def _generate_filename(self, episode: Episode) -> str:
         """Generate a canonical filename for local episode cache.
@@ -651,38 +1586,24 @@ class ToniePodcastSync:
             MAX_SHUFFLE_ATTEMPTS,
         )
 
-    def _adjust_volume(self, audio_bytes: bytes, volume_adjustment: int) -> bytes:
-        """Adjust the volume of audio content.
-
-        Args:
-            audio_bytes: The raw audio data
-            volume_adjustment: Volume adjustment in dB
-
-        Returns:
-            Adjusted audio data
-        """
-        audio = AudioSegment.from_file(BytesIO(audio_bytes), format="mp3")
-        adjusted_audio = audio + volume_adjustment
-
-        byte_io = BytesIO()
-        adjusted_audio.export(byte_io, format="mp3")
-
-        return byte_io.getvalue()
+    def _ffmpeg_executable(self) -> str:
+        """Return the ffmpeg executable found by the capability probe."""
+        capabilities = probe_ffmpeg()
+        return capabilities.executable if capabilities else ffmpeg_executable()
 
     def _is_ffmpeg_available(self) -> bool:
         """Check if ffmpeg is available on the system.
 
+        The system is only probed once per process, see probe_ffmpeg.
+
         Returns:
             True if ffmpeg is available, False otherwise
         """
-        try:
-            executable = "ffmpeg" if platform.system().lower() != "windows" else "ffmpeg.exe"
-            subprocess.run([executable, "-version"], check=True, capture_output=True)  # noqa: S603
-            return True  # noqa: TRY300
-        except (FileNotFoundError, subprocess.CalledProcessError):
+        if probe_ffmpeg() is None:
             console.print(
                 "Warning: you tried to adjust the volume without having 'ffmpeg' available. "
                 "Please install 'ffmpeg' or set no volume adjustment.",
                 style="red",
             )
             return False
+        return True